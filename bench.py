@@ -0,0 +1,166 @@
+"""
+Замеры производительности слоя работы с базой данных.
+Каждый замер работает с временным файлом базы, рабочий `store.db` не затрагивается.
+Запуск: ``python bench.py [количество_строк]``.
+"""
+import csv
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from itertools import islice
+
+import pandas as pd
+
+from db import Database
+from importer import IMPORT_BATCH_SIZE, References, import_file, read_records, validate_orders
+
+
+def _timed(func, *args, **kwargs) -> tuple[float, object]:
+    """
+    Выполняет функцию и измеряет время её работы.
+    Args:
+        func (callable): Замеряемая функция.
+        *args: Позиционные аргументы функции.
+        **kwargs: Именованные аргументы функции.
+    Returns:
+        tuple[float, object]: Время в секундах и результат функции.
+    """
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def _report(title: str, rows: int, seconds: float) -> None:
+    """
+    Печатает строку отчёта о замере.
+    Args:
+        title (str): Название замера.
+        rows (int): Количество обработанных строк.
+        seconds (float): Затраченное время.
+    """
+    rate = rows / seconds if seconds else float("inf")
+    print(f"{title:<40} {rows:>9} строк {seconds:>9.3f} с {rate:>12,.0f} строк/с")
+
+
+def bench_bulk_insert(rows: int = 100_000) -> None:
+    """
+    Сравнивает построчную вставку заказов (`insert_order`) с пакетной
+    (`insert_orders_bulk`) на временной базе.
+    Args:
+        rows (int): Количество вставляемых заказов.
+    """
+    orders = [(1 + i % 100, 1 + i % 50, 1 + i % 9, "2025-08-01") for i in range(rows)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "per_row.db"))
+        seconds, _ = _timed(lambda: [db.insert_order(*order) for order in orders])
+        _report("insert_order (по одной строке)", rows, seconds)
+        db.conn.close()
+
+        db = Database(os.path.join(tmp, "bulk.db"))
+        seconds, _ = _timed(db.insert_orders_bulk, (order for order in orders))
+        _report("insert_orders_bulk (генератор)", rows, seconds)
+        db.conn.close()
+
+        db = Database(os.path.join(tmp, "bulk_profile.db"))
+        with db.using_profile("bulk-load"):
+            seconds, _ = _timed(db.insert_orders_bulk, (order for order in orders))
+        _report("insert_orders_bulk (профиль bulk-load)", rows, seconds)
+        db.conn.close()
+
+
+def bench_load_frame(rows: int = 100_000) -> None:
+    """
+    Сравнивает выгрузку заказов в DataFrame запросом ``SELECT *`` (как раньше в `get_datas`)
+    с типизированной `load_frame`: первая загрузка из базы и повторная из снимка.
+    Печатает время и объём памяти DataFrame.
+    Args:
+        rows (int): Количество заказов.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "frames.db"))
+        with db.using_profile("bulk-load"):
+            db.insert_clients_bulk((f"Клиент {i}", f"c{i}@mail.ru", "81234567890", None) for i in range(1000))
+            db.insert_products_bulk((f"Товар {i}", 100.0, 10) for i in range(100))
+            db.insert_orders_bulk((1 + i % 1000, 1 + i % 100, 1 + i % 9, f"2025-{1 + i % 12:02d}-{1 + i % 28:02d}")
+                                  for i in range(rows))
+
+        for title, load in (("SELECT * (object)", lambda: pd.read_sql_query("SELECT * FROM Orders", db.conn)),
+                            ("load_frame (из базы)", lambda: db.load_frame("Orders")),
+                            ("load_frame (снимок)", lambda: db.load_frame("Orders"))):
+            seconds, frame = _timed(load)
+            _report(title, rows, seconds)
+            print(f"{'':<40} память: {frame.memory_usage(deep=True).sum() / 2 ** 20:.1f} МиБ")
+        db.conn.close()
+
+
+def bench_import(rows: int = 100_000) -> None:
+    """
+    Замеряет импорт заказов из CSV (`import_file`): отдельно чтение с проверкой
+    и полный импорт — в пустую таблицу (с перестройкой индексов) и повторно в заполненную.
+    Args:
+        rows (int): Количество заказов в файле.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "import.db"))
+        with db.using_profile("bulk-load"):
+            db.insert_clients_bulk((f"Клиент {i}", f"c{i}@mail.ru", "81234567890", "Москва") for i in range(1000))
+            db.insert_products_bulk((f"Товар {i}", 100.0, 10) for i in range(100))
+        path = os.path.join(tmp, "orders.csv")
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["client_id", "Товар", "quantity", "order_date"])
+            writer.writerows((1 + i % 1000, f"Товар {i % 100}", 1 + i % 9, f"2025-{1 + i % 12:02d}-{1 + i % 28:02d}")
+                             for i in range(rows))
+
+        def parse():
+            references, records = References(db), read_records(path, "orders")
+            while batch := list(islice(records, IMPORT_BATCH_SIZE)):
+                validate_orders(batch, references)
+
+        seconds, _ = _timed(parse)
+        _report("чтение и проверка CSV", rows, seconds)
+        seconds, _ = _timed(import_file, db, "orders", path)
+        _report("import_file (пустая таблица)", rows, seconds)
+        seconds, _ = _timed(import_file, db, "orders", path)
+        _report("import_file (заполненная таблица)", rows, seconds)
+        db.conn.close()
+
+
+def bench_row_batches(rows: int = 100_000) -> None:
+    """
+    Сравнивает чтение таблицы Orders списком кортежей со столбцовой пачкой
+    `Database.load_order_batch`: время и память, которую занимает результат
+    (по `tracemalloc`, поэтому время здесь выше, чем без замера памяти).
+    Args:
+        rows (int): Количество заказов.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "batches.db"))
+        with db.using_profile("bulk-load"):
+            db.insert_clients_bulk((f"Клиент {i}", f"c{i}@mail.ru", "81234567890", None) for i in range(1000))
+            db.insert_products_bulk((f"Товар {i}", 100.0, 10) for i in range(100))
+            db.insert_orders_bulk((1 + i % 1000, 1 + i % 100, 1 + i % 9, f"2025-{1 + i % 12:02d}-{1 + i % 28:02d}")
+                                  for i in range(rows))
+
+        sql = "SELECT id, client_id, product_id, quantity, order_date FROM Orders ORDER BY id"
+        for title, load in (("список кортежей", lambda: db.conn.execute(sql).fetchall()),
+                            ("load_order_batch", db.load_order_batch)):
+            tracemalloc.start()
+            seconds, result = _timed(load)
+            size, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            _report(title, rows, seconds)
+            print(f"{'':<40} память: {size / 2 ** 20:.1f} МиБ (пик {peak / 2 ** 20:.1f} МиБ)")
+            del result
+        db.conn.close()
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    bench_bulk_insert(count)
+    bench_load_frame(count)
+    bench_import(count)
+    bench_row_batches(count)
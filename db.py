@@ -1,7 +1,551 @@
+import functools
+import inspect
+import json
+import logging
+import os
+import queue
+import re
 import sqlite3
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from itertools import islice
+from pathlib import Path
+from typing import Iterable
+import numpy as np
 import pandas as pd
+from pandas.api.types import union_categoricals
+from models import BATCH_CHUNK_SIZE, ClientBatch, OrderBatch, ProductBatch, TextColumn
+
+logger = logging.getLogger(__name__)
 
 DB_NAME = "store.db"
+BULK_BATCH_SIZE = 1000
+STREAM_BATCH_SIZE = 1000
+SEARCH_LIMIT = 1000
+QUERY_CACHE_SIZE = 32
+FRAME_CHUNK_SIZE = 100_000
+# Вес связи клиент — товар в графе: количество заказов или количество товара.
+EDGE_WEIGHTS = {"orders": "COUNT(*)", "quantity": "SUM(o.quantity)"}
+# Каталог снимков DataFrame (`Database.load_frame`) рядом с файлом базы.
+SNAPSHOT_DIR = "snapshots"
+
+# Профили производительности SQLite, применяемые при подключении.
+# cache_size в отрицательных значениях задаётся в КиБ, mmap_size — в байтах,
+# busy_timeout — в миллисекундах.
+PERFORMANCE_PROFILES = {
+    # Обычная работа из GUI: WAL позволяет окнам статистики читать,
+    # пока окно заказов пишет.
+    "desktop": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -16_000,
+        "mmap_size": 64 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5_000,
+    },
+    # Массовая загрузка: без fsync на каждую транзакцию и с большим кэшем.
+    "bulk-load": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -128_000,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 30_000,
+    },
+    # Аналитика и отчёты: большой кэш и отображение файла в память.
+    "read-heavy": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -64_000,
+        "mmap_size": 1024 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5_000,
+    },
+}
+DEFAULT_PROFILE = "desktop"
+
+PAGE_SIZE = 200
+
+# Постраничные запросы к спискам: список выбираемых столбцов, источник строк
+# и допустимые столбцы сортировки (имя -> SQL-выражение ключа). Ключ сортировки
+# всегда дополняется ID, чтобы порядок был однозначным для keyset-пагинации.
+PAGE_QUERIES = {
+    "clients": (
+        "c.id, c.c_name, c.email, c.phone, c.address",
+        "FROM Clients c",
+        {"id": "c.id", "c_name": "c.c_name", "email": "c.email", "phone": "c.phone",
+         # address — единственный необязательный столбец; NULL сравнивается как ''.
+         "address": "COALESCE(c.address, '')"},
+    ),
+    "products": (
+        "p.id, p.p_name, p.price, p.stock",
+        "FROM Products p",
+        {"id": "p.id", "p_name": "p.p_name", "price": "p.price", "stock": "p.stock"},
+    ),
+    "orders": (
+        "o.id, c.c_name, p.p_name, o.quantity, o.order_date",
+        "FROM Orders o JOIN Clients c ON o.client_id = c.id JOIN Products p ON o.product_id = p.id",
+        {"id": "o.id", "c_name": "c.c_name", "p_name": "p.p_name",
+         # Дата сортируется по нормализованному дню (order_day), а не по введённому тексту:
+         # '05.03.2025' и '2025-01-15' идут в хронологическом порядке. NULL — нераспознанная дата.
+         "quantity": "o.quantity", "order_date": "COALESCE(o.order_day, '')"},
+    ),
+}
+
+# FTS5-таблицы поиска по спискам из PAGE_QUERIES.
+SEARCH_INDEXES = {"clients": "ClientsSearch", "products": "ProductsSearch", "orders": "OrdersSearch"}
+
+# Группировка динамики заказов: шаг -> SQL-выражение начала периода (ISO-дата)
+# по дате из сводной таблицы DailyOrderCounts.
+TREND_GRANULARITIES = {
+    "day": "date(order_date)",
+    # '-6 days', 'weekday 1' — понедельник недели, в которую входит дата.
+    "week": "date(order_date, '-6 days', 'weekday 1')",
+    "month": "date(order_date, 'start of month')",
+    "quarter": "date(order_date, 'start of month', "
+               "printf('-%d months', (CAST(strftime('%m', order_date) AS INTEGER) - 1) % 3))",
+}
+
+# Дата заказа в формате ГГГГ-ММ-ДД по введённой строке: ISO-дата (в том числе со временем)
+# или ДД.ММ.ГГГГ из DateEntry в русской локали; NULL, если строку не удалось разобрать.
+ORDER_DAY_SQL = """COALESCE(
+    date(order_date),
+    CASE WHEN order_date GLOB '[0-9][0-9].[0-9][0-9].[0-9][0-9][0-9][0-9]'
+         THEN date(substr(order_date, 7, 4) || '-' || substr(order_date, 4, 2) || '-' || substr(order_date, 1, 2))
+    END)"""
+
+# Ключ сортировки для keyset-пагинации по значению столбца из показанной строки (параметр ?),
+# если ключ — не само значение столбца: kind -> {столбец: SQL-выражение}.
+PAGE_KEY_PARAMS = {
+    "orders": {"order_date": f"(SELECT COALESCE({ORDER_DAY_SQL}, '') FROM (SELECT ? AS order_date))"},
+}
+
+# Типизированные выгрузки таблиц в DataFrame: таблица -> {столбец: (SQL-выражение, dtype)}.
+# Имена — категории, ID и количества — int32 (nullable Int32 для внешних ключей),
+# дата заказа — datetime64 по нормализованной дате order_day.
+FRAME_COLUMNS = {
+    "Clients": {"id": ("id", "int32"), "c_name": ("c_name", "category"), "email": ("email", "object"),
+                "phone": ("phone", "object"), "address": ("address", "object")},
+    "Products": {"id": ("id", "int32"), "p_name": ("p_name", "category"), "price": ("price", "float64"),
+                 "stock": ("stock", "int32")},
+    "Orders": {"id": ("id", "int32"), "client_id": ("client_id", "Int32"), "product_id": ("product_id", "Int32"),
+               "quantity": ("quantity", "int32"), "order_date": ("order_day", "datetime64[ns]")},
+}
+
+# Пересчёт сводных таблиц статистики заказов с нуля по таблице Orders.
+# Выполняется миграцией и методом `Database.rebuild_order_stats`.
+ORDER_STATS_REBUILD = [
+    "DELETE FROM ClientOrderCounts",
+    "DELETE FROM DailyOrderCounts",
+    """INSERT INTO ClientOrderCounts (client_id, order_count)
+    SELECT client_id, COUNT(*) FROM Orders WHERE client_id IS NOT NULL GROUP BY client_id""",
+    """INSERT INTO DailyOrderCounts (order_date, order_count)
+    SELECT order_day, COUNT(*) FROM Orders WHERE order_day IS NOT NULL GROUP BY order_day""",
+]
+
+# Массовая загрузка (`Database.bulk_load`): таблица -> (INSERT для `executemany`,
+# триггеры вставки, отключаемые на время загрузки, и запросы, которые выполняют
+# их работу разом для всех новых строк — с ID больше :last).
+BULK_LOADS = {
+    "Clients": (
+        "INSERT INTO Clients (c_name, email, phone, address) VALUES (?, ?, ?, ?)",
+        ["clients_search_insert", "clients_version_insert"],
+        ["""INSERT INTO ClientsSearch (rowid, c_name, email, phone, address)
+        SELECT id, c_name, email, phone, address FROM Clients WHERE id > :last"""],
+    ),
+    "Products": (
+        "INSERT INTO Products (p_name, price, stock) VALUES (?, ?, ?)",
+        ["products_search_insert", "products_version_insert"],
+        ["INSERT INTO ProductsSearch (rowid, p_name) SELECT id, p_name FROM Products WHERE id > :last"],
+    ),
+    "Orders": (
+        "INSERT INTO Orders (client_id, product_id, quantity, order_date) VALUES (?, ?, ?, ?)",
+        ["orders_search_insert", "order_counts_insert", "orders_version_insert"],
+        ["""INSERT INTO OrdersSearch (rowid, c_name, p_name, order_date)
+        SELECT o.id, c.c_name, p.p_name, o.order_date
+        FROM Orders o
+        LEFT JOIN Clients c ON o.client_id = c.id
+        LEFT JOIN Products p ON o.product_id = p.id
+        WHERE o.id > :last""",
+         """INSERT INTO ClientOrderCounts (client_id, order_count)
+        SELECT client_id, COUNT(*) FROM Orders WHERE id > :last AND client_id IS NOT NULL GROUP BY client_id
+        ON CONFLICT (client_id) DO UPDATE SET order_count = order_count + excluded.order_count""",
+         """INSERT INTO DailyOrderCounts (order_date, order_count)
+        SELECT order_day, COUNT(*) FROM Orders WHERE id > :last AND order_day IS NOT NULL GROUP BY order_day
+        ON CONFLICT (order_date) DO UPDATE SET order_count = order_count + excluded.order_count"""],
+    ),
+}
+
+# Миграции схемы. Номер миграции — её позиция в списке, начиная с 1;
+# номер последней применённой хранится в PRAGMA user_version.
+# Каждая миграция — пара (описание, список SQL-команд).
+MIGRATIONS = [
+    ("Индексы по внешним ключам и полям поиска", [
+        "CREATE INDEX IF NOT EXISTS idx_orders_client_id ON Orders (client_id)",
+        "CREATE INDEX IF NOT EXISTS idx_orders_product_id ON Orders (product_id)",
+        "CREATE INDEX IF NOT EXISTS idx_orders_order_date ON Orders (order_date)",
+        "CREATE INDEX IF NOT EXISTS idx_clients_c_name ON Clients (c_name)",
+        "CREATE INDEX IF NOT EXISTS idx_products_p_name ON Products (p_name)",
+    ]),
+    ("Покрывающие индексы для статистики", [
+        # Связи клиент — товар (граф) и количество читаются прямо из индекса.
+        "CREATE INDEX IF NOT EXISTS idx_orders_client_product "
+        "ON Orders (client_id, product_id, quantity)",
+        # Составной индекс делает отдельный индекс по client_id избыточным.
+        "DROP INDEX IF EXISTS idx_orders_client_id",
+        "ANALYZE",
+    ]),
+    ("Полнотекстовый поиск FTS5 по клиентам, товарам и заказам", [
+        # Клиенты и товары: индекс над самой таблицей (external content).
+        "CREATE VIRTUAL TABLE IF NOT EXISTS ClientsSearch USING fts5("
+        "c_name, email, phone, address, content='Clients', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2')",
+        """CREATE TRIGGER IF NOT EXISTS clients_search_insert AFTER INSERT ON Clients BEGIN
+            INSERT INTO ClientsSearch (rowid, c_name, email, phone, address)
+            VALUES (new.id, new.c_name, new.email, new.phone, new.address);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS clients_search_delete AFTER DELETE ON Clients BEGIN
+            INSERT INTO ClientsSearch (ClientsSearch, rowid, c_name, email, phone, address)
+            VALUES ('delete', old.id, old.c_name, old.email, old.phone, old.address);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS clients_search_update AFTER UPDATE ON Clients BEGIN
+            INSERT INTO ClientsSearch (ClientsSearch, rowid, c_name, email, phone, address)
+            VALUES ('delete', old.id, old.c_name, old.email, old.phone, old.address);
+            INSERT INTO ClientsSearch (rowid, c_name, email, phone, address)
+            VALUES (new.id, new.c_name, new.email, new.phone, new.address);
+        END""",
+        "INSERT INTO ClientsSearch (ClientsSearch) VALUES ('rebuild')",
+        "CREATE VIRTUAL TABLE IF NOT EXISTS ProductsSearch USING fts5("
+        "p_name, content='Products', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2')",
+        """CREATE TRIGGER IF NOT EXISTS products_search_insert AFTER INSERT ON Products BEGIN
+            INSERT INTO ProductsSearch (rowid, p_name) VALUES (new.id, new.p_name);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS products_search_delete AFTER DELETE ON Products BEGIN
+            INSERT INTO ProductsSearch (ProductsSearch, rowid, p_name) VALUES ('delete', old.id, old.p_name);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS products_search_update AFTER UPDATE OF p_name ON Products BEGIN
+            INSERT INTO ProductsSearch (ProductsSearch, rowid, p_name) VALUES ('delete', old.id, old.p_name);
+            INSERT INTO ProductsSearch (rowid, p_name) VALUES (new.id, new.p_name);
+        END""",
+        "INSERT INTO ProductsSearch (ProductsSearch) VALUES ('rebuild')",
+        # Заказы ищутся по именам из соединения с клиентами и товарами,
+        # поэтому индекс хранит копию этих имён и обновляется при их изменении.
+        "CREATE VIRTUAL TABLE IF NOT EXISTS OrdersSearch USING fts5("
+        "c_name, p_name, order_date, tokenize='unicode61 remove_diacritics 2')",
+        """CREATE TRIGGER IF NOT EXISTS orders_search_insert AFTER INSERT ON Orders BEGIN
+            INSERT INTO OrdersSearch (rowid, c_name, p_name, order_date)
+            VALUES (new.id,
+                    (SELECT c_name FROM Clients WHERE id = new.client_id),
+                    (SELECT p_name FROM Products WHERE id = new.product_id),
+                    new.order_date);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS orders_search_delete AFTER DELETE ON Orders BEGIN
+            DELETE FROM OrdersSearch WHERE rowid = old.id;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS orders_search_update
+        AFTER UPDATE OF client_id, product_id, order_date ON Orders BEGIN
+            DELETE FROM OrdersSearch WHERE rowid = old.id;
+            INSERT INTO OrdersSearch (rowid, c_name, p_name, order_date)
+            VALUES (new.id,
+                    (SELECT c_name FROM Clients WHERE id = new.client_id),
+                    (SELECT p_name FROM Products WHERE id = new.product_id),
+                    new.order_date);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS orders_search_client_name AFTER UPDATE OF c_name ON Clients BEGIN
+            UPDATE OrdersSearch SET c_name = new.c_name
+            WHERE rowid IN (SELECT id FROM Orders WHERE client_id = new.id);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS orders_search_product_name AFTER UPDATE OF p_name ON Products BEGIN
+            UPDATE OrdersSearch SET p_name = new.p_name
+            WHERE rowid IN (SELECT id FROM Orders WHERE product_id = new.id);
+        END""",
+        """INSERT INTO OrdersSearch (rowid, c_name, p_name, order_date)
+        SELECT o.id, c.c_name, p.p_name, o.order_date
+        FROM Orders o
+        LEFT JOIN Clients c ON o.client_id = c.id
+        LEFT JOIN Products p ON o.product_id = p.id""",
+    ]),
+    ("Индексы для сортировки списков по столбцам", [
+        "CREATE INDEX IF NOT EXISTS idx_clients_email ON Clients (email)",
+        "CREATE INDEX IF NOT EXISTS idx_clients_phone ON Clients (phone)",
+        # Выражение совпадает с ключом сортировки address в PAGE_QUERIES.
+        "CREATE INDEX IF NOT EXISTS idx_clients_address ON Clients (COALESCE(address, ''))",
+        "CREATE INDEX IF NOT EXISTS idx_products_price ON Products (price)",
+        "CREATE INDEX IF NOT EXISTS idx_products_stock ON Products (stock)",
+        "CREATE INDEX IF NOT EXISTS idx_orders_quantity ON Orders (quantity)",
+    ]),
+    ("Сводные таблицы статистики заказов", [
+        # Количество заказов по клиентам и по датам поддерживается триггерами на Orders,
+        # поэтому статистика читает готовые строки вместо группировки всех заказов.
+        """CREATE TABLE IF NOT EXISTS ClientOrderCounts (
+            client_id INTEGER PRIMARY KEY,
+            order_count INTEGER NOT NULL
+        )""",
+        "CREATE INDEX IF NOT EXISTS idx_client_order_counts ON ClientOrderCounts (order_count)",
+        """CREATE TABLE IF NOT EXISTS DailyOrderCounts (
+            order_date TEXT PRIMARY KEY,
+            order_count INTEGER NOT NULL
+        ) WITHOUT ROWID""",
+        """CREATE TRIGGER IF NOT EXISTS order_counts_insert AFTER INSERT ON Orders BEGIN
+            INSERT INTO ClientOrderCounts (client_id, order_count)
+            SELECT new.client_id, 1 WHERE new.client_id IS NOT NULL
+            ON CONFLICT (client_id) DO UPDATE SET order_count = order_count + 1;
+            INSERT INTO DailyOrderCounts (order_date, order_count) VALUES (new.order_date, 1)
+            ON CONFLICT (order_date) DO UPDATE SET order_count = order_count + 1;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS order_counts_delete AFTER DELETE ON Orders BEGIN
+            UPDATE ClientOrderCounts SET order_count = order_count - 1 WHERE client_id = old.client_id;
+            DELETE FROM ClientOrderCounts WHERE client_id = old.client_id AND order_count <= 0;
+            UPDATE DailyOrderCounts SET order_count = order_count - 1 WHERE order_date = old.order_date;
+            DELETE FROM DailyOrderCounts WHERE order_date = old.order_date AND order_count <= 0;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS order_counts_update
+        AFTER UPDATE OF client_id, order_date ON Orders BEGIN
+            UPDATE ClientOrderCounts SET order_count = order_count - 1 WHERE client_id = old.client_id;
+            DELETE FROM ClientOrderCounts WHERE client_id = old.client_id AND order_count <= 0;
+            INSERT INTO ClientOrderCounts (client_id, order_count)
+            SELECT new.client_id, 1 WHERE new.client_id IS NOT NULL
+            ON CONFLICT (client_id) DO UPDATE SET order_count = order_count + 1;
+            UPDATE DailyOrderCounts SET order_count = order_count - 1 WHERE order_date = old.order_date;
+            DELETE FROM DailyOrderCounts WHERE order_date = old.order_date AND order_count <= 0;
+            INSERT INTO DailyOrderCounts (order_date, order_count) VALUES (new.order_date, 1)
+            ON CONFLICT (order_date) DO UPDATE SET order_count = order_count + 1;
+        END""",
+        # Пересчёт в том виде, в каком он был до миграции 6 (столбца order_day ещё нет).
+        "DELETE FROM ClientOrderCounts",
+        "DELETE FROM DailyOrderCounts",
+        """INSERT INTO ClientOrderCounts (client_id, order_count)
+        SELECT client_id, COUNT(*) FROM Orders WHERE client_id IS NOT NULL GROUP BY client_id""",
+        """INSERT INTO DailyOrderCounts (order_date, order_count)
+        SELECT order_date, COUNT(*) FROM Orders GROUP BY order_date""",
+    ]),
+    ("Нормализованная дата заказа", [
+        # Вычисляемый столбец не требует заполнения: значения для существующих строк
+        # появляются сразу, а индекс по нему строится по всем заказам.
+        f"ALTER TABLE Orders ADD COLUMN order_day TEXT GENERATED ALWAYS AS ({ORDER_DAY_SQL}) VIRTUAL",
+        "CREATE INDEX IF NOT EXISTS idx_orders_order_day ON Orders (order_day)",
+        # Сводная таблица по датам ведётся по нормализованной дате: порядок строк
+        # совпадает с хронологическим, нераспознанные даты в неё не попадают.
+        "DROP TRIGGER IF EXISTS order_counts_insert",
+        "DROP TRIGGER IF EXISTS order_counts_delete",
+        "DROP TRIGGER IF EXISTS order_counts_update",
+        """CREATE TRIGGER order_counts_insert AFTER INSERT ON Orders BEGIN
+            INSERT INTO ClientOrderCounts (client_id, order_count)
+            SELECT new.client_id, 1 WHERE new.client_id IS NOT NULL
+            ON CONFLICT (client_id) DO UPDATE SET order_count = order_count + 1;
+            INSERT INTO DailyOrderCounts (order_date, order_count)
+            SELECT new.order_day, 1 WHERE new.order_day IS NOT NULL
+            ON CONFLICT (order_date) DO UPDATE SET order_count = order_count + 1;
+        END""",
+        """CREATE TRIGGER order_counts_delete AFTER DELETE ON Orders BEGIN
+            UPDATE ClientOrderCounts SET order_count = order_count - 1 WHERE client_id = old.client_id;
+            DELETE FROM ClientOrderCounts WHERE client_id = old.client_id AND order_count <= 0;
+            UPDATE DailyOrderCounts SET order_count = order_count - 1 WHERE order_date = old.order_day;
+            DELETE FROM DailyOrderCounts WHERE order_date = old.order_day AND order_count <= 0;
+        END""",
+        """CREATE TRIGGER order_counts_update
+        AFTER UPDATE OF client_id, order_date ON Orders BEGIN
+            UPDATE ClientOrderCounts SET order_count = order_count - 1 WHERE client_id = old.client_id;
+            DELETE FROM ClientOrderCounts WHERE client_id = old.client_id AND order_count <= 0;
+            INSERT INTO ClientOrderCounts (client_id, order_count)
+            SELECT new.client_id, 1 WHERE new.client_id IS NOT NULL
+            ON CONFLICT (client_id) DO UPDATE SET order_count = order_count + 1;
+            UPDATE DailyOrderCounts SET order_count = order_count - 1 WHERE order_date = old.order_day;
+            DELETE FROM DailyOrderCounts WHERE order_date = old.order_day AND order_count <= 0;
+            INSERT INTO DailyOrderCounts (order_date, order_count)
+            SELECT new.order_day, 1 WHERE new.order_day IS NOT NULL
+            ON CONFLICT (order_date) DO UPDATE SET order_count = order_count + 1;
+        END""",
+        *ORDER_STATS_REBUILD,
+    ]),
+    ("Версии таблиц для снимков DataFrame", [
+        # Версия увеличивается триггерами при любом изменении таблицы и хранится в файле,
+        # поэтому снимок на диске можно проверить и из другого процесса. Начальное значение
+        # случайное, чтобы снимки пересозданной базы с тем же именем не считались актуальными.
+        """CREATE TABLE IF NOT EXISTS TableVersions (
+            name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL
+        ) WITHOUT ROWID""",
+        *[f"INSERT OR IGNORE INTO TableVersions (name, version) VALUES ('{table}', abs(random() % 1000000000000))"
+          for table in FRAME_COLUMNS],
+        *[f"""CREATE TRIGGER IF NOT EXISTS {table.lower()}_version_{event.lower()} AFTER {event} ON {table} BEGIN
+            UPDATE TableVersions SET version = version + 1 WHERE name = '{table}';
+        END""" for table in FRAME_COLUMNS for event in ("INSERT", "UPDATE", "DELETE")],
+    ]),
+    ("Сортировка заказов по нормализованной дате", [
+        # Выражение совпадает с ключом сортировки order_date в PAGE_QUERIES;
+        # индекс по тексту даты больше ни одним запросом не используется.
+        "CREATE INDEX IF NOT EXISTS idx_orders_order_day_sort ON Orders (COALESCE(order_day, ''))",
+        "DROP INDEX IF EXISTS idx_orders_order_date",
+    ]),
+]
+
+
+def _chunked(rows: Iterable, size: int):
+    """
+    Разбивает произвольный итерируемый объект на списки фиксированного размера.
+    Не материализует источник целиком, поэтому подходит для генераторов.
+    Args:
+        rows (Iterable): Источник строк.
+        size (int): Максимальный размер одной пачки.
+    Yields:
+        list: Очередная пачка строк (последняя может быть короче).
+    """
+    if size <= 0:
+        raise ValueError("Размер пачки должен быть положительным числом.")
+    iterator = iter(rows)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def read_only(method):
+    """
+    Помечает метод `Database` как только читающий данные.
+    `ConnectionPool` направляет такие методы на соединения-читатели,
+    остальные — на единственное соединение-писатель.
+    Args:
+        method (callable): Метод класса Database.
+    Returns:
+        callable: Тот же метод с атрибутом `read_only = True`.
+    """
+    method.read_only = True
+    return method
+
+
+def _copy_result(result):
+    """
+    Копирует изменяемые контейнеры результата, чтобы вызывающий код не испортил
+    запомненное значение: список копируется, кортеж (например, узлы и связи
+    `client_product_subgraph`) собирается из копий элементов. Строки — кортежи
+    неизменяемых значений — не копируются.
+    Args:
+        result: Результат метода.
+    Returns:
+        Копия результата.
+    """
+    if isinstance(result, list):
+        return list(result)
+    if isinstance(result, tuple):
+        return tuple(map(_copy_result, result))
+    return result
+
+
+def cached_query(method):
+    """
+    Запоминает результат метода `Database` в `Database.query_cache` по имени метода
+    и аргументам. Кэш сбрасывается, как только меняется версия данных соединения
+    (`Database.data_version`), поэтому повторный вызов без изменений в базе
+    не выполняет запрос.
+    Args:
+        method (callable): Читающий метод класса Database.
+    Returns:
+        callable: Обёртка с кэшированием.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+        found, result = self.query_cache.lookup(self.data_version(), key)
+        if not found:
+            result = method(self, *args, **kwargs)
+            self.query_cache.store(key, result)
+        return _copy_result(result)
+
+    return wrapper
+
+
+class QueryCache:
+    """
+    Ограниченный LRU-кэш результатов запросов одного соединения.
+    Все записи относятся к одной версии данных: при обращении с другой версией
+    кэш очищается. Считает попадания и промахи.
+    """
+
+    def __init__(self, maxsize: int = QUERY_CACHE_SIZE):
+        """
+        Args:
+            maxsize (int): Максимальное количество запомненных результатов. По умолчанию — 32.
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._version = None
+        self._lock = threading.Lock()
+
+    def lookup(self, version, key) -> tuple[bool, object]:
+        """
+        Ищет результат запроса для текущей версии данных.
+        Args:
+            version (Hashable): Текущая версия данных соединения.
+            key (Hashable): Запрос и его параметры.
+        Returns:
+            tuple[bool, object]: Найден ли результат и сам результат.
+        """
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def store(self, key, result) -> None:
+        """
+        Запоминает результат, вытесняя самый давно использованный при переполнении.
+        Args:
+            key (Hashable): Запрос и его параметры.
+            result (object): Результат запроса.
+        """
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        Удаляет все запомненные результаты (счётчики сохраняются).
+        """
+        with self._lock:
+            self._entries.clear()
+            self._version = None
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: Попадания, промахи, текущий и максимальный размер кэша.
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses,
+                    "size": len(self._entries), "maxsize": self.maxsize}
+
+
+def fts_query(term: str) -> str:
+    """
+    Преобразует введённый пользователем текст в запрос FTS5 с поиском по префиксу.
+    Каждое слово становится фразой из его буквенно-цифровых частей с `*` на конце,
+    слова объединяются через AND: 'иван пет' -> '"иван"* "пет"*',
+    'ivan.pet' -> '"ivan pet"*'. Кавычки и операторы FTS5 во вводе не действуют.
+    Args:
+        term (str): Текст из строки поиска.
+    Returns:
+        str: Запрос для MATCH или пустая строка, если искать нечего.
+    """
+    phrases = []
+    for word in term.split():
+        tokens = re.findall(r"\w+", word)
+        if tokens:
+            phrases.append('"' + " ".join(tokens) + '"*')
+    return " ".join(phrases)
 
 
 class Database:
@@ -12,15 +556,72 @@ class Database:
     автоматического управления транзакциями.
     """
 
-    def __init__(self, db_name=DB_NAME):
+    def __init__(self, db_name=DB_NAME, profile: str = DEFAULT_PROFILE, readonly: bool = False):
         """
-        Инициализирует подключение к базе данных и создаёт таблицы при необходимости.
+        Инициализирует подключение к базе данных, применяет профиль производительности,
+        создаёт таблицы при необходимости и применяет миграции схемы.
+        Соединение разрешено использовать из разных потоков: последовательный доступ
+        к нему обеспечивает вызывающий код (см. `ConnectionPool`).
         Args:
             db_name (str): Путь к файлу базы данных. По умолчанию — 'store.db'.
+            profile (str): Имя профиля из `PERFORMANCE_PROFILES`. По умолчанию — 'desktop'.
+            readonly (bool): Открыть базу только для чтения. Схема при этом не создаётся
+                и не мигрирует — этим занимается соединение-писатель.
         """
-        self.conn = sqlite3.connect(db_name)
+        if readonly:
+            uri = f"{Path(db_name).resolve().as_uri()}?mode=ro"
+            self.conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        else:
+            self.conn = sqlite3.connect(db_name, check_same_thread=False)
         self.cursor = self.conn.cursor()
-        self.create_tables()
+        self.query_cache = QueryCache()
+        self.profile = None
+        self.apply_profile(profile)
+        if not readonly:
+            self.create_tables()
+
+    def apply_profile(self, name: str) -> None:
+        """
+        Применяет к соединению профиль производительности (набор PRAGMA).
+        Args:
+            name (str): Имя профиля из `PERFORMANCE_PROFILES`.
+        Raises:
+            ValueError: Если профиль с таким именем не найден.
+        """
+        if name not in PERFORMANCE_PROFILES:
+            raise ValueError(f"Неизвестный профиль производительности: {name}")
+        if self.conn.in_transaction:
+            self.conn.commit()
+        for pragma, value in PERFORMANCE_PROFILES[name].items():
+            self.conn.execute(f"PRAGMA {pragma} = {value}")
+        self.profile = name
+
+    def profile_settings(self) -> dict:
+        """
+        Возвращает фактические значения PRAGMA, которыми управляют профили.
+        Для базы в памяти journal_mode остаётся 'memory' независимо от профиля.
+        Returns:
+            dict: Словарь {pragma: значение} по данным SQLite.
+        """
+        pragmas = PERFORMANCE_PROFILES[DEFAULT_PROFILE]
+        return {pragma: self.conn.execute(f"PRAGMA {pragma}").fetchone()[0] for pragma in pragmas}
+
+    @contextmanager
+    def using_profile(self, name: str):
+        """
+        Временно переключает профиль производительности, например на 'bulk-load'
+        на время массовой загрузки. По выходу из блока возвращает прежний профиль.
+        Args:
+            name (str): Имя временного профиля.
+        Yields:
+            Database: Этот же объект базы данных.
+        """
+        previous = self.profile
+        self.apply_profile(name)
+        try:
+            yield self
+        finally:
+            self.apply_profile(previous)
 
     def create_tables(self):
         """
@@ -60,10 +661,237 @@ class Database:
                 )
             """)
             self.conn.commit()
+        self.migrate()
+
+    def data_version(self) -> tuple[int, int]:
+        """
+        Возвращает версию данных, видимых соединением, для сброса `query_cache`.
+        PRAGMA data_version меняется после фиксации изменений другими соединениями,
+        `total_changes` — после изменений через это соединение. Запрос к таблицам
+        при этом не выполняется.
+        Returns:
+            tuple[int, int]: Пара (data_version, total_changes).
+        """
+        return self.conn.execute("PRAGMA data_version").fetchone()[0], self.conn.total_changes
+
+    def schema_version(self) -> int:
+        """
+        Возвращает номер последней применённой миграции схемы.
+        Returns:
+            int: Значение PRAGMA user_version.
+        """
+        return self.conn.execute("PRAGMA user_version").fetchone()[0]
+
+    def migrate(self) -> int:
+        """
+        Применяет к базе все ещё не применённые миграции из `MIGRATIONS`.
+        Каждая миграция выполняется в отдельной транзакции вместе с обновлением
+        PRAGMA user_version, поэтому существующий файл базы обновляется на месте,
+        а прерванная миграция не оставляет схему в промежуточном состоянии.
+        Returns:
+            int: Номер версии схемы после применения миграций.
+        Raises:
+            RuntimeError: Если версия базы новее, чем известно приложению.
+        """
+        version = self.schema_version()
+        if version > len(MIGRATIONS):
+            raise RuntimeError(f"Версия схемы базы ({version}) новее поддерживаемой ({len(MIGRATIONS)}).")
+
+        for number, (description, statements) in enumerate(MIGRATIONS[version:], start=version + 1):
+            try:
+                self.conn.execute("BEGIN")
+                for statement in statements:
+                    self.conn.execute(statement)
+                self.conn.execute(f"PRAGMA user_version = {number}")
+                self.conn.commit()
+            except sqlite3.Error as e:
+                self.conn.rollback()
+                raise RuntimeError(f"Ошибка миграции {number} ({description}): {e}") from e
+        return self.schema_version()
+
+    def _insert_bulk(self, sql: str, rows: Iterable, batch_size: int) -> list[int]:
+        """
+        Вставляет строки пачками через `executemany` в рамках одной транзакции.
+        ID вычисляются по `last_insert_rowid()` после каждой пачки: пока транзакция
+        удерживает блокировку записи, AUTOINCREMENT выдаёт идущие подряд значения.
+        Args:
+            sql (str): INSERT-запрос с параметрами.
+            rows (Iterable): Кортежи параметров (допускается генератор).
+            batch_size (int): Количество строк в одной пачке.
+        Returns:
+            list[int]: ID вставленных строк в порядке исходных данных.
+        """
+        ids = []
+        with self.conn:
+            cursor = self.conn.cursor()
+            for batch in _chunked(rows, batch_size):
+                cursor.executemany(sql, batch)
+                last_id = cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+                ids.extend(range(last_id - len(batch) + 1, last_id + 1))
+        return ids
+
+    @contextmanager
+    def bulk_load(self, table: str, rebuild_indexes: bool = None):
+        """
+        Открывает транзакцию массовой загрузки строк в таблицу (профиль 'bulk-load').
+        Триггеры вставки из `BULK_LOADS` на время загрузки удаляются, а их работа
+        (полнотекстовый индекс, сводные таблицы, версия таблицы) выполняется
+        в конце одним запросом на все новые строки. При перестройке индексов
+        вторичные индексы таблицы тоже удаляются и создаются заново после вставки —
+        это быстрее, чем обновлять их построчно, если таблица была пуста.
+        Всё выполняется одной транзакцией: при исключении база остаётся без изменений,
+        а другие соединения не видят схему без триггеров и индексов.
+        Args:
+            table (str): Ключ `BULK_LOADS`: 'Clients', 'Products' или 'Orders'.
+            rebuild_indexes (bool, optional): Перестроить вторичные индексы;
+                по умолчанию — только если таблица пуста.
+        Yields:
+            callable: Функция rows -> None, добавляющая пачку кортежей через `executemany`.
+        """
+        insert, triggers, catch_up = BULK_LOADS[table]
+        with self.using_profile("bulk-load"):
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                last = self.conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}").fetchone()[0]
+                if rebuild_indexes is None:
+                    rebuild_indexes = last == 0
+                suspended = self.conn.execute(
+                    f"""SELECT type, name, sql FROM sqlite_master
+                    WHERE (type = 'trigger' AND name IN ({", ".join("?" * len(triggers))}))
+                       OR (type = 'index' AND tbl_name = ? AND sql IS NOT NULL AND ?)""",
+                    (*triggers, table, rebuild_indexes)
+                ).fetchall()
+                for kind, name, _ in suspended:
+                    self.conn.execute(f"DROP {kind.upper()} {name}")
+                cursor = self.conn.cursor()
+                yield lambda rows: cursor.executemany(insert, rows)
+                for _, _, sql in suspended:
+                    self.conn.execute(sql)
+                for statement in catch_up:
+                    self.conn.execute(statement, {"last": last})
+                self.conn.execute("UPDATE TableVersions SET version = version + 1 WHERE name = ?", (table,))
+                self.conn.commit()
+            except BaseException:
+                self.conn.rollback()
+                raise
+
+    def _select_page(self, kind: str, limit: int, order_by: str = "id", descending: bool = False,
+                     after_id: int = None, after_value=None, offset: int = 0,
+                     date_range: tuple = None) -> list[tuple]:
+        """
+        Выбирает одну страницу строк списка из `PAGE_QUERIES`.
+        Если задан `after_id`, страница начинается сразу после строки с этим ID и
+        значением ключа `after_value` (keyset-пагинация, не зависит от глубины);
+        иначе пропускаются первые `offset` строк.
+        Args:
+            kind (str): Ключ `PAGE_QUERIES`: 'clients', 'products' или 'orders'.
+            limit (int): Максимальное количество строк.
+            order_by (str): Столбец сортировки.
+            descending (bool): Сортировать по убыванию.
+            after_id (int, optional): ID последней строки предыдущей страницы.
+            after_value (optional): Значение столбца сортировки в этой строке.
+            offset (int): Количество пропускаемых строк (без `after_id`).
+            date_range (tuple, optional): Период (первая дата, последняя дата), только для заказов.
+        Returns:
+            list[tuple]: Строки страницы.
+        Raises:
+            ValueError: Если столбец сортировки не поддерживается или период задан не для заказов.
+        """
+        select_list, _, columns = PAGE_QUERIES[kind]
+        if order_by not in columns:
+            raise ValueError(f"Недопустимый столбец сортировки: {order_by}")
+        key, id_key = columns[order_by], columns["id"]
+        op, direction = ("<", "DESC") if descending else (">", "ASC")
+
+        source, params = self._view_source(kind, date_range=date_range)
+        sql = f"SELECT {select_list} {source}"
+        if after_id is not None:
+            sql += " AND " if params else " WHERE "
+            if key == id_key:
+                sql += f"{id_key} {op} ?"
+                params.append(after_id)
+            else:
+                value = PAGE_KEY_PARAMS.get(kind, {}).get(order_by, "?")
+                sql += f"({key}, {id_key}) {op} ({value}, ?)"
+                params.extend(["" if after_value is None else after_value, after_id])
+        sql += f" ORDER BY {key} {direction}, {id_key} {direction} LIMIT ?"
+        params.append(limit)
+        if after_id is None and offset:
+            sql += " OFFSET ?"
+            params.append(offset)
+
+        with self.conn:
+            self.cursor.execute(sql, params)
+            return self.cursor.fetchall()
+
+    def _count(self, kind: str, date_range: tuple = None) -> int:
+        """
+        Считает строки списка из `PAGE_QUERIES`.
+        Args:
+            kind (str): Ключ `PAGE_QUERIES`.
+            date_range (tuple, optional): Период дат, только для заказов.
+        Returns:
+            int: Количество строк.
+        """
+        source, params = self._view_source(kind, date_range=date_range)
+        with self.conn:
+            self.cursor.execute(f"SELECT COUNT(*) {source}", params)
+            return self.cursor.fetchone()[0]
+
+    def _select_row(self, kind: str, row_id: int) -> tuple | None:
+        """
+        Выбирает одну строку списка из `PAGE_QUERIES` по первичному ключу — в том же
+        формате, что и страницы списка. Используется для точечного обновления таблиц.
+        Args:
+            kind (str): Ключ `PAGE_QUERIES`.
+            row_id (int): ID строки.
+        Returns:
+            tuple | None: Строка списка или None, если строки нет (например, удалена).
+        """
+        select_list, source, columns = PAGE_QUERIES[kind]
+        with self.conn:
+            self.cursor.execute(f"SELECT {select_list} {source} WHERE {columns['id']} = ?", (row_id,))
+            return self.cursor.fetchone()
+
+    def _iter_query(self, sql: str, params: tuple = (), batch_size: int = STREAM_BATCH_SIZE):
+        """
+        Выполняет запрос на отдельном курсоре и отдаёт строки по мере чтения.
+        Строки забираются через `fetchmany`, поэтому в памяти одновременно
+        находится не больше одной пачки, а общий `self.cursor` остаётся свободным.
+        Args:
+            sql (str): SELECT-запрос.
+            params (tuple): Параметры запроса.
+            batch_size (int): Количество строк, читаемых за один вызов `fetchmany`.
+        Yields:
+            tuple: Очередная строка результата.
+        """
+        for rows in self._iter_chunks(sql, params, batch_size):
+            yield from rows
+
+    def _iter_chunks(self, sql: str, params: tuple = (), batch_size: int = STREAM_BATCH_SIZE):
+        """
+        То же, что `_iter_query`, но отдаёт строки пачками — как их вернул `fetchmany`.
+        Args:
+            sql (str): SELECT-запрос.
+            params (tuple): Параметры запроса.
+            batch_size (int): Количество строк в пачке.
+        Yields:
+            list[tuple]: Очередная непустая пачка строк.
+        """
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                yield rows
+        finally:
+            cursor.close()
 
     # ----- Работа с клиентами -----
 
-    def insert_client(self, c_name: str, email: str, phone: str, address: str) -> None:
+    def insert_client(self, c_name: str, email: str, phone: str, address: str) -> int:
         """
         Добавляет нового клиента в таблицу Clients.
         Args:
@@ -71,6 +899,8 @@ class Database:
             email (str): Электронная почта клиента.
             phone (str): Номер телефона клиента.
             address (str): Адрес клиента.
+        Returns:
+            int: ID добавленного клиента.
         """
         with self.conn:
             self.cursor.execute(
@@ -78,17 +908,94 @@ class Database:
                 (c_name, email, phone, address)
             )
             self.conn.commit()
+            return self.cursor.lastrowid
+
+    def insert_clients_bulk(self, clients: Iterable[tuple],
+                            batch_size: int = BULK_BATCH_SIZE) -> list[int]:
+        """
+        Массово добавляет клиентов одной транзакцией.
+        Args:
+            clients (Iterable[tuple]): Кортежи (c_name, email, phone, address), в том числе генератор.
+            batch_size (int): Размер пачки для `executemany`. По умолчанию — 1000.
+        Returns:
+            list[int]: ID добавленных клиентов.
+        """
+        return self._insert_bulk(
+            "INSERT INTO Clients (c_name, email, phone, address) VALUES (?, ?, ?, ?)",
+            clients, batch_size
+        )
 
-    def load_client(self) -> list[tuple]:
+    @read_only
+    def load_client(self, order_by: str = None, descending: bool = False) -> list[tuple]:
         """
         Загружает всех клиентов из таблицы Clients.
+        Args:
+            order_by (str, optional): Столбец сортировки из `PAGE_QUERIES['clients']`;
+                сортировка выполняется в базе с учётом типа столбца.
+            descending (bool): Сортировать по убыванию.
         Returns:
             list[tuple]: Список кортежей с данными клиентов: (id, c_name, email, phone, address).
         """
+        if order_by is not None:
+            return self._select_page("clients", -1, order_by, descending)
         with self.conn:
             self.cursor.execute("SELECT * FROM Clients")
             return self.cursor.fetchall()
 
+    @read_only
+    def load_clients_page(self, after_id: int = None, limit: int = PAGE_SIZE, order_by: str = "id",
+                          descending: bool = False, after_value=None) -> list[tuple]:
+        """
+        Загружает страницу клиентов по keyset-курсору: строки сразу после указанной.
+        Args:
+            after_id (int, optional): ID последней строки предыдущей страницы; None — с начала.
+            limit (int): Размер страницы. По умолчанию — 200.
+            order_by (str): Столбец сортировки из `PAGE_QUERIES['clients']`. По умолчанию — 'id'.
+            descending (bool): Сортировать по убыванию.
+            after_value (optional): Значение столбца сортировки в строке `after_id`
+                (не нужно при сортировке по ID).
+        Returns:
+            list[tuple]: Кортежи (id, c_name, email, phone, address).
+        """
+        return self._select_page("clients", limit, order_by, descending, after_id, after_value)
+
+    @read_only
+    def load_clients_slice(self, offset: int, limit: int = PAGE_SIZE, order_by: str = "id",
+                           descending: bool = False) -> list[tuple]:
+        """
+        Загружает страницу клиентов по смещению — для перехода к произвольной позиции списка.
+        Args:
+            offset (int): Количество пропускаемых строк.
+            limit (int): Размер страницы. По умолчанию — 200.
+            order_by (str): Столбец сортировки из `PAGE_QUERIES['clients']`. По умолчанию — 'id'.
+            descending (bool): Сортировать по убыванию.
+        Returns:
+            list[tuple]: Кортежи (id, c_name, email, phone, address).
+        """
+        return self._select_page("clients", limit, order_by, descending, offset=offset)
+
+    @read_only
+    def count_clients(self) -> int:
+        """
+        Считает количество клиентов в списке.
+        Returns:
+            int: Количество строк.
+        """
+        return self._count("clients")
+
+    @read_only
+    def load_client_row(self, client_id: int) -> tuple | None:
+        """
+        Загружает одну строку списка клиентов — после добавления или изменения клиента,
+        чтобы обновить в таблице только её.
+        Args:
+            client_id (int): ID клиента.
+        Returns:
+            tuple | None: Кортеж (id, c_name, email, phone, address) или None, если клиента нет.
+        """
+        return self._select_row("clients", client_id)
+
+    @read_only
     def get_clients(self) -> list[tuple]:
         """
         Получает список всех клиентов с их ID и именами.
@@ -100,6 +1007,7 @@ class Database:
             self.cursor.execute("SELECT id, c_name FROM Clients")
             return self.cursor.fetchall()
 
+    @read_only
     def get_client_id(self, cl_name: str) -> tuple | None:
         """
         Находит ID клиента по его имени.
@@ -163,13 +1071,15 @@ class Database:
 
     # ----- Работа с товарами -----
 
-    def insert_product(self, p_name: str, price: float, stock: int) -> None:
+    def insert_product(self, p_name: str, price: float, stock: int) -> int:
         """
         Добавляет новый товар в таблицу Products.
         Args:
             p_name (str): Название товара.
             price (float): Цена товара (должна быть >= 0).
             stock (int): Количество на складе (должно быть >= 0).
+        Returns:
+            int: ID добавленного товара.
         """
         with self.conn:
             self.cursor.execute(
@@ -177,17 +1087,94 @@ class Database:
                 (p_name, price, stock)
             )
             self.conn.commit()
+            return self.cursor.lastrowid
+
+    def insert_products_bulk(self, products: Iterable[tuple],
+                             batch_size: int = BULK_BATCH_SIZE) -> list[int]:
+        """
+        Массово добавляет товары одной транзакцией.
+        Args:
+            products (Iterable[tuple]): Кортежи (p_name, price, stock), в том числе генератор.
+            batch_size (int): Размер пачки для `executemany`. По умолчанию — 1000.
+        Returns:
+            list[int]: ID добавленных товаров.
+        """
+        return self._insert_bulk(
+            "INSERT INTO Products (p_name, price, stock) VALUES (?, ?, ?)",
+            products, batch_size
+        )
 
-    def load_product(self) -> list[tuple]:
+    @read_only
+    def load_product(self, order_by: str = None, descending: bool = False) -> list[tuple]:
         """
         Загружает все товары из таблицы Products.
+        Args:
+            order_by (str, optional): Столбец сортировки из `PAGE_QUERIES['products']`;
+                сортировка выполняется в базе с учётом типа столбца.
+            descending (bool): Сортировать по убыванию.
         Returns:
             list[tuple]: Список кортежей с данными товаров: (id, p_name, price, stock).
         """
+        if order_by is not None:
+            return self._select_page("products", -1, order_by, descending)
         with self.conn:
             self.cursor.execute("SELECT * FROM Products")
             return self.cursor.fetchall()
 
+    @read_only
+    def load_products_page(self, after_id: int = None, limit: int = PAGE_SIZE, order_by: str = "id",
+                           descending: bool = False, after_value=None) -> list[tuple]:
+        """
+        Загружает страницу товаров по keyset-курсору: строки сразу после указанной.
+        Args:
+            after_id (int, optional): ID последней строки предыдущей страницы; None — с начала.
+            limit (int): Размер страницы. По умолчанию — 200.
+            order_by (str): Столбец сортировки из `PAGE_QUERIES['products']`. По умолчанию — 'id'.
+            descending (bool): Сортировать по убыванию.
+            after_value (optional): Значение столбца сортировки в строке `after_id`
+                (не нужно при сортировке по ID).
+        Returns:
+            list[tuple]: Кортежи (id, p_name, price, stock).
+        """
+        return self._select_page("products", limit, order_by, descending, after_id, after_value)
+
+    @read_only
+    def load_products_slice(self, offset: int, limit: int = PAGE_SIZE, order_by: str = "id",
+                            descending: bool = False) -> list[tuple]:
+        """
+        Загружает страницу товаров по смещению — для перехода к произвольной позиции списка.
+        Args:
+            offset (int): Количество пропускаемых строк.
+            limit (int): Размер страницы. По умолчанию — 200.
+            order_by (str): Столбец сортировки из `PAGE_QUERIES['products']`. По умолчанию — 'id'.
+            descending (bool): Сортировать по убыванию.
+        Returns:
+            list[tuple]: Кортежи (id, p_name, price, stock).
+        """
+        return self._select_page("products", limit, order_by, descending, offset=offset)
+
+    @read_only
+    def count_products(self) -> int:
+        """
+        Считает количество товаров в списке.
+        Returns:
+            int: Количество строк.
+        """
+        return self._count("products")
+
+    @read_only
+    def load_product_row(self, product_id: int) -> tuple | None:
+        """
+        Загружает одну строку списка товаров — после добавления или изменения товара,
+        чтобы обновить в таблице только её.
+        Args:
+            product_id (int): ID товара.
+        Returns:
+            tuple | None: Кортеж (id, p_name, price, stock) или None, если товара нет.
+        """
+        return self._select_row("products", product_id)
+
+    @read_only
     def get_products(self) -> list[tuple]:
         """
         Получает список всех товаров с их ID и наименованиями.
@@ -199,6 +1186,7 @@ class Database:
             self.cursor.execute("SELECT id, p_name FROM Products")
             return self.cursor.fetchall()
 
+    @read_only
     def get_product_id(self, pr_name: str) -> tuple | None:
         """
         Находит ID товара по его наименованию.
@@ -258,7 +1246,7 @@ class Database:
 
     # ----- Работа с заказами -----
 
-    def insert_order(self, client_id: int, product_id: int, quantity: int, order_date: str) -> None:
+    def insert_order(self, client_id: int, product_id: int, quantity: int, order_date: str) -> int:
         """
         Добавляет новый заказ в таблицу Orders.
         Args:
@@ -266,21 +1254,47 @@ class Database:
             product_id (int): ID товара.
             quantity (int): Количество товара в заказе.
             order_date (str): Дата заказа в формате 'YYYY-MM-DD'.
+        Returns:
+            int: ID добавленного заказа.
         """
         with self.conn:
-            self.conn.execute(
+            self.cursor.execute(
                 "INSERT INTO Orders (client_id, product_id, quantity, order_date) VALUES (?, ?, ?, ?)",
                 (client_id, product_id, quantity, order_date)
             )
             self.conn.commit()
+            return self.cursor.lastrowid
+
+    def insert_orders_bulk(self, orders: Iterable[tuple],
+                           batch_size: int = BULK_BATCH_SIZE) -> list[int]:
+        """
+        Массово добавляет заказы одной транзакцией (например, ночную выгрузку).
+        Args:
+            orders (Iterable[tuple]): Кортежи (client_id, product_id, quantity, order_date),
+                в том числе генератор.
+            batch_size (int): Размер пачки для `executemany`. По умолчанию — 1000.
+        Returns:
+            list[int]: ID добавленных заказов.
+        """
+        return self._insert_bulk(
+            "INSERT INTO Orders (client_id, product_id, quantity, order_date) VALUES (?, ?, ?, ?)",
+            orders, batch_size
+        )
 
-    def load_order(self) -> list[tuple]:
+    @read_only
+    def load_order(self, order_by: str = None, descending: bool = False) -> list[tuple]:
         """
         Загружает все заказы с именами клиентов и товаров.
         Выполняет JOIN с таблицами Clients и Products для отображения человекочитаемых данных.
+        Args:
+            order_by (str, optional): Столбец сортировки из `PAGE_QUERIES['orders']`;
+                сортировка выполняется в базе с учётом типа столбца.
+            descending (bool): Сортировать по убыванию.
         Returns:
             list[tuple]: Список кортежей: (order_id, client_name, product_name, quantity, order_date).
         """
+        if order_by is not None:
+            return self._select_page("orders", -1, order_by, descending)
         with self.conn:
             self.cursor.execute("""
                 SELECT 
@@ -295,6 +1309,114 @@ class Database:
             """)
             return self.cursor.fetchall()
 
+    @read_only
+    def orders_between(self, start: str, end: str, order_by: str = None, descending: bool = False) -> list[tuple]:
+        """
+        Загружает заказы за период по нормализованной дате (столбец order_day):
+        диапазон выбирается по индексу idx_orders_order_day.
+        Args:
+            start (str): Первая дата периода в формате ГГГГ-ММ-ДД включительно.
+            end (str): Последняя дата периода включительно.
+            order_by (str, optional): Столбец сортировки из `PAGE_QUERIES['orders']`;
+                по умолчанию — по дате и ID.
+            descending (bool): Сортировать по убыванию.
+        Returns:
+            list[tuple]: Кортежи (order_id, client_name, product_name, quantity, order_date).
+        Raises:
+            ValueError: Если столбец сортировки не поддерживается.
+        """
+        select_list, source, columns = PAGE_QUERIES["orders"]
+        direction = "DESC" if descending else "ASC"
+        if order_by is None:
+            order = f"o.order_day {direction}, o.id {direction}"
+        elif order_by in columns:
+            order = f"{columns[order_by]} {direction}, o.id {direction}"
+        else:
+            raise ValueError(f"Недопустимый столбец сортировки: {order_by}")
+        with self.conn:
+            self.cursor.execute(f"""
+                SELECT {select_list} {source}
+                WHERE o.order_day BETWEEN ? AND ?
+                ORDER BY {order}
+            """, (start, end))
+            return self.cursor.fetchall()
+
+    @read_only
+    def load_orders_page(self, after_id: int = None, limit: int = PAGE_SIZE, order_by: str = "id",
+                         descending: bool = False, after_value=None, date_range: tuple = None) -> list[tuple]:
+        """
+        Загружает страницу заказов по keyset-курсору: строки сразу после указанной.
+        Args:
+            after_id (int, optional): ID последней строки предыдущей страницы; None — с начала.
+            limit (int): Размер страницы. По умолчанию — 200.
+            order_by (str): Столбец сортировки из `PAGE_QUERIES['orders']`. По умолчанию — 'id'.
+            descending (bool): Сортировать по убыванию.
+            after_value (optional): Значение столбца сортировки в строке `after_id`
+                (не нужно при сортировке по ID).
+            date_range (tuple, optional): Период (первая дата, последняя дата) по столбцу order_day.
+        Returns:
+            list[tuple]: Кортежи (order_id, client_name, product_name, quantity, order_date).
+        """
+        return self._select_page("orders", limit, order_by, descending, after_id, after_value,
+                                 date_range=date_range)
+
+    @read_only
+    def load_orders_slice(self, offset: int, limit: int = PAGE_SIZE, order_by: str = "id",
+                          descending: bool = False, date_range: tuple = None) -> list[tuple]:
+        """
+        Загружает страницу заказов по смещению — для перехода к произвольной позиции списка.
+        Args:
+            offset (int): Количество пропускаемых строк.
+            limit (int): Размер страницы. По умолчанию — 200.
+            order_by (str): Столбец сортировки из `PAGE_QUERIES['orders']`. По умолчанию — 'id'.
+            descending (bool): Сортировать по убыванию.
+            date_range (tuple, optional): Период (первая дата, последняя дата) по столбцу order_day.
+        Returns:
+            list[tuple]: Кортежи (order_id, client_name, product_name, quantity, order_date).
+        """
+        return self._select_page("orders", limit, order_by, descending, offset=offset, date_range=date_range)
+
+    @read_only
+    def count_orders(self, date_range: tuple = None) -> int:
+        """
+        Считает количество заказов в списке.
+        Args:
+            date_range (tuple, optional): Период (первая дата, последняя дата) по столбцу order_day.
+        Returns:
+            int: Количество строк.
+        """
+        return self._count("orders", date_range)
+
+    @read_only
+    def load_order_row(self, order_id: int) -> tuple | None:
+        """
+        Загружает одну строку списка заказов — после добавления или изменения заказа,
+        чтобы обновить в таблице только её.
+        Args:
+            order_id (int): ID заказа.
+        Returns:
+            tuple | None: Кортеж (order_id, client_name, product_name, quantity, order_date)
+                или None, если заказа нет.
+        """
+        return self._select_row("orders", order_id)
+
+    @read_only
+    def get_order(self, order_id: int) -> tuple | None:
+        """
+        Получает заказ по ID вместе с ID клиента и товара — для заполнения формы редактирования.
+        Args:
+            order_id (int): ID заказа.
+        Returns:
+            tuple | None: Кортеж (id, client_id, product_id, quantity, order_date) или None,
+                если заказ не найден.
+        """
+        with self.conn:
+            self.cursor.execute(
+                "SELECT id, client_id, product_id, quantity, order_date FROM Orders WHERE id = ?",
+                (order_id,)
+            )
+            return self.cursor.fetchone()
+
     def update_order(self, order_id: int, client_id: int = None, product_id: int = None,
                      quantity: int = None, order_date: str = None) -> None:
         """
@@ -344,67 +1466,855 @@ class Database:
             self.cursor.execute("DELETE FROM Orders WHERE id = ?", (order_id,))
             self.conn.commit()
 
+    # ----- Полнотекстовый поиск -----
+
+    def _search(self, kind: str, index: str, term: str, limit: int,
+                order_by: str = None, descending: bool = False, date_range: tuple = None) -> list[tuple]:
+        """
+        Ищет строки списка через FTS5-индекс. Без `order_by` результаты упорядочены
+        по релевантности, иначе — по столбцу списка (сортировка выполняется в базе).
+        Args:
+            kind (str): Ключ `PAGE_QUERIES` — формат возвращаемых строк.
+            index (str): Имя FTS5-таблицы.
+            term (str): Текст из строки поиска.
+            limit (int): Максимальное количество результатов.
+            order_by (str, optional): Столбец сортировки из `PAGE_QUERIES`.
+            descending (bool): Сортировать по убыванию.
+            date_range (tuple, optional): Период дат, только для заказов; отбор выполняется
+                в запросе до `LIMIT`, поэтому в результат попадают все совпадения за период.
+        Returns:
+            list[tuple]: Найденные строки в формате соответствующего метода load_*.
+        Raises:
+            ValueError: Если столбец сортировки не поддерживается.
+        """
+        query = fts_query(term)
+        if not query:
+            return []
+        select_list, source, columns = PAGE_QUERIES[kind]
+        conditions, params = [f"s.{index} MATCH ?"], [query]
+        if date_range is not None:
+            if kind != "orders":
+                raise ValueError("Период дат поддерживается только для заказов.")
+            conditions.append("o.order_day BETWEEN ? AND ?")
+            params.extend(date_range)
+        if order_by is None:
+            order = "s.rank"
+        elif order_by in columns:
+            direction = "DESC" if descending else "ASC"
+            order = f"{columns[order_by]} {direction}, {columns['id']} {direction}"
+        else:
+            raise ValueError(f"Недопустимый столбец сортировки: {order_by}")
+        with self.conn:
+            self.cursor.execute(f"""
+                SELECT {select_list} {source}
+                JOIN {index} s ON s.rowid = {columns["id"]}
+                WHERE {" AND ".join(conditions)}
+                ORDER BY {order}
+                LIMIT ?
+            """, (*params, limit))
+            return self.cursor.fetchall()
+
+    @read_only
+    def search_clients(self, term: str, limit: int = SEARCH_LIMIT, order_by: str = None,
+                       descending: bool = False) -> list[tuple]:
+        """
+        Ищет клиентов по началу слов в имени, email, телефоне и адресе.
+        Args:
+            term (str): Текст из строки поиска.
+            limit (int): Максимальное количество результатов. По умолчанию — 1000.
+            order_by (str, optional): Столбец сортировки; None — по релевантности.
+            descending (bool): Сортировать по убыванию.
+        Returns:
+            list[tuple]: Кортежи (id, c_name, email, phone, address),
+                по умолчанию самые релевантные первыми.
+        """
+        return self._search("clients", SEARCH_INDEXES["clients"], term, limit, order_by, descending)
+
+    @read_only
+    def search_products(self, term: str, limit: int = SEARCH_LIMIT, order_by: str = None,
+                        descending: bool = False) -> list[tuple]:
+        """
+        Ищет товары по началу слов в наименовании.
+        Args:
+            term (str): Текст из строки поиска.
+            limit (int): Максимальное количество результатов. По умолчанию — 1000.
+            order_by (str, optional): Столбец сортировки; None — по релевантности.
+            descending (bool): Сортировать по убыванию.
+        Returns:
+            list[tuple]: Кортежи (id, p_name, price, stock), по умолчанию самые релевантные первыми.
+        """
+        return self._search("products", SEARCH_INDEXES["products"], term, limit, order_by, descending)
+
+    @read_only
+    def search_orders(self, term: str, limit: int = SEARCH_LIMIT, order_by: str = None,
+                      descending: bool = False, date_range: tuple = None) -> list[tuple]:
+        """
+        Ищет заказы по началу слов в имени клиента, наименовании товара и дате.
+        Args:
+            term (str): Текст из строки поиска.
+            limit (int): Максимальное количество результатов. По умолчанию — 1000.
+            order_by (str, optional): Столбец сортировки; None — по релевантности.
+            descending (bool): Сортировать по убыванию.
+            date_range (tuple, optional): Период (первая дата, последняя дата) по столбцу order_day.
+        Returns:
+            list[tuple]: Кортежи (order_id, client_name, product_name, quantity, order_date),
+                по умолчанию самые релевантные первыми.
+        """
+        return self._search("orders", SEARCH_INDEXES["orders"], term, limit, order_by, descending, date_range)
+
+    # ----- Потоковое чтение -----
+
+    def _view_source(self, kind: str, term: str = None, date_range: tuple = None) -> tuple[str, list]:
+        """
+        Собирает источник строк списка с фильтрами окна: поиском и периодом дат.
+        Args:
+            kind (str): Ключ `PAGE_QUERIES`.
+            term (str, optional): Текст из строки поиска (полнотекстовый поиск по `SEARCH_INDEXES`).
+            date_range (tuple, optional): Период (первая дата, последняя дата), только для заказов.
+        Returns:
+            tuple[str, list]: Части FROM и WHERE запроса и их параметры.
+        Raises:
+            ValueError: Если период задан не для заказов.
+        """
+        _, source, columns = PAGE_QUERIES[kind]
+        conditions, params = [], []
+        if term:
+            index = SEARCH_INDEXES[kind]
+            source += f" JOIN {index} s ON s.rowid = {columns['id']}"
+            query = fts_query(term)
+            # Ввод без букв и цифр ничего не находит, как и в `_search`
+            conditions.append(f"s.{index} MATCH ?" if query else "0")
+            params.extend([query] if query else [])
+        if date_range is not None:
+            if kind != "orders":
+                raise ValueError("Период дат поддерживается только для заказов.")
+            conditions.append("o.order_day BETWEEN ? AND ?")
+            params.extend(date_range)
+        if conditions:
+            source += " WHERE " + " AND ".join(conditions)
+        return source, params
+
+    @read_only
+    def count_view(self, kind: str, term: str = None, date_range: tuple = None) -> int:
+        """
+        Считает строки списка с фильтрами окна (см. `iter_view`).
+        Args:
+            kind (str): Ключ `PAGE_QUERIES`.
+            term (str, optional): Текст из строки поиска.
+            date_range (tuple, optional): Период дат заказов.
+        Returns:
+            int: Количество строк.
+        """
+        source, params = self._view_source(kind, term, date_range)
+        with self.conn:
+            self.cursor.execute(f"SELECT COUNT(*) {source}", params)
+            return self.cursor.fetchone()[0]
+
+    @read_only
+    def iter_view(self, kind: str, term: str = None, order_by: str = None, descending: bool = False,
+                  date_range: tuple = None, batch_size: int = STREAM_BATCH_SIZE):
+        """
+        Построчно читает список так, как его показывает окно: с поиском, периодом
+        и сортировкой, но без ограничения количества результатов. Память постоянна.
+        Args:
+            kind (str): Ключ `PAGE_QUERIES`: 'clients', 'products' или 'orders'.
+            term (str, optional): Текст из строки поиска.
+            order_by (str, optional): Столбец сортировки; None — по релевантности при поиске, иначе по ID.
+            descending (bool): Сортировать по убыванию.
+            date_range (tuple, optional): Период (первая дата, последняя дата), только для заказов.
+            batch_size (int): Размер пачки `fetchmany`.
+        Yields:
+            tuple: Строки в формате соответствующего метода load_*.
+        Raises:
+            ValueError: Если столбец сортировки не поддерживается.
+        """
+        select_list, _, columns = PAGE_QUERIES[kind]
+        direction = "DESC" if descending else "ASC"
+        if order_by is None:
+            order = "s.rank" if term else f"{columns['id']} {direction}"
+        elif order_by in columns:
+            order = f"{columns[order_by]} {direction}, {columns['id']} {direction}"
+        else:
+            raise ValueError(f"Недопустимый столбец сортировки: {order_by}")
+        source, params = self._view_source(kind, term, date_range)
+        yield from self._iter_query(f"SELECT {select_list} {source} ORDER BY {order}", tuple(params), batch_size)
+
+    @read_only
+    def iter_clients(self, batch_size: int = STREAM_BATCH_SIZE):
+        """
+        Построчно читает всех клиентов в порядке ID при постоянном расходе памяти.
+        Args:
+            batch_size (int): Размер пачки `fetchmany`. По умолчанию — 1000.
+        Yields:
+            tuple: (id, c_name, email, phone, address).
+        """
+        select_list, source, columns = PAGE_QUERIES["clients"]
+        yield from self._iter_query(f"SELECT {select_list} {source} ORDER BY {columns['id']}",
+                                    batch_size=batch_size)
+
+    @read_only
+    def iter_products(self, batch_size: int = STREAM_BATCH_SIZE):
+        """
+        Построчно читает все товары в порядке ID при постоянном расходе памяти.
+        Args:
+            batch_size (int): Размер пачки `fetchmany`. По умолчанию — 1000.
+        Yields:
+            tuple: (id, p_name, price, stock).
+        """
+        select_list, source, columns = PAGE_QUERIES["products"]
+        yield from self._iter_query(f"SELECT {select_list} {source} ORDER BY {columns['id']}",
+                                    batch_size=batch_size)
+
+    @read_only
+    def iter_orders(self, batch_size: int = STREAM_BATCH_SIZE):
+        """
+        Построчно читает все заказы с именами клиентов и товаров в порядке ID.
+        Args:
+            batch_size (int): Размер пачки `fetchmany`. По умолчанию — 1000.
+        Yields:
+            tuple: (order_id, client_name, product_name, quantity, order_date).
+        """
+        select_list, source, columns = PAGE_QUERIES["orders"]
+        yield from self._iter_query(f"SELECT {select_list} {source} ORDER BY {columns['id']}",
+                                    batch_size=batch_size)
+
+    @read_only
+    def load_client_batch(self, batch_size: int = BATCH_CHUNK_SIZE) -> ClientBatch:
+        """
+        Загружает всех клиентов в порядке ID в столбцовую пачку `models.ClientBatch`.
+        Строки читаются пачками `fetchmany` и сразу раскладываются по столбцам,
+        поэтому список кортежей всей таблицы в памяти не создаётся.
+        Args:
+            batch_size (int): Размер пачки `fetchmany`. По умолчанию — 10 000.
+        Returns:
+            ClientBatch: Строки (id, c_name, email, phone, address).
+        """
+        select_list, source, columns = PAGE_QUERIES["clients"]
+        return ClientBatch.from_chunks(self._iter_chunks(
+            f"SELECT {select_list} {source} ORDER BY {columns['id']}", batch_size=batch_size))
+
+    @read_only
+    def load_product_batch(self, batch_size: int = BATCH_CHUNK_SIZE) -> ProductBatch:
+        """
+        Загружает все товары в порядке ID в столбцовую пачку `models.ProductBatch`.
+        Args:
+            batch_size (int): Размер пачки `fetchmany`. По умолчанию — 10 000.
+        Returns:
+            ProductBatch: Строки (id, p_name, price, stock).
+        """
+        select_list, source, columns = PAGE_QUERIES["products"]
+        return ProductBatch.from_chunks(self._iter_chunks(
+            f"SELECT {select_list} {source} ORDER BY {columns['id']}", batch_size=batch_size))
+
+    @read_only
+    def load_order_batch(self, date_range: tuple = None, batch_size: int = BATCH_CHUNK_SIZE) -> OrderBatch:
+        """
+        Загружает заказы в порядке ID в столбцовую пачку `models.OrderBatch`.
+        В отличие от `load_order` читаются сами ID клиента и товара (без JOIN),
+        поэтому попадают и заказы удалённых клиентов или товаров (ID — None).
+        Args:
+            date_range (tuple, optional): Период (первая дата, последняя дата) по столбцу order_day.
+            batch_size (int): Размер пачки `fetchmany`. По умолчанию — 10 000.
+        Returns:
+            OrderBatch: Строки (id, client_id, product_id, quantity, order_date).
+        """
+        sql, params = "SELECT id, client_id, product_id, quantity, order_date FROM Orders", ()
+        if date_range is not None:
+            sql, params = f"{sql} WHERE order_day BETWEEN ? AND ?", tuple(date_range)
+        return OrderBatch.from_chunks(self._iter_chunks(f"{sql} ORDER BY id", params, batch_size))
+
+    @read_only
+    def iter_client_product_edges(self, weight: str = "orders", batch_size: int = STREAM_BATCH_SIZE):
+        """
+        Построчно читает связи клиент — товар без повторов с весом для анализа графа.
+        Группировка выполняется в SQL, строки забираются через `fetchmany`.
+        Args:
+            weight (str): Вес связи: 'orders' — количество заказов, 'quantity' — количество товара.
+            batch_size (int): Размер пачки `fetchmany`. По умолчанию — 1000.
+        Yields:
+            tuple: (client_id, product_id, weight).
+        Raises:
+            ValueError: Если вес связи не поддерживается.
+        """
+        if weight not in EDGE_WEIGHTS:
+            raise ValueError(f"Недопустимый вес связи: {weight}")
+        yield from self._iter_query(f"""
+            SELECT o.client_id, o.product_id, {EDGE_WEIGHTS[weight]}
+            FROM Orders o
+            JOIN Clients c ON c.id = o.client_id
+            JOIN Products p ON p.id = o.product_id
+            GROUP BY o.client_id, o.product_id
+        """, batch_size=batch_size)
+
     # ----- Работа с отчетами и статистикой -----
 
+    @read_only
     def get_datas(self) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
         """
         Загружает данные из всех таблиц в виде pandas DataFrame.
         Используется для анализа и построения графиков.
+        Столбцы типизированы по `FRAME_COLUMNS`, таблицы читаются через `load_frame`
+        (со снимками на диске).
         Returns:
             tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]: Кортеж из трёх DataFrame:
                 - orders_df: заказы,
                 - clients_df: клиенты,
                 - products_df: товары.
         """
-        with self.conn:
-            orders_df = pd.read_sql_query("SELECT * FROM Orders", self.conn)
-            clients_df = pd.read_sql_query("SELECT * FROM Clients", self.conn)
-            products_df = pd.read_sql_query("SELECT * FROM Products", self.conn)
-            return orders_df, clients_df, products_df
+        return self.load_frame("Orders"), self.load_frame("Clients"), self.load_frame("Products")
+
+    def table_version(self, table: str) -> int:
+        """
+        Возвращает версию таблицы из TableVersions: она меняется при каждом изменении
+        строк таблицы, в том числе другими соединениями и процессами.
+        Args:
+            table (str): Имя таблицы из `FRAME_COLUMNS`.
+        Returns:
+            int: Версия таблицы.
+        """
+        return self.conn.execute("SELECT version FROM TableVersions WHERE name = ?", (table,)).fetchone()[0]
+
+    def _snapshot_path(self, table: str, columns: list, version: int):
+        """
+        Возвращает путь к снимку выгрузки: каталог `SNAPSHOT_DIR` рядом с файлом базы.
+        Args:
+            table (str): Имя таблицы.
+            columns (list): Выгружаемые столбцы.
+            version (int): Версия таблицы.
+        Returns:
+            Path | None: Путь к файлу снимка или None для базы в памяти.
+        """
+        path = self.conn.execute("PRAGMA database_list").fetchone()[2]
+        if not path:
+            return None
+        path = Path(path)
+        return path.parent / SNAPSHOT_DIR / f"{path.stem}.{table}.{'+'.join(columns)}.{version}.npz"
+
+    @read_only
+    def load_frame(self, table: str, columns: list = None, chunksize: int = FRAME_CHUNK_SIZE) -> pd.DataFrame:
+        """
+        Загружает таблицу в DataFrame с компактными типами столбцов из `FRAME_COLUMNS`.
+        Читаются только запрошенные столбцы, пачками по `chunksize` строк: каждая пачка
+        сразу приводится к своим типам, поэтому в памяти не оказывается вся таблица
+        в виде объектов Python. Результат сохраняется на диск массивами NumPy по столбцам
+        (`_save_snapshot`) и используется повторно, пока не изменится версия таблицы.
+        Args:
+            table (str): 'Clients', 'Products' или 'Orders'.
+            columns (list, optional): Столбцы выгрузки; по умолчанию — все из `FRAME_COLUMNS`.
+            chunksize (int): Количество строк в одной пачке чтения.
+        Returns:
+            pd.DataFrame: Строки таблицы по возрастанию ID.
+        Raises:
+            ValueError: Если таблица или столбец не поддерживаются.
+        """
+        if table not in FRAME_COLUMNS:
+            raise ValueError(f"Недопустимая таблица: {table}")
+        spec = FRAME_COLUMNS[table]
+        columns = list(spec) if columns is None else list(columns)
+        for column in columns:
+            if column not in spec:
+                raise ValueError(f"Недопустимый столбец {table}: {column}")
+
+        # Версия и строки читаются в одной транзакции, чтобы снимок им соответствовал
+        started = not self.conn.in_transaction
+        if started:
+            self.conn.execute("BEGIN")
+        try:
+            path = self._snapshot_path(table, columns, self.table_version(table))
+            if path is not None and path.exists():
+                try:
+                    return self._read_snapshot(path, columns, spec)
+                except Exception as e:
+                    logger.warning("Не удалось прочитать снимок %s: %s", path, e)
+            select = ", ".join(f"{spec[column][0]} AS {column}" for column in columns)
+            chunks = [self._typed_chunk(chunk, spec) for chunk in
+                      pd.read_sql_query(f"SELECT {select} FROM {table} ORDER BY id", self.conn, chunksize=chunksize)]
+        finally:
+            if started:
+                self.conn.commit()
+
+        frame = pd.DataFrame({column: self._concat_column([chunk[column] for chunk in chunks], spec[column][1])
+                              for column in columns})
+        if path is not None:
+            self._save_snapshot(frame, path, spec)
+        return frame
+
+    @staticmethod
+    def _typed_chunk(chunk: pd.DataFrame, spec: dict) -> pd.DataFrame:
+        """
+        Приводит пачку строк к типам из `FRAME_COLUMNS`.
+        Args:
+            chunk (pd.DataFrame): Пачка из `pd.read_sql_query`.
+            spec (dict): Описание столбцов таблицы.
+        Returns:
+            pd.DataFrame: Пачка с типизированными столбцами.
+        """
+        for column in chunk.columns:
+            dtype = spec[column][1]
+            if dtype.startswith("datetime64"):
+                chunk[column] = pd.to_datetime(chunk[column], format="%Y-%m-%d", errors="coerce").astype(dtype)
+            elif dtype != "object":
+                chunk[column] = chunk[column].astype(dtype)
+        return chunk
+
+    @staticmethod
+    def _concat_column(parts: list, dtype: str) -> pd.Series:
+        """
+        Склеивает столбец из пачек. Категории разных пачек объединяются без
+        промежуточного преобразования в строки.
+        Args:
+            parts (list[pd.Series]): Столбец по пачкам.
+            dtype (str): Тип столбца.
+        Returns:
+            pd.Series: Столбец целиком.
+        """
+        if not parts:
+            return pd.Series(dtype=dtype)
+        if dtype == "category":
+            return pd.Series(union_categoricals(parts))
+        return pd.concat(parts, ignore_index=True)
+
+    @staticmethod
+    def _save_snapshot(frame: pd.DataFrame, path: Path, spec: dict) -> None:
+        """
+        Сохраняет снимок атомарно и удаляет снимки прежних версий той же выгрузки.
+        Снимок — архив `.npz` с массивами NumPy без объектов Python, поэтому он читается
+        с `allow_pickle=False` и не может выполнить код при загрузке:
+        категории — коды и массив категорий, строки — буфер UTF-8 со смещениями
+        (как `models.TextColumn`), столбцы с NULL — значения и маска.
+        Ошибки записи только пишутся в журнал: снимок — лишь ускорение.
+        Args:
+            frame (pd.DataFrame): Выгрузка.
+            path (Path): Путь к снимку.
+            spec (dict): Описание столбцов таблицы из `FRAME_COLUMNS`.
+        """
+        arrays = {}
+        for column in frame.columns:
+            series, dtype = frame[column], spec[column][1]
+            if dtype == "category":
+                arrays[column] = series.cat.codes.to_numpy()
+                arrays[f"{column}.categories"] = np.array(series.cat.categories, dtype=str)
+            elif dtype == "object":
+                text = TextColumn.from_values([None if null else value
+                                               for value, null in zip(series.tolist(), series.isna().tolist())])
+                arrays[column] = np.frombuffer(text.data, dtype=np.uint8)
+                arrays[f"{column}.offsets"] = text.offsets
+                arrays[f"{column}.mask"] = np.zeros(len(text), dtype=bool) if text.nulls is None else text.nulls
+            elif dtype[0].isupper():
+                # Nullable-тип pandas (Int32): значения и маска NULL
+                arrays[column] = series.to_numpy(dtype=dtype.lower(), na_value=0)
+                arrays[f"{column}.mask"] = series.isna().to_numpy()
+            else:
+                arrays[column] = series.to_numpy()
+        try:
+            path.parent.mkdir(exist_ok=True)
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp, "wb") as f:
+                np.savez(f, **arrays)
+            os.replace(tmp, path)
+            prefix = path.name.rsplit(".", 2)[0]
+            # Снимки прежних версий, в том числе старого формата .pkl
+            for pattern in (f"{prefix}.*.npz", f"{prefix}.*.pkl"):
+                for old in path.parent.glob(pattern):
+                    if old != path:
+                        old.unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning("Не удалось сохранить снимок %s: %s", path, e)
+
+    @staticmethod
+    def _read_snapshot(path: Path, columns: list, spec: dict) -> pd.DataFrame:
+        """
+        Читает снимок, записанный `_save_snapshot`, без распаковки объектов Python.
+        Args:
+            path (Path): Путь к снимку.
+            columns (list): Столбцы выгрузки.
+            spec (dict): Описание столбцов таблицы из `FRAME_COLUMNS`.
+        Returns:
+            pd.DataFrame: Выгрузка с теми же типами столбцов.
+        """
+        result = {}
+        with np.load(path, allow_pickle=False) as data:
+            for column in columns:
+                values, dtype = data[column], spec[column][1]
+                if dtype == "category":
+                    result[column] = pd.Series(pd.Categorical.from_codes(
+                        values, data[f"{column}.categories"].tolist()))
+                elif dtype == "object":
+                    mask = data[f"{column}.mask"]
+                    text = TextColumn(values.tobytes(), data[f"{column}.offsets"], mask if mask.any() else None)
+                    # Тип строкового столбца pandas выводит так же, как при чтении из базы
+                    result[column] = pd.Series(text.values())
+                elif dtype[0].isupper():
+                    result[column] = pd.Series(pd.arrays.IntegerArray(values, data[f"{column}.mask"]))
+                else:
+                    result[column] = pd.Series(values)
+        return pd.DataFrame(result)
 
+    @read_only
+    @cached_query
     def top_5_client(self) -> list[tuple]:
         """
         Получает топ-5 клиентов по количеству заказов.
+        Читает сводную таблицу ClientOrderCounts по индексу, не группируя заказы;
+        если клиентов с заказами меньше пяти, список дополняется клиентами без заказов.
         Returns:
             list[tuple]: Список кортежей: (client_id, client_name, order_count).
         """
         with self.conn:
             self.cursor.execute("""
-                SELECT c.id, c.c_name, COUNT(o.id) as order_count
-                FROM Clients c
-                LEFT JOIN Orders o ON c.id = o.client_id
-                GROUP BY c.id, c.c_name
-                ORDER BY order_count DESC
+                SELECT c.id, c.c_name, s.order_count
+                FROM ClientOrderCounts s
+                CROSS JOIN Clients c ON c.id = s.client_id  -- CROSS JOIN: обход по индексу счётчиков
+                ORDER BY s.order_count DESC
                 LIMIT 5
             """)
-            return self.cursor.fetchall()
+            top = self.cursor.fetchall()
+            if len(top) < 5:
+                self.cursor.execute("""
+                    SELECT id, c_name, 0 FROM Clients
+                    WHERE id NOT IN (SELECT client_id FROM ClientOrderCounts)
+                    LIMIT ?
+                """, (5 - len(top),))
+                top += self.cursor.fetchall()
+            return top
 
-    def show_order_trend(self) -> list[tuple]:
+    @read_only
+    @cached_query
+    def order_trend(self, granularity: str = "day", start: str = None, end: str = None) -> list[tuple]:
         """
-        Получает количество заказов по датам для анализа динамики.
+        Получает количество заказов по периодам: суммирует сводную таблицу DailyOrderCounts
+        по дням, неделям, месяцам или кварталам, не читая сами заказы.
+        Диапазон дат выбирается по первичному ключу таблицы.
+        Args:
+            granularity (str): Шаг: 'day', 'week', 'month' или 'quarter' (см. TREND_GRANULARITIES).
+            start (str, optional): Первая дата диапазона в формате ГГГГ-ММ-ДД включительно.
+            end (str, optional): Последняя дата диапазона включительно.
         Returns:
-            list[tuple]: Список кортежей: (order_date, count).
+            list[tuple]: Кортежи (начало периода, количество заказов) по возрастанию даты.
+                Недели начинаются с понедельника; даты не в формате ГГГГ-ММ-ДД пропускаются.
+        Raises:
+            ValueError: Если шаг не поддерживается.
         """
+        if granularity not in TREND_GRANULARITIES:
+            raise ValueError(f"Недопустимый шаг динамики: {granularity}")
+        conditions, params = [], []
+        if start is not None:
+            conditions.append("order_date >= ?")
+            params.append(start)
+        if end is not None:
+            conditions.append("order_date <= ?")
+            params.append(end)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
         with self.conn:
-            self.cursor.execute("""
-                SELECT order_date, COUNT(*) 
-                FROM Orders
-                GROUP BY order_date
-                ORDER BY order_date
-            """)
+            self.cursor.execute(f"""
+                SELECT period, SUM(order_count)
+                FROM (SELECT {TREND_GRANULARITIES[granularity]} AS period, order_count
+                      FROM DailyOrderCounts {where})
+                WHERE period IS NOT NULL
+                GROUP BY period
+                ORDER BY period
+            """, params)
             return self.cursor.fetchall()
 
-    def show_client_product_graph(self) -> list[tuple]:
+    def rebuild_order_stats(self) -> None:
+        """
+        Пересчитывает сводные таблицы ClientOrderCounts и DailyOrderCounts по всем заказам
+        одной транзакцией. Нужен, если заказы менялись в обход триггеров (например,
+        старой версией приложения или внешней утилитой); из командной строки:
+        ``python db.py rebuild-stats [путь_к_базе]``.
+        """
+        with self.conn:
+            for statement in ORDER_STATS_REBUILD:
+                self.conn.execute(statement)
+
+    @read_only
+    @cached_query
+    def client_product_subgraph(self, top_n: int = None, weight: str = "orders") -> tuple[list, list]:
         """
-        Получает связи клиентов и купленных товаров для построения графа.
+        Получает подграф связей клиентов и товаров для отрисовки, целиком посчитанный в SQL:
+        связи без повторов с весом, степени узлов (число разных товаров у клиента или
+        клиентов у товара) и отбор `top_n` узлов с наибольшей степенью.
+        Размер результата ограничен `top_n` и не зависит от количества заказов.
+        Args:
+            top_n (int, optional): Количество узлов с наибольшей степенью; None — все узлы.
+            weight (str): Вес связи: 'orders' — количество заказов, 'quantity' — количество товара.
         Returns:
-            list[tuple]: Список кортежей: (client_name, product_name).
+            tuple[list, list]: Узлы (kind, id, name, degree), где kind — 'client' или 'product',
+                по убыванию степени, и связи между ними (client_id, product_id, weight).
+        Raises:
+            ValueError: Если вес связи не поддерживается.
         """
+        if weight not in EDGE_WEIGHTS:
+            raise ValueError(f"Недопустимый вес связи: {weight}")
         with self.conn:
             self.cursor.execute("""
-                SELECT c.c_name, p.p_name 
+                WITH edges AS (
+                    SELECT DISTINCT o.client_id, o.product_id
+                    FROM Orders o
+                    JOIN Clients c ON c.id = o.client_id
+                    JOIN Products p ON p.id = o.product_id
+                ),
+                degrees AS (
+                    SELECT 'client' AS kind, client_id AS id, COUNT(*) AS degree FROM edges GROUP BY client_id
+                    UNION ALL
+                    SELECT 'product', product_id, COUNT(*) FROM edges GROUP BY product_id
+                ),
+                top AS (
+                    SELECT kind, id, degree FROM degrees ORDER BY degree DESC, kind, id LIMIT ?
+                )
+                SELECT t.kind, t.id, COALESCE(c.c_name, p.p_name), t.degree
+                FROM top t
+                LEFT JOIN Clients c ON t.kind = 'client' AND c.id = t.id
+                LEFT JOIN Products p ON t.kind = 'product' AND p.id = t.id
+                ORDER BY t.degree DESC, t.kind, t.id
+            """, (-1 if top_n is None else top_n,))
+            nodes = self.cursor.fetchall()
+            client_ids = json.dumps([row[1] for row in nodes if row[0] == "client"])
+            product_ids = json.dumps([row[1] for row in nodes if row[0] == "product"])
+            self.cursor.execute(f"""
+                SELECT o.client_id, o.product_id, {EDGE_WEIGHTS[weight]}
                 FROM Orders o
-                JOIN Clients c ON o.client_id = c.id
-                JOIN Products p ON o.product_id = p.id
-            """)
-            return self.cursor.fetchall()
\ No newline at end of file
+                WHERE o.client_id IN (SELECT value FROM json_each(?))
+                  AND o.product_id IN (SELECT value FROM json_each(?))
+                GROUP BY o.client_id, o.product_id
+            """, (client_ids, product_ids))
+            return nodes, self.cursor.fetchall()
+
+
+class ConnectionPool:
+    """
+    Общий пул соединений с базой данных для всех окон приложения.
+    Держит одно соединение-писатель и несколько соединений-читателей (WAL позволяет
+    им работать параллельно с записью). Схема создаётся и мигрирует один раз —
+    при открытии писателя. Окна получают лёгкие дескрипторы через `handle()`,
+    которые не открывают новых файлов.
+    """
+
+    def __init__(self, db_name=DB_NAME, readers: int = 2, profile: str = DEFAULT_PROFILE):
+        """
+        Открывает соединение-писатель и заданное число соединений-читателей.
+        Для базы в памяти читатели не создаются: все запросы идут через писателя.
+        Args:
+            db_name (str): Путь к файлу базы данных. По умолчанию — 'store.db'.
+            readers (int): Количество соединений-читателей. По умолчанию — 2.
+            profile (str): Профиль производительности для всех соединений.
+        """
+        self.db_name = db_name
+        self.writer = Database(db_name, profile)
+        self._write_lock = threading.RLock()
+        self._readers = queue.Queue()
+        self._all_readers = []
+        if db_name != ":memory:":
+            for _ in range(readers):
+                reader = Database(db_name, profile, readonly=True)
+                self._all_readers.append(reader)
+                self._readers.put(reader)
+        self.closed = False
+
+    @contextmanager
+    def connection(self, readonly: bool = False):
+        """
+        Выдаёт соединение на время блока: свободного читателя для чтения или
+        писателя под блокировкой для записи. Безопасно для вызова из разных потоков.
+        Args:
+            readonly (bool): Нужен ли только доступ на чтение.
+        Yields:
+            Database: Объект базы данных, закреплённый за текущим потоком на время блока.
+        Raises:
+            RuntimeError: Если пул уже закрыт.
+        """
+        if self.closed:
+            raise RuntimeError("Пул соединений закрыт.")
+        if readonly and self._all_readers:
+            reader = self._readers.get()
+            try:
+                yield reader
+            finally:
+                self._readers.put(reader)
+        else:
+            with self._write_lock:
+                yield self.writer
+
+    def cache_stats(self) -> dict:
+        """
+        Суммирует счётчики кэшей запросов всех соединений пула.
+        Returns:
+            dict: Попадания, промахи и количество запомненных результатов.
+        """
+        totals = {"hits": 0, "misses": 0, "size": 0}
+        for db in [self.writer, *self._all_readers]:
+            stats = db.query_cache.stats()
+            for name in totals:
+                totals[name] += stats[name]
+        return totals
+
+    def handle(self) -> "DatabaseHandle":
+        """
+        Создаёт дескриптор базы данных для окна приложения.
+        Returns:
+            DatabaseHandle: Объект с интерфейсом `Database`, работающий через пул.
+        """
+        return DatabaseHandle(self)
+
+    def close(self) -> None:
+        """
+        Закрывает все соединения пула. Повторный вызов ничего не делает.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        with self._write_lock:
+            self.writer.conn.close()
+        for reader in self._all_readers:
+            reader.conn.close()
+
+
+class DatabaseHandle:
+    """
+    Дескриптор доступа к `ConnectionPool` с тем же интерфейсом, что у `Database`.
+    Методы, помеченные `read_only`, выполняются на свободном соединении-читателе,
+    остальные — на соединении-писателе. Потоковые методы (`iter_*`) удерживают
+    соединение, пока итератор не будет исчерпан или закрыт.
+    """
+
+    def __init__(self, pool: ConnectionPool):
+        """
+        Args:
+            pool (ConnectionPool): Пул, через который выполняются запросы.
+        """
+        self.pool = pool
+
+    def __getattr__(self, name):
+        """
+        Возвращает обёртку над одноимённым методом `Database`, которая берёт
+        подходящее соединение из пула на время вызова.
+        Args:
+            name (str): Имя атрибута.
+        Returns:
+            callable | object: Обёртка метода или атрибут соединения-писателя.
+        """
+        attr = getattr(Database, name, None)
+        if not callable(attr):
+            return getattr(self.pool.writer, name)
+        readonly = getattr(attr, "read_only", False)
+
+        if inspect.isgeneratorfunction(attr):
+            def call(*args, **kwargs):
+                with self.pool.connection(readonly) as db:
+                    yield from getattr(db, name)(*args, **kwargs)
+        else:
+            def call(*args, **kwargs):
+                with self.pool.connection(readonly) as db:
+                    return getattr(db, name)(*args, **kwargs)
+
+        call.__name__ = name
+        call.__doc__ = attr.__doc__
+        return call
+
+
+class AsyncDatabase:
+    """
+    Асинхронный фасад над `ConnectionPool` для интерфейса: методы `Database`
+    выполняются в фоновых потоках и сразу возвращают `concurrent.futures.Future`,
+    поэтому цикл событий Tk не ждёт SQL.
+    Все изменения идут через единственный поток-писатель и применяются строго
+    в порядке вызова; чтение (методы `read_only`) выполняется параллельно
+    в пуле потоков по числу соединений-читателей.
+    """
+
+    def __init__(self, pool: ConnectionPool):
+        """
+        Args:
+            pool (ConnectionPool): Пул соединений, через который выполняются запросы.
+        """
+        self.pool = pool
+        self.sync = pool.handle()  # Синхронный доступ — для уже фоновых задач и прокрутки
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer")
+        self._readers = ThreadPoolExecutor(max_workers=max(1, len(pool._all_readers)),
+                                           thread_name_prefix="db-reader")
+        self._streams = ThreadPoolExecutor(max_workers=2, thread_name_prefix="db-stream")
+
+    def submit(self, func, *args, readonly: bool = False, **kwargs) -> Future:
+        """
+        Выполняет функцию с соединением из пула в фоновом потоке.
+        Args:
+            func (callable): Функция `func(db, *args, **kwargs)`, где db — объект `Database`.
+            *args: Позиционные аргументы функции.
+            readonly (bool): Выполнить на потоке-читателе; иначе — в очереди писателя.
+            **kwargs: Именованные аргументы функции.
+        Returns:
+            Future: Результат функции.
+        """
+        def run():
+            with self.pool.connection(readonly) as db:
+                return func(db, *args, **kwargs)
+
+        return (self._readers if readonly else self._writer).submit(run)
+
+    def stream(self, func, *args, **kwargs) -> Future:
+        """
+        Выполняет долгое чтение (выгрузку) на отдельном соединении только для чтения,
+        которое открывается и закрывается внутри задачи: читатели пула при этом
+        остаются свободными для прокрутки и поиска. Для базы в памяти отдельное
+        соединение не увидит данных, поэтому функция выполняется через пул.
+        Args:
+            func (callable): Функция `func(db, *args, **kwargs)`, где db — объект `Database`.
+            *args: Позиционные аргументы функции.
+            **kwargs: Именованные аргументы функции.
+        Returns:
+            Future: Результат функции.
+        """
+        if self.pool.db_name == ":memory:":
+            return self.submit(func, *args, readonly=True, **kwargs)
+
+        def run():
+            db = Database(self.pool.db_name, self.pool.writer.profile, readonly=True)
+            try:
+                return func(db, *args, **kwargs)
+            finally:
+                db.conn.close()
+
+        return self._streams.submit(run)
+
+    def __getattr__(self, name):
+        """
+        Возвращает асинхронную обёртку над одноимённым методом `Database`.
+        Args:
+            name (str): Имя метода.
+        Returns:
+            callable: Функция с аргументами метода, возвращающая `Future`.
+        Raises:
+            AttributeError: Если такого метода нет или он потоковый (`iter_*`) —
+                потоковые методы доступны через `sync`.
+        """
+        attr = getattr(Database, name, None)
+        if name.startswith("_") or not callable(attr) or inspect.isgeneratorfunction(attr):
+            raise AttributeError(name)
+        readonly = getattr(attr, "read_only", False)
+
+        def call(*args, **kwargs):
+            return self.submit(lambda db: getattr(db, name)(*args, **kwargs), readonly=readonly)
+
+        call.__name__ = name
+        call.__doc__ = attr.__doc__
+        return call
+
+    def close(self) -> None:
+        """
+        Дожидается уже поставленных в очередь изменений и останавливает фоновые потоки.
+        Ещё не начатые запросы на чтение отменяются.
+        """
+        self._readers.shutdown(wait=True, cancel_futures=True)
+        self._streams.shutdown(wait=True, cancel_futures=True)
+        self._writer.shutdown(wait=True)
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2 or sys.argv[1] != "rebuild-stats":
+        sys.exit("Использование: python db.py rebuild-stats [путь_к_базе]")
+    database = Database(sys.argv[2] if len(sys.argv) > 2 else DB_NAME)
+    database.rebuild_order_stats()
+    print(f"Статистика заказов пересчитана: {database.conn.execute('SELECT COUNT(*) FROM DailyOrderCounts').fetchone()[0]} дат")
+    database.conn.close()
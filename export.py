@@ -0,0 +1,97 @@
+import csv
+import gzip
+import os
+from itertools import islice
+from typing import Iterable
+
+# Сколько строк записывается между проверками отмены и сообщениями о ходе выгрузки.
+EXPORT_CHUNK_SIZE = 10_000
+
+
+class ExportCancelled(Exception):
+    """
+    Выгрузка отменена пользователем; недописанный файл удалён.
+    """
+
+
+def write_csv(rows: Iterable, path: str, header: list, progress=None, cancel=None,
+              chunk_size: int = EXPORT_CHUNK_SIZE, compress: bool = None) -> int:
+    """
+    Записывает строки в CSV-файл пачками, не собирая их в памяти.
+    Файл сначала пишется рядом под именем `<path>.part` и переименовывается
+    только после успешной записи, поэтому отмена или ошибка не оставляют
+    на месте `path` обрезанный файл.
+    Args:
+        rows (Iterable): Строки (допускается генератор, например `Database.iter_view`).
+        path (str): Путь к файлу.
+        header (list): Заголовки столбцов.
+        progress (callable, optional): Функция written -> None, вызывается после каждой пачки.
+        cancel (threading.Event, optional): Событие отмены, проверяется между пачками.
+        chunk_size (int): Количество строк в пачке.
+        compress (bool, optional): Сжимать gzip; по умолчанию — если путь оканчивается на '.gz'.
+    Returns:
+        int: Количество записанных строк (без заголовка).
+    Raises:
+        ExportCancelled: Если выгрузка отменена.
+    """
+    if compress is None:
+        compress = path.endswith(".gz")
+    part = f"{path}.part"
+    written = 0
+    try:
+        if compress:
+            f = gzip.open(part, "wt", encoding="utf-8", newline="", compresslevel=6)
+        else:
+            f = open(part, "w", encoding="utf-8", newline="")
+        with f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            iterator = iter(rows)
+            while True:
+                if cancel is not None and cancel.is_set():
+                    raise ExportCancelled()
+                chunk = list(islice(iterator, chunk_size))
+                if not chunk:
+                    break
+                writer.writerows(chunk)
+                written += len(chunk)
+                if progress is not None:
+                    progress(written)
+        os.replace(part, path)
+    except BaseException:
+        if os.path.exists(part):
+            os.remove(part)
+        raise
+    return written
+
+
+def export_view(db, kind: str, header: list, path: str, term: str = None, order_by: str = None,
+                descending: bool = False, date_range: tuple = None, progress=None, cancel=None) -> int:
+    """
+    Выгружает в CSV список так, как его показывает окно (`Database.iter_view`):
+    с поиском, периодом и сортировкой. Предназначена для `AsyncDatabase.submit`.
+    Args:
+        db (Database): Соединение из пула.
+        kind (str): Ключ `PAGE_QUERIES`.
+        header (list): Заголовки столбцов.
+        path (str): Путь к файлу; '.gz' в конце включает сжатие.
+        term (str, optional): Текст из строки поиска.
+        order_by (str, optional): Столбец сортировки.
+        descending (bool): Сортировать по убыванию.
+        date_range (tuple, optional): Период дат заказов.
+        progress (callable, optional): Функция (written, total) -> None.
+        cancel (threading.Event, optional): Событие отмены.
+    Returns:
+        int: Количество записанных строк.
+    Raises:
+        ExportCancelled: Если выгрузка отменена.
+    """
+    total = db.count_view(kind, term, date_range)
+    if progress is not None:
+        progress(0, total)
+    rows = db.iter_view(kind, term, order_by, descending, date_range)
+    try:
+        return write_csv(rows, path, header,
+                         None if progress is None else lambda written: progress(written, total), cancel)
+    finally:
+        rows.close()
@@ -4,15 +4,19 @@ from tkinter import messagebox, filedialog
 from tkinter import ttk
 from tkinter import Frame, Label, Entry, Button, StringVar, LabelFrame, Scrollbar
 from tkcalendar import DateEntry
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import networkx as nx
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 from adjustText import adjust_text
-import csv
 import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
 from models import *
 from db import *
+from export import *
+from importer import *
+from widgets import *
+from layout import *
 
 class MainApp:
     """
@@ -26,11 +30,18 @@ class MainApp:
         """
         Инициализирует главное окно приложения.
         Настраивает заголовок, размеры и элементы интерфейса: заголовок и кнопки
-        для перехода к различным модулям приложения.
+        для перехода к различным модулям приложения. Открывает общий пул соединений
+        с базой данных и фоновые потоки запросов, которыми пользуются все окна.
         Args:
             root (tk.Tk): Основное окно Tkinter, в котором будет размещён интерфейс.
         """
         self.root = root
+        self.pool = ConnectionPool()
+        # Запросы окон выполняются в фоновых потоках, запись — одной очередью
+        self.tasks = AsyncDatabase(self.pool)
+        # Имена клиентов и товаров для выпадающих списков — общие для всех окон
+        self.client_names = NameCache(self.tasks.get_clients)
+        self.product_names = NameCache(self.tasks.get_products)
         self.root.title("Управление интернет-магазином")
         self.root.geometry("600x400")
         self.root.resizable(False, False)
@@ -64,7 +75,7 @@ class MainApp:
         Создаёт новое окно (Toplevel), в котором можно добавлять, удалять,
         редактировать и искать клиентов.
         """
-        ClientsWindow(Toplevel(self.root))
+        ClientsWindow(Toplevel(self.root), self.tasks, self.client_names)
 
     def open_products_window(self):
         """
@@ -72,7 +83,7 @@ class MainApp:
         Создаёт новое окно (Toplevel), в котором можно добавлять, удалять,
         редактировать и искать товары.
         """
-        ProductsWindow(Toplevel(self.root))
+        ProductsWindow(Toplevel(self.root), self.tasks, self.product_names)
 
     def open_orders_window(self):
         """
@@ -80,7 +91,7 @@ class MainApp:
         Создаёт новое окно (Toplevel), в котором можно добавлять, удалять,
         редактировать и искать заказы.
         """
-        OrdersWindow(Toplevel(self.root))
+        OrdersWindow(Toplevel(self.root), self.tasks, self.client_names, self.product_names)
 
     def open_stats_window(self):
         """
@@ -88,15 +99,18 @@ class MainApp:
         Создаёт новое окно (Toplevel), в котором отображается различная
         аналитическая информация по интернет-магазину.
         """
-        StatsWindow(Toplevel(self.root))
+        StatsWindow(Toplevel(self.root), self.tasks)
 
     def exit_app(self):
         """
         Завершает работу приложения с подтверждением.
         Показывает диалоговое окно с вопросом о подтверждении выхода.
-        Если пользователь подтверждает — приложение закрывается.
+        Если пользователь подтверждает — дожидается начатых изменений, закрывает
+        соединения с базой данных и завершает приложение.
         """
         if messagebox.askyesno("Выход", "Вы уверены, что хотите выйти?"):
+            self.tasks.close()
+            self.pool.close()
             self.root.quit()
 
 
@@ -107,19 +121,25 @@ class ClientsWindow:
     Поддерживает сортировку по столбцам, экспорт в CSV и live-поиск по введённому тексту.
     """
 
-    def __init__(self, window):
+    def __init__(self, window, db=None, names=None):
         """
         Инициализирует окно управления клиентами.
         Создаёт графический интерфейс с формой для ввода данных, таблицей клиентов,
         строкой поиска и кнопками действий. Загружает список клиентов из базы данных.
         Args:
             window (tk.Toplevel): Окно верхнего уровня, в котором будет отображаться интерфейс.
+            db (AsyncDatabase, optional): Асинхронный доступ к базе данных из общего пула.
+                Если не передан, окно открывает собственный пул соединений.
+            names (NameCache, optional): Общий кэш имён клиентов для выпадающих списков
+                других окон; окно сообщает ему о своих изменениях.
         """
         self.window = window
         self.window.title("Клиенты")
         self.window.geometry("1000x600")
         self.window.attributes("-topmost", True)
-        self.db = Database()
+        self.tasks = db if db is not None else AsyncDatabase(ConnectionPool())
+        self.db = self.tasks.sync
+        self.names = names if names is not None else NameCache(self.tasks.get_clients)
 
         frame = Frame(self.window, padx=10, pady=10)
         frame.pack(fill="both", expand=True)
@@ -129,8 +149,14 @@ class ClientsWindow:
         search_frame.grid(row=0, column=0, columnspan=2, sticky="ew", pady=5)
         Label(search_frame, text="Поиск:").pack(side="left", padx=5)
         self.search_var = StringVar()
-        self.search_var.trace("w", self.filter_clients)  # Live search
+        self.search_status = StringVar()
+        # Live search: поиск с задержкой в фоновом потоке
+        self.search = DebouncedSearch(self.window, self.find_clients, self.show_found_clients,
+                                      self.search_status)
+        self.search_var.trace("w", lambda *args: self.search.submit(self.search_var.get().strip()))
         Entry(search_frame, textvariable=self.search_var, width=40).pack(side="left", padx=5)
+        Label(search_frame, textvariable=self.search_status, fg="gray").pack(side="left", padx=5)
+        self.window.bind("<Destroy>", self.on_destroy)
 
         # --- Форма добавления/редактирования ---
         form_frame = LabelFrame(frame, text="Добавить/Редактировать клиента", padx=10, pady=10)
@@ -182,6 +208,9 @@ class ClientsWindow:
         }
         self.sort_columns = columns
         self.sort_reverse = {col: False for col in columns}
+        # Столбцы таблицы -> столбцы сортировки в базе (режим виртуальной прокрутки)
+        self.order_columns = {"ID": "id", "Имя": "c_name", "Email": "email", "Телефон": "phone", "Адрес": "address"}
+        self.sort_order = (None, False)  # (столбец в базе, по убыванию); None — без сортировки
 
         for col, text in columns.items():
             self.tree.heading(col, text=text, command=lambda c=col: self.sort_by(c))
@@ -191,6 +220,8 @@ class ClientsWindow:
         self.tree.configure(yscrollcommand=scrollbar.set)
         scrollbar.pack(side="right", fill="y")
         self.tree.pack(side="left", fill="both", expand=True)
+        self.table = VirtualTreeview(self.tree, scrollbar, self.db, "clients")
+        self.rows = KeyedTreeview(self.tree)
 
         self.tree.bind("<Double-1>", self.on_double_click)
 
@@ -201,6 +232,7 @@ class ClientsWindow:
         Button(action_btn_frame, text="Обновить", command=self.load_clients).pack(side="left", padx=5)
         Button(action_btn_frame, text="Удалить выбранного", command=self.delete_client).pack(side="left", padx=5)
         Button(action_btn_frame, text="Экспорт в CSV", command=self.export_to_csv).pack(side="left", padx=5)
+        Button(action_btn_frame, text="Импорт", command=self.import_from_file).pack(side="left", padx=5)
         Button(action_btn_frame, text="Выйти", command=self.window.destroy).pack(side="left", padx=5)
 
         self.current_client_id = None  # Для редактирования
@@ -211,60 +243,143 @@ class ClientsWindow:
         """
         Загружает всех клиентов из базы данных.
         Получает данные из `Database.load_client()` и сохраняет в `self.all_clients`.
+        Если клиентов больше `VIRTUAL_THRESHOLD`, включает виртуальную прокрутку:
+        строки читаются из базы страницами по мере прокрутки таблицы.
         В случае ошибки выводит сообщение об ошибке.
+        Запросы выполняются в фоновом потоке (`AsyncDatabase`), результат
+        показывается в потоке Tk; окно в это время не блокируется.
         """
-        try:
-            self.all_clients = self.db.load_client()
-            self.display_clients(self.all_clients)
-        except Exception as e:
-            messagebox.showerror("Ошибка", f"Не удалось загрузить клиентов: {e}")
+        deliver(self.window, self.tasks.count_clients(), self.on_clients_counted,
+                lambda e: self.show_error(f"Не удалось загрузить клиентов: {e}"))
+
+    def on_clients_counted(self, count):
+        """
+        Продолжает загрузку после подсчёта строк (в потоке Tk): включает виртуальную
+        прокрутку для большого списка или запрашивает весь список.
+        Args:
+            count (int): Количество строк в базе.
+        """
+        if count > VIRTUAL_THRESHOLD:
+            # Большой список: строки читаются из базы по мере прокрутки
+            self.all_clients = []
+            self.rows.clear()
+            self.table.attach(self.sort_order[0] or "id", self.sort_order[1])
+            self.filter_clients()
+        else:
+            deliver(self.window, self.tasks.load_client(*self.sort_order), self.on_clients_loaded,
+                    lambda e: self.show_error(f"Не удалось загрузить клиентов: {e}"))
+
+    def on_clients_loaded(self, clients):
+        """
+        Показывает загруженный список (в потоке Tk) с учётом строки поиска.
+        Args:
+            clients (list): Строки списка.
+        """
+        self.table.detach()
+        self.all_clients = clients
+        self.filter_clients()
 
     def display_clients(self, clients):
         """
         Отображает список клиентов в виджете Treeview.
-        Перед отображением очищает текущую таблицу.
+        Таблица не очищается: изменяются только отличающиеся от показанных строки.
         Args:
             clients (list): Список кортежей с данными клиентов (ID, Имя, Email, Телефон, Адрес).
         """
-        for row in self.tree.get_children():
-            self.tree.delete(row)
-        for client in clients:
-            self.tree.insert("", "end", values=client)
+        self.rows.show(clients)
+
+    def apply_client_change(self, client_id):
+        """
+        Показывает в таблице изменение одного клиента без перерисовки всего списка.
+        Строка перечитывается из базы (`Database.load_client_row`) и заменяет только
+        свой элемент таблицы; при активном поиске результаты запрашиваются заново
+        и сравниваются с показанными, в режиме виртуальной прокрутки перерисовываются
+        только видимые строки.
+        Args:
+            client_id (int): ID добавленного, изменённого или удалённого клиента.
+        """
+        deliver(self.window, self.tasks.load_client_row(client_id),
+                lambda row: self.show_client_change(client_id, row),
+                lambda e: self.show_error(f"Не удалось обновить таблицу: {e}"))
+
+    def show_client_change(self, client_id, row):
+        """
+        Отражает изменение одной строки в таблице (в потоке Tk).
+        Args:
+            client_id (int): ID изменённой строки.
+            row (tuple | None): Строка из базы; None — строка удалена.
+        """
+        self.names.apply(client_id, None if row is None else row[1])
+        if self.table.active:
+            self.table.refresh()
+        else:
+            replace_row(self.all_clients, client_id, row)
+        if self.search_var.get().strip():
+            self.filter_clients()
+        elif not self.table.active:
+            self.rows.apply(client_id, row)
 
     def filter_clients(self, *args):
         """
         Фильтрует клиентов по введённому в поле поиска тексту.
-        Поиск производится по всем полям (регистронезависимо). При пустом запросе
-        отображаются все клиенты.
+        Поиск выполняется полнотекстовым индексом базы (`Database.search_clients`)
+        по началу слов в любом поле, результаты упорядочены по релевантности.
+        При пустом запросе отображаются все клиенты.
+        Запрос выполняется в фоновом потоке через `DebouncedSearch`.
         Args:
             *args: Игнорируемые аргументы.
         """
-        term = self.search_var.get().lower()
-        if not term:
-            filtered = self.all_clients
+        self.search.submit(self.search_var.get().strip())
+
+    def find_clients(self, term):
+        """
+        Ищет клиентов по тексту с учётом текущей сортировки таблицы.
+        Args:
+            term (str): Текст поиска.
+        Returns:
+            list[tuple]: Найденные строки.
+        """
+        return self.db.search_clients(term, SEARCH_LIMIT, *self.sort_order)
+
+    def show_found_clients(self, found):
+        """
+        Отображает результаты поиска клиентов или весь список, если запрос пустой.
+        Вызывается из `filter_clients` и из фонового поиска `DebouncedSearch`.
+        Args:
+            found (list | None): Найденные строки; None — показать все клиенты.
+        """
+        if self.table.active:
+            self.table.filter(found)
         else:
-            filtered = [
-                c for c in self.all_clients
-                if any(term in str(field).lower() for field in c)
-            ]
-        self.display_clients(filtered)
+            self.display_clients(self.all_clients if found is None else found)
+
+    def on_destroy(self, event):
+        """
+        Останавливает фоновый поиск при закрытии окна.
+        Args:
+            event (tk.Event): Событие уничтожения виджета.
+        """
+        if event.widget is self.window:
+            self.search.close()
 
     def sort_by(self, col):
         """
         Сортирует строки таблицы по выбранному столбцу.
         При повторном нажатии меняет порядок сортировки (по возрастанию/убыванию).
+        Сортировка выполняется в базе (ORDER BY) с учётом типа столбца — числа
+        и даты сравниваются как числа и даты — и с учётом текущего запроса поиска.
         Args:
             col (str): Название столбца, по которому нужно отсортировать.
         """
-        items = [(self.tree.set(child, col), child) for child in self.tree.get_children()]
         reverse = self.sort_reverse[col]
-        items.sort(reverse=reverse)
-
-        for index, (_, child) in enumerate(items):
-            self.tree.move(child, "", index)
-
+        self.sort_order = (self.order_columns[col], reverse)
         self.sort_reverse[col] = not reverse
 
+        if self.search_var.get().strip():
+            self.filter_clients()
+        else:
+            self.load_clients()
+
     def on_double_click(self, event):
         """
         Обрабатывает двойной клик по строке таблицы — заполняет форму данными клиента.
@@ -299,7 +414,7 @@ class ClientsWindow:
         Сохраняет клиента в базу данных — добавляет нового или обновляет существующего.
         Если `current_client_id` не задан — добавляет нового клиента.
         Иначе — обновляет данные по существующему ID. После сохранения очищает форму
-        и перезагружает таблицу.
+        и обновляет в таблице только изменённую строку.
         Показывает уведомление об успехе или ошибке.
         """
         self.window.attributes("-topmost", False)
@@ -312,35 +427,54 @@ class ClientsWindow:
                 self.address_entry.get().strip())
 
             if self.current_client_id is None:
-                self.db.insert_client(
-                    client.name,
-                    client.email,
-                    client.phone,
-                    client.address)
-                msg = "Клиент добавлен!"
+                saved = self.tasks.insert_client(*client.to_row())
+                on_saved = lambda new_id: self.on_client_changed(new_id, "Клиент добавлен!")
             else:
-                self.db.update_client(
-                    self.current_client_id,
+                client_id = self.current_client_id
+                saved = self.tasks.update_client(
+                    client_id,
                     client.name,
                     client.email,
                     client.phone,
                     client.address)
-                msg = "Клиент обновлён!"
+                on_saved = lambda _: self.on_client_changed(client_id, "Клиент обновлён!")
                 self.clear_fields()
 
-            messagebox.showinfo("Успех", msg)
-            self.load_clients()
-            self.filter_clients()
+            deliver(self.window, saved, on_saved,
+                    lambda e: self.show_error(f"Не удалось сохранить клиента: {e}"))
         except Exception as e:
             messagebox.showerror("Ошибка", f"Не удалось сохранить клиента: {e}")
         finally:
             self.window.attributes("-topmost", True)
 
+    def on_client_changed(self, client_id, msg):
+        """
+        Завершает добавление, изменение или удаление клиента (в потоке Tk):
+        показывает уведомление и обновляет строку таблицы.
+        Args:
+            client_id (int): ID клиента.
+            msg (str): Текст уведомления.
+        """
+        self.window.attributes("-topmost", False)
+        messagebox.showinfo("Успех", msg)
+        self.window.attributes("-topmost", True)
+        self.apply_client_change(client_id)
+
+    def show_error(self, text):
+        """
+        Показывает сообщение об ошибке фоновой операции.
+        Args:
+            text (str): Текст сообщения.
+        """
+        self.window.attributes("-topmost", False)
+        messagebox.showerror("Ошибка", text)
+        self.window.attributes("-topmost", True)
+
     def delete_client(self):
         """
         Удаляет выбранного клиента после подтверждения.
         Если клиент не выбран — выводит предупреждение. При подтверждении удаляет
-        запись через `Database.delete_client()` и обновляет таблицу.
+        запись в фоновом потоке (`AsyncDatabase.delete_client`) и обновляет таблицу.
         Raises:
             Показывает сообщение об ошибке при неудаче.
         """
@@ -355,42 +489,88 @@ class ClientsWindow:
         client_name = item['values'][1]
 
         if messagebox.askyesno("Подтверждение", f"Удалить клиента '{client_name}'?"):
-            try:
-                self.db.delete_client(client_id)
-                messagebox.showinfo("Успех", "Клиент удалён.")
-                self.load_clients()
-                self.filter_clients()
-            except Exception as e:
-                messagebox.showerror("Ошибка", f"Не удалось удалить клиента: {e}")
+            deliver(self.window, self.tasks.delete_client(client_id),
+                    lambda _: self.on_client_changed(client_id, "Клиент удалён."),
+                    lambda e: self.show_error(f"Не удалось удалить клиента: {e}"))
         self.window.attributes("-topmost", True)
 
     def export_to_csv(self):
         """
-        Экспортирует список всех клиентов в CSV-файл.
-        Открывает диалог выбора места сохранения. Если данных нет — уведомляет об этом.
-        В случае успеха — показывает имя сохранённого файла.
+        Экспортирует список клиентов в CSV-файл (или CSV, сжатый gzip, если имя оканчивается на '.gz')
+        с текущими поиском и сортировкой — все строки из базы, а не только загруженные.
+        Файл пишется в фоновом потоке пачками; ход показывается в окне с кнопкой «Отмена».
+        В случае успеха — показывает количество строк и имя сохранённого файла.
         """
         self.window.attributes("-topmost", False)
-        if not self.all_clients:
+        if not self.all_clients and not self.table.active:
             messagebox.showinfo("Экспорт", "Нет данных для экспорта.")
+            self.window.attributes("-topmost", True)
             return
 
         file_path = filedialog.asksaveasfilename(
             defaultextension=".csv",
-            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
+            filetypes=[("CSV files", "*.csv"), ("CSV gzip", "*.csv.gz"), ("All files", "*.*")],
             title="Сохранить как CSV"
         )
         if not file_path:
+            self.window.attributes("-topmost", True)
             return
 
-        try:
-            with open(file_path, mode='w', encoding='utf-8', newline='') as f:
-                writer = csv.writer(f)
-                writer.writerow(["ID", "Имя", "Email", "Телефон", "Адрес"])
-                writer.writerows(self.all_clients)
-            messagebox.showinfo("Успех", f"Данные экспортированы в {os.path.basename(file_path)}")
-        except Exception as e:
-            messagebox.showerror("Ошибка", f"Не удалось экспортировать: {e}")
+        def on_done(written):
+            self.window.attributes("-topmost", False)
+            messagebox.showinfo("Успех", f"Экспортировано строк: {written} в {os.path.basename(file_path)}")
+            self.window.attributes("-topmost", True)
+
+        def on_error(error):
+            if isinstance(error, ExportCancelled):
+                self.window.attributes("-topmost", False)
+                messagebox.showinfo("Экспорт", "Экспорт отменён.")
+                self.window.attributes("-topmost", True)
+            else:
+                self.show_error(f"Не удалось экспортировать: {error}")
+
+        order_by, descending = self.sort_order
+        header = ["ID", "Имя", "Email", "Телефон", "Адрес"]
+        start_export(self.window, self.tasks, "clients", header, file_path, on_done, on_error,
+                     term=self.search_var.get().strip(), order_by=order_by, descending=descending)
+        self.window.attributes("-topmost", True)
+
+    def import_from_file(self):
+        """
+        Импортирует клиентов из CSV или JSON (в том числе сжатых gzip) в фоновом потоке.
+        Нужные столбцы: Имя, Email, Телефон, Адрес (или c_name, email, phone, address).
+        Некорректные записи не добавляются и попадают в отчёт рядом с файлом
+        (`importer.report_path_for`); по окончании показывает итог и обновляет список.
+        """
+        self.window.attributes("-topmost", False)
+        file_path = filedialog.askopenfilename(
+            filetypes=[("CSV и JSON", "*.csv *.json *.jsonl *.ndjson *.gz"), ("All files", "*.*")],
+            title="Импорт из файла"
+        )
+        if not file_path:
+            self.window.attributes("-topmost", True)
+            return
+
+        def on_done(result):
+            imported, rejected = result
+            text = f"Импортировано записей: {imported}."
+            if rejected:
+                text += f"\nОтклонено: {rejected}, см. {os.path.basename(report_path_for(file_path))}"
+            self.window.attributes("-topmost", False)
+            messagebox.showinfo("Импорт", text)
+            self.window.attributes("-topmost", True)
+            self.names.invalidate()
+            self.load_clients()
+
+        def on_error(error):
+            if isinstance(error, ImportCancelled):
+                self.window.attributes("-topmost", False)
+                messagebox.showinfo("Импорт", "Импорт отменён.")
+                self.window.attributes("-topmost", True)
+            else:
+                self.show_error(f"Не удалось импортировать: {error}")
+
+        start_import(self.window, self.tasks, "clients", file_path, on_done, on_error)
         self.window.attributes("-topmost", True)
 
     def clear_fields(self):
@@ -414,19 +594,25 @@ class ProductsWindow:
     по двойному клику на строке таблицы.
     """
 
-    def __init__(self, window):
+    def __init__(self, window, db=None, names=None):
         """
         Инициализирует окно управления товарами.
         Создаёт графический интерфейс с формой ввода, таблицей товаров, поиском
         и кнопками действий. Загружает список товаров из базы данных.
         Args:
             window (tk.Toplevel): Окно верхнего уровня, в котором будет отображаться интерфейс.
+            db (AsyncDatabase, optional): Асинхронный доступ к базе данных из общего пула.
+                Если не передан, окно открывает собственный пул соединений.
+            names (NameCache, optional): Общий кэш имён товаров для выпадающих списков
+                других окон; окно сообщает ему о своих изменениях.
         """
         self.window = window
         self.window.title("Товары")
         self.window.geometry("1000x600")
         self.window.attributes("-topmost", True)
-        self.db = Database()
+        self.tasks = db if db is not None else AsyncDatabase(ConnectionPool())
+        self.db = self.tasks.sync
+        self.names = names if names is not None else NameCache(self.tasks.get_products)
 
         frame = Frame(self.window, padx=10, pady=10)
         frame.pack(fill="both", expand=True)
@@ -436,8 +622,14 @@ class ProductsWindow:
         search_frame.grid(row=0, column=0, columnspan=2, sticky="ew", pady=5)
         Label(search_frame, text="Поиск:").pack(side="left", padx=5)
         self.search_var = StringVar()
-        self.search_var.trace("w", self.filter_products)  # Live search
+        self.search_status = StringVar()
+        # Live search: поиск с задержкой в фоновом потоке
+        self.search = DebouncedSearch(self.window, self.find_products, self.show_found_products,
+                                      self.search_status)
+        self.search_var.trace("w", lambda *args: self.search.submit(self.search_var.get().strip()))
         Entry(search_frame, textvariable=self.search_var, width=40).pack(side="left", padx=5)
+        Label(search_frame, textvariable=self.search_status, fg="gray").pack(side="left", padx=5)
+        self.window.bind("<Destroy>", self.on_destroy)
 
         # --- Форма добавления/редактирования ---
         form_frame = LabelFrame(frame, text="Добавить/Редактировать товар", padx=10, pady=10)
@@ -486,6 +678,9 @@ class ProductsWindow:
         }
         self.sort_columns = columns
         self.sort_reverse = {col: False for col in columns}
+        # Столбцы таблицы -> столбцы сортировки в базе (режим виртуальной прокрутки)
+        self.order_columns = {"ID": "id", "Наименование": "p_name", "Цена": "price", "Количество": "stock"}
+        self.sort_order = (None, False)  # (столбец в базе, по убыванию); None — без сортировки
 
         for col, text in columns.items():
             self.tree.heading(col, text=text, command=lambda c=col: self.sort_by(c))
@@ -496,6 +691,8 @@ class ProductsWindow:
         self.tree.configure(yscrollcommand=scrollbar.set)
         scrollbar.pack(side="right", fill="y")
         self.tree.pack(side="left", fill="both", expand=True)
+        self.table = VirtualTreeview(self.tree, scrollbar, self.db, "products")
+        self.rows = KeyedTreeview(self.tree)
 
         # Двойной клик для редактирования
         self.tree.bind("<Double-1>", self.on_double_click)
@@ -507,6 +704,7 @@ class ProductsWindow:
         Button(action_btn_frame, text="Обновить", command=self.load_products).pack(side="left", padx=5)
         Button(action_btn_frame, text="Удалить", command=self.delete_product).pack(side="left", padx=5)
         Button(action_btn_frame, text="Экспорт в CSV", command=self.export_to_csv).pack(side="left", padx=5)
+        Button(action_btn_frame, text="Импорт", command=self.import_from_file).pack(side="left", padx=5)
         Button(action_btn_frame, text="Выйти", command=self.window.destroy).pack(side="left", padx=5)
 
         self.current_product_id = None  # Для редактирования
@@ -518,56 +716,139 @@ class ProductsWindow:
         Загружает все товары из базы данных.
         Вызывает метод `Database.load_product()`, сохраняет результат в `self.all_products`
         и отображает данные в таблице. В случае ошибки показывает сообщение.
+        Если товаров больше `VIRTUAL_THRESHOLD`, включает виртуальную прокрутку:
+        строки читаются из базы страницами по мере прокрутки таблицы.
+        Запросы выполняются в фоновом потоке (`AsyncDatabase`), результат
+        показывается в потоке Tk; окно в это время не блокируется.
         """
-        try:
-            self.all_products = self.db.load_product()
-            self.display_products(self.all_products)
-        except Exception as e:
-            messagebox.showerror("Ошибка", f"Не удалось загрузить товары: {e}")
+        deliver(self.window, self.tasks.count_products(), self.on_products_counted,
+                lambda e: self.show_error(f"Не удалось загрузить товары: {e}"))
+
+    def on_products_counted(self, count):
+        """
+        Продолжает загрузку после подсчёта строк (в потоке Tk): включает виртуальную
+        прокрутку для большого списка или запрашивает весь список.
+        Args:
+            count (int): Количество строк в базе.
+        """
+        if count > VIRTUAL_THRESHOLD:
+            # Большой список: строки читаются из базы по мере прокрутки
+            self.all_products = []
+            self.rows.clear()
+            self.table.attach(self.sort_order[0] or "id", self.sort_order[1])
+            self.filter_products()
+        else:
+            deliver(self.window, self.tasks.load_product(*self.sort_order), self.on_products_loaded,
+                    lambda e: self.show_error(f"Не удалось загрузить товары: {e}"))
+
+    def on_products_loaded(self, products):
+        """
+        Показывает загруженный список (в потоке Tk) с учётом строки поиска.
+        Args:
+            products (list): Строки списка.
+        """
+        self.table.detach()
+        self.all_products = products
+        self.filter_products()
 
     def display_products(self, products):
         """
         Отображает список товаров в виджете Treeview.
-        Перед отображением очищает текущую таблицу.
+        Таблица не очищается: изменяются только отличающиеся от показанных строки.
         Args:
             products (list): Список кортежей с данными товаров (ID, Наименование, Цена, Количество).
         """
-        for row in self.tree.get_children():
-            self.tree.delete(row)
-        for product in products:
-            self.tree.insert("", "end", values=product)
+        self.rows.show(products)
+
+    def apply_product_change(self, product_id):
+        """
+        Показывает в таблице изменение одного товара без перерисовки всего списка.
+        Строка перечитывается из базы (`Database.load_product_row`) и заменяет только
+        свой элемент таблицы; при активном поиске результаты запрашиваются заново
+        и сравниваются с показанными, в режиме виртуальной прокрутки перерисовываются
+        только видимые строки.
+        Args:
+            product_id (int): ID добавленного, изменённого или удалённого товара.
+        """
+        deliver(self.window, self.tasks.load_product_row(product_id),
+                lambda row: self.show_product_change(product_id, row),
+                lambda e: self.show_error(f"Не удалось обновить таблицу: {e}"))
+
+    def show_product_change(self, product_id, row):
+        """
+        Отражает изменение одной строки в таблице (в потоке Tk).
+        Args:
+            product_id (int): ID изменённой строки.
+            row (tuple | None): Строка из базы; None — строка удалена.
+        """
+        self.names.apply(product_id, None if row is None else row[1])
+        if self.table.active:
+            self.table.refresh()
+        else:
+            replace_row(self.all_products, product_id, row)
+        if self.search_var.get().strip():
+            self.filter_products()
+        elif not self.table.active:
+            self.rows.apply(product_id, row)
 
     def filter_products(self, *args):
         """
         Фильтрует товары по тексту из поля поиска (регистронезависимо).
-        При пустом запросе отображаются все товары. Поиск ведётся по всем полям.
+        Поиск выполняется полнотекстовым индексом базы (`Database.search_products`)
+        по началу слов в наименовании. При пустом запросе отображаются все товары.
+        Запрос выполняется в фоновом потоке через `DebouncedSearch`.
+        """
+        self.search.submit(self.search_var.get().strip())
+
+    def find_products(self, term):
+        """
+        Ищет товары по тексту с учётом текущей сортировки таблицы.
+        Args:
+            term (str): Текст поиска.
+        Returns:
+            list[tuple]: Найденные строки.
         """
-        term = self.search_var.get().lower()
-        if not term:
-            filtered = self.all_products
+        return self.db.search_products(term, SEARCH_LIMIT, *self.sort_order)
+
+    def show_found_products(self, found):
+        """
+        Отображает результаты поиска товаров или весь список, если запрос пустой.
+        Вызывается из `filter_products` и из фонового поиска `DebouncedSearch`.
+        Args:
+            found (list | None): Найденные строки; None — показать все товары.
+        """
+        if self.table.active:
+            self.table.filter(found)
         else:
-            filtered = [
-                p for p in self.all_products
-                if any(term in str(field).lower() for field in p)
-            ]
-        self.display_products(filtered)
+            self.display_products(self.all_products if found is None else found)
+
+    def on_destroy(self, event):
+        """
+        Останавливает фоновый поиск при закрытии окна.
+        Args:
+            event (tk.Event): Событие уничтожения виджета.
+        """
+        if event.widget is self.window:
+            self.search.close()
 
     def sort_by(self, col):
         """
         Сортирует строки таблицы по выбранному столбцу.
         При повторном нажатии меняет направление сортировки (по возрастанию/убыванию).
+        Сортировка выполняется в базе (ORDER BY) с учётом типа столбца — числа
+        и даты сравниваются как числа и даты — и с учётом текущего запроса поиска.
         Args:
             col (str): Название столбца, по которому выполняется сортировка.
         """
-        items = [(self.tree.set(child, col), child) for child in self.tree.get_children()]
         reverse = self.sort_reverse[col]
-        items.sort(reverse=reverse)
-
-        for index, (_, child) in enumerate(items):
-            self.tree.move(child, "", index)
-
+        self.sort_order = (self.order_columns[col], reverse)
         self.sort_reverse[col] = not reverse
 
+        if self.search_var.get().strip():
+            self.filter_products()
+        else:
+            self.load_products()
+
     def on_double_click(self, event):
         """
         Обрабатывает двойной клик по строке — заполняет форму данными товара.
@@ -598,8 +879,8 @@ class ProductsWindow:
         """
         Сохраняет товар в базу данных — добавляет новый или обновляет существующий.
         Если `current_product_id` не задан — добавляет товар.
-        Иначе — обновляет данные по ID. После сохранения очищает форму,
-        перезагружает таблицу и применяет текущий фильтр.
+        Иначе — обновляет данные по ID. После сохранения очищает форму
+        и обновляет в таблице только изменённую строку с учётом текущего фильтра.
         Показывает уведомление об успехе или ошибке.
         """
         self.window.attributes("-topmost", False)
@@ -612,31 +893,54 @@ class ProductsWindow:
             )
 
             if self.current_product_id is None:
-                self.db.insert_product(product.name, product.price, product.stock)
-                msg = "Товар добавлен!"
+                saved = self.tasks.insert_product(*product.to_row())
+                on_saved = lambda new_id: self.on_product_changed(new_id, "Товар добавлен!")
             else:
-                self.db.update_product(
-                    self.current_product_id,
+                product_id = self.current_product_id
+                saved = self.tasks.update_product(
+                    product_id,
                     product.name,
                     product.price,
                     product.stock
                 )
-                msg = "Товар обновлён!"
+                on_saved = lambda _: self.on_product_changed(product_id, "Товар обновлён!")
                 self.clear_fields()
 
-            messagebox.showinfo("Успех", msg)
-            self.load_products()
-            self.filter_products()
+            deliver(self.window, saved, on_saved,
+                    lambda e: self.show_error(f"Не удалось сохранить товар: {e}"))
         except Exception as e:
             messagebox.showerror("Ошибка", f"Не удалось сохранить товар: {e}")
         finally:
             self.window.attributes("-topmost", True)
 
+    def on_product_changed(self, product_id, msg):
+        """
+        Завершает добавление, изменение или удаление товара (в потоке Tk):
+        показывает уведомление и обновляет строку таблицы.
+        Args:
+            product_id (int): ID товара.
+            msg (str): Текст уведомления.
+        """
+        self.window.attributes("-topmost", False)
+        messagebox.showinfo("Успех", msg)
+        self.window.attributes("-topmost", True)
+        self.apply_product_change(product_id)
+
+    def show_error(self, text):
+        """
+        Показывает сообщение об ошибке фоновой операции.
+        Args:
+            text (str): Текст сообщения.
+        """
+        self.window.attributes("-topmost", False)
+        messagebox.showerror("Ошибка", text)
+        self.window.attributes("-topmost", True)
+
     def delete_product(self):
         """
         Удаляет выбранный товар после подтверждения.
         Если строка не выбрана — выводит предупреждение. При подтверждении удаляет
-        запись через `Database.delete_product()` и обновляет таблицу.
+        запись в фоновом потоке (`AsyncDatabase.delete_product`) и обновляет таблицу.
         Raises:
             Показывает сообщение об ошибке в случае неудачи.
         """
@@ -651,44 +955,88 @@ class ProductsWindow:
         product_name = item['values'][1]
 
         if messagebox.askyesno("Подтверждение", f"Удалить товар '{product_name}'?"):
-            try:
-                self.db.delete_product(product_id)
-                messagebox.showinfo("Успех", "Товар удалён.")
-                self.load_products()
-                self.filter_products()
-            except Exception as e:
-                messagebox.showerror("Ошибка", f"Не удалось удалить товар: {e}")
+            deliver(self.window, self.tasks.delete_product(product_id),
+                    lambda _: self.on_product_changed(product_id, "Товар удалён."),
+                    lambda e: self.show_error(f"Не удалось удалить товар: {e}"))
         self.window.attributes("-topmost", True)
 
     def export_to_csv(self):
         """
-        Экспортирует список всех товаров в CSV-файл.
-        Открывает диалог сохранения. Если данных нет — уведомляет об этом.
-        В случае успеха — показывает имя сохранённого файла.
-        Raises:
-            Показывает сообщение об ошибке при проблеме с записью файла.
+        Экспортирует список товаров в CSV-файл (или CSV, сжатый gzip, если имя оканчивается на '.gz')
+        с текущими поиском и сортировкой — все строки из базы, а не только загруженные.
+        Файл пишется в фоновом потоке пачками; ход показывается в окне с кнопкой «Отмена».
+        В случае успеха — показывает количество строк и имя сохранённого файла.
         """
         self.window.attributes("-topmost", False)
-        if not self.all_products:
+        if not self.all_products and not self.table.active:
             messagebox.showinfo("Экспорт", "Нет данных для экспорта.")
+            self.window.attributes("-topmost", True)
             return
 
         file_path = filedialog.asksaveasfilename(
             defaultextension=".csv",
-            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
+            filetypes=[("CSV files", "*.csv"), ("CSV gzip", "*.csv.gz"), ("All files", "*.*")],
             title="Сохранить как CSV"
         )
         if not file_path:
+            self.window.attributes("-topmost", True)
             return
 
-        try:
-            with open(file_path, mode='w', encoding='utf-8', newline='') as f:
-                writer = csv.writer(f)
-                writer.writerow(["ID", "Наименование", "Цена", "Количество"])
-                writer.writerows(self.all_products)
-            messagebox.showinfo("Успех", f"Данные экспортированы в {os.path.basename(file_path)}")
-        except Exception as e:
-            messagebox.showerror("Ошибка", f"Не удалось экспортировать: {e}")
+        def on_done(written):
+            self.window.attributes("-topmost", False)
+            messagebox.showinfo("Успех", f"Экспортировано строк: {written} в {os.path.basename(file_path)}")
+            self.window.attributes("-topmost", True)
+
+        def on_error(error):
+            if isinstance(error, ExportCancelled):
+                self.window.attributes("-topmost", False)
+                messagebox.showinfo("Экспорт", "Экспорт отменён.")
+                self.window.attributes("-topmost", True)
+            else:
+                self.show_error(f"Не удалось экспортировать: {error}")
+
+        order_by, descending = self.sort_order
+        header = ["ID", "Наименование", "Цена", "Количество"]
+        start_export(self.window, self.tasks, "products", header, file_path, on_done, on_error,
+                     term=self.search_var.get().strip(), order_by=order_by, descending=descending)
+        self.window.attributes("-topmost", True)
+
+    def import_from_file(self):
+        """
+        Импортирует товары из CSV или JSON (в том числе сжатых gzip) в фоновом потоке.
+        Нужные столбцы: Наименование, Цена, Количество (или p_name, price, stock).
+        Некорректные записи не добавляются и попадают в отчёт рядом с файлом
+        (`importer.report_path_for`); по окончании показывает итог и обновляет список.
+        """
+        self.window.attributes("-topmost", False)
+        file_path = filedialog.askopenfilename(
+            filetypes=[("CSV и JSON", "*.csv *.json *.jsonl *.ndjson *.gz"), ("All files", "*.*")],
+            title="Импорт из файла"
+        )
+        if not file_path:
+            self.window.attributes("-topmost", True)
+            return
+
+        def on_done(result):
+            imported, rejected = result
+            text = f"Импортировано записей: {imported}."
+            if rejected:
+                text += f"\nОтклонено: {rejected}, см. {os.path.basename(report_path_for(file_path))}"
+            self.window.attributes("-topmost", False)
+            messagebox.showinfo("Импорт", text)
+            self.window.attributes("-topmost", True)
+            self.names.invalidate()
+            self.load_products()
+
+        def on_error(error):
+            if isinstance(error, ImportCancelled):
+                self.window.attributes("-topmost", False)
+                messagebox.showinfo("Импорт", "Импорт отменён.")
+                self.window.attributes("-topmost", True)
+            else:
+                self.show_error(f"Не удалось импортировать: {error}")
+
+        start_import(self.window, self.tasks, "products", file_path, on_done, on_error)
         self.window.attributes("-topmost", True)
 
     def clear_fields(self):
@@ -711,7 +1059,7 @@ class OrdersWindow:
     даты заказа, а также экспорт данных в CSV.
     """
 
-    def __init__(self, window):
+    def __init__(self, window, db=None, client_names=None, product_names=None):
         """
         Инициализирует окно управления заказами.
 
@@ -720,12 +1068,19 @@ class OrdersWindow:
 
         Args:
             window (tk.Toplevel): Окно верхнего уровня для отображения интерфейса.
+            db (AsyncDatabase, optional): Асинхронный доступ к базе данных из общего пула.
+                Если не передан, окно открывает собственный пул соединений.
+            client_names (NameCache, optional): Общий кэш имён клиентов.
+            product_names (NameCache, optional): Общий кэш наименований товаров.
         """
         self.window = window
         self.window.title("Заказы")
         self.window.geometry("1000x600")
         self.window.attributes("-topmost", True)
-        self.db = Database()
+        self.tasks = db if db is not None else AsyncDatabase(ConnectionPool())
+        self.db = self.tasks.sync
+        self.client_names = client_names if client_names is not None else NameCache(self.tasks.get_clients)
+        self.product_names = product_names if product_names is not None else NameCache(self.tasks.get_products)
 
         frame = Frame(self.window, padx=10, pady=10)
         frame.pack(fill="both", expand=True)
@@ -735,8 +1090,25 @@ class OrdersWindow:
         search_frame.grid(row=0, column=0, columnspan=2, sticky="ew", pady=5)
         Label(search_frame, text="Поиск:").pack(side="left", padx=5)
         self.search_var = StringVar()
-        self.search_var.trace("w", self.filter_orders)  # Live search
+        self.search_status = StringVar()
+        # Live search: поиск с задержкой в фоновом потоке
+        self.search = DebouncedSearch(self.window, self.find_orders, self.show_found_orders,
+                                      self.search_status)
+        self.search_var.trace("w", lambda *args: self.search.submit(self.search_var.get().strip()))
         Entry(search_frame, textvariable=self.search_var, width=40).pack(side="left", padx=5)
+        Label(search_frame, textvariable=self.search_status, fg="gray").pack(side="left", padx=5)
+        self.window.bind("<Destroy>", self.on_destroy)
+
+        # Фильтр по периоду: заказы выбираются по индексу нормализованной даты
+        Label(search_frame, text="Период:").pack(side="left", padx=5)
+        self.date_from_entry = DateEntry(search_frame, date_pattern="yyyy-mm-dd", width=12)
+        self.date_from_entry.pack(side="left", padx=2)
+        Label(search_frame, text="—").pack(side="left")
+        self.date_to_entry = DateEntry(search_frame, date_pattern="yyyy-mm-dd", width=12)
+        self.date_to_entry.pack(side="left", padx=2)
+        Button(search_frame, text="Показать", command=self.apply_date_range).pack(side="left", padx=5)
+        Button(search_frame, text="Все даты", command=self.reset_date_range).pack(side="left", padx=5)
+        self.date_range = None  # (первая дата, последняя дата) или None — без фильтра
 
         # --- Форма добавления/редактирования ---
         form_frame = LabelFrame(frame, text="Добавить/Редактировать заказ", padx=10, pady=10)
@@ -745,26 +1117,26 @@ class OrdersWindow:
         # Клиент
         Label(form_frame, text="Клиент:").grid(row=0, column=0, sticky="w", padx=5, pady=5)
         self.client_var = StringVar()
-        name_client = [cl[1] for cl in self.db.get_clients()]
         self.client_combo = ttk.Combobox(
                                         form_frame,
-                                        values=sorted(name_client),
                                         textvariable=self.client_var,
                                         width=30
                                     )
         self.client_combo.grid(row=0, column=1, padx=5, pady=5)
+        self.client_picker = IdPicker(self.client_combo, self.client_names,
+                                      lambda e: self.show_error(f"Не удалось загрузить клиентов: {e}"))
 
         # Товар
         Label(form_frame, text="Товар:").grid(row=1, column=0, sticky="w", padx=5, pady=5)
         self.product_var = StringVar()
-        name_product = [pr[1] for pr in self.db.get_products()]
         self.product_combo = ttk.Combobox(
                                         form_frame,
-                                        values=sorted(name_product),
                                         textvariable=self.product_var,
                                         width=30
                                     )
         self.product_combo.grid(row=1, column=1, padx=5, pady=5)
+        self.product_picker = IdPicker(self.product_combo, self.product_names,
+                                       lambda e: self.show_error(f"Не удалось загрузить товары: {e}"))
 
         # Количество
         Label(form_frame, text="Количество:").grid(row=0, column=3, sticky="w", padx=5, pady=5)
@@ -810,6 +1182,9 @@ class OrdersWindow:
         }
         self.sort_columns = columns
         self.sort_reverse = {col: False for col in columns}
+        # Столбцы таблицы -> столбцы сортировки в базе (режим виртуальной прокрутки)
+        self.order_columns = {"ID": "id", "Клиент": "c_name", "Товар": "p_name", "Кол-во": "quantity", "Дата": "order_date"}
+        self.sort_order = (None, False)  # (столбец в базе, по убыванию); None — без сортировки
 
         for col, text in columns.items():
             self.tree.heading(col, text=text, command=lambda c=col: self.sort_by(c))
@@ -819,6 +1194,8 @@ class OrdersWindow:
         self.tree.configure(yscrollcommand=scrollbar.set)
         scrollbar.pack(side="right", fill="y")
         self.tree.pack(side="left", fill="both", expand=True)
+        self.table = VirtualTreeview(self.tree, scrollbar, self.db, "orders")
+        self.rows = KeyedTreeview(self.tree)
 
         self.tree.bind("<Double-1>", self.on_double_click)
 
@@ -829,6 +1206,7 @@ class OrdersWindow:
         Button(action_btn_frame, text="Обновить", command=self.load_orders).pack(side="left", padx=5)
         Button(action_btn_frame, text="Удалить выбранного", command=self.delete_order).pack(side="left", padx=5)
         Button(action_btn_frame, text="Экспорт в CSV", command=self.export_to_csv).pack(side="left", padx=5)
+        Button(action_btn_frame, text="Импорт", command=self.import_from_file).pack(side="left", padx=5)
         Button(action_btn_frame, text="Выйти", command=self.window.destroy).pack(side="left", padx=5)
 
         self.current_order_id = None  # Для редактирования
@@ -839,60 +1217,174 @@ class OrdersWindow:
         """
         Загружает все заказы из базы данных.
 
-        Вызывает `self.db.load_order()` и сохраняет результат в `self.all_orders`.
+        Вызывает `load_order()` и сохраняет результат в `self.all_orders`.
         Отображает данные в таблице. При ошибке показывает сообщение.
+        Если заказов больше `VIRTUAL_THRESHOLD`, включает виртуальную прокрутку:
+        строки читаются из базы страницами по мере прокрутки таблицы.
+        Запросы выполняются в фоновом потоке (`AsyncDatabase`), результат
+        показывается в потоке Tk; окно в это время не блокируется.
+        Если задан период (`apply_date_range`), загружаются и считаются только заказы за него.
         """
-        try:
-            self.all_orders = self.db.load_order()
-            self.display_orders(self.all_orders)
-        except Exception as e:
-            messagebox.showerror("Ошибка", f"Не удалось загрузить заказы: {e}")
+        deliver(self.window, self.tasks.count_orders(self.date_range), self.on_orders_counted,
+                lambda e: self.show_error(f"Не удалось загрузить заказы: {e}"))
+
+    def apply_date_range(self):
+        """
+        Показывает только заказы за период, выбранный в полях «Период».
+        """
+        start = self.date_from_entry.get_date().isoformat()
+        end = self.date_to_entry.get_date().isoformat()
+        if start > end:
+            self.show_error("Начало периода позже его окончания.")
+            return
+        self.date_range = (start, end)
+        self.load_orders()
+
+    def reset_date_range(self):
+        """
+        Снимает фильтр по периоду и показывает все заказы.
+        """
+        self.date_range = None
+        self.load_orders()
+
+    def on_orders_counted(self, count):
+        """
+        Продолжает загрузку после подсчёта строк (в потоке Tk): включает виртуальную
+        прокрутку для большого списка или запрашивает весь список (за период, если он задан).
+        Args:
+            count (int): Количество строк в базе.
+        """
+        if count > VIRTUAL_THRESHOLD:
+            # Большой список: строки читаются из базы по мере прокрутки
+            self.all_orders = []
+            self.rows.clear()
+            self.table.attach(self.sort_order[0] or "id", self.sort_order[1], self.date_range)
+            self.filter_orders()
+        elif self.date_range is not None:
+            deliver(self.window, self.tasks.orders_between(*self.date_range, *self.sort_order),
+                    self.on_orders_loaded, lambda e: self.show_error(f"Не удалось загрузить заказы: {e}"))
+        else:
+            deliver(self.window, self.tasks.load_order(*self.sort_order), self.on_orders_loaded,
+                    lambda e: self.show_error(f"Не удалось загрузить заказы: {e}"))
+
+    def on_orders_loaded(self, orders):
+        """
+        Показывает загруженный список (в потоке Tk) с учётом строки поиска.
+        Args:
+            orders (list): Строки списка.
+        """
+        self.table.detach()
+        self.all_orders = orders
+        self.filter_orders()
 
     def display_orders(self, orders):
         """
         Отображает список заказов в Treeview.
 
-        Очищает текущую таблицу и добавляет новые строки.
+        Таблица не очищается: изменяются только отличающиеся от показанных строки.
 
         Args:
             orders (list): Список кортежей с данными заказов (ID, Клиент, Товар, Кол-во, Дата).
         """
-        for row in self.tree.get_children():
-            self.tree.delete(row)
-        for order in orders:
-            self.tree.insert("", "end", values=order)
+        self.rows.show(orders)
+
+    def apply_order_change(self, order_id):
+        """
+        Показывает в таблице изменение одного заказа без перерисовки всего списка.
+        Строка перечитывается из базы (`Database.load_order_row`) и заменяет только
+        свой элемент таблицы; при активном поиске результаты запрашиваются заново
+        и сравниваются с показанными, в режиме виртуальной прокрутки перерисовываются
+        только видимые строки.
+        Args:
+            order_id (int): ID добавленного, изменённого или удалённого заказа.
+        """
+        deliver(self.window, self.tasks.load_order_row(order_id),
+                lambda row: self.show_order_change(order_id, row),
+                lambda e: self.show_error(f"Не удалось обновить таблицу: {e}"))
+
+    def show_order_change(self, order_id, row):
+        """
+        Отражает изменение одной строки в таблице (в потоке Tk).
+        Args:
+            order_id (int): ID изменённой строки.
+            row (tuple | None): Строка из базы; None — строка удалена.
+        """
+        if self.date_range is not None:
+            # Изменённый заказ мог войти в период или выйти из него
+            self.load_orders()
+            return
+        if self.table.active:
+            self.table.refresh()
+        else:
+            replace_row(self.all_orders, order_id, row)
+        if self.search_var.get().strip():
+            self.filter_orders()
+        elif not self.table.active:
+            self.rows.apply(order_id, row)
 
     def filter_orders(self, *args):
         """
         Фильтрует заказы по тексту из поля поиска (регистронезависимо).
-        Поиск ведётся по всем полям. При пустом запросе отображаются все заказы.
+        Поиск выполняется полнотекстовым индексом базы (`Database.search_orders`)
+        по началу слов в имени клиента, товаре и дате. При пустом запросе
+        отображаются все заказы.
+        Запрос выполняется в фоновом потоке через `DebouncedSearch`.
+        """
+        self.search.submit(self.search_var.get().strip())
+
+    def find_orders(self, term):
+        """
+        Ищет заказы по тексту с учётом текущей сортировки таблицы и периода:
+        период отбирается в запросе до ограничения `SEARCH_LIMIT`.
+        Args:
+            term (str): Текст поиска.
+        Returns:
+            list[tuple]: Найденные строки.
         """
-        term = self.search_var.get().lower()
-        if not term:
-            filtered = self.all_orders
+        return self.db.search_orders(term, SEARCH_LIMIT, *self.sort_order, self.date_range)
+
+    def show_found_orders(self, found):
+        """
+        Отображает результаты поиска заказов или весь список, если запрос пустой.
+        Вызывается из `filter_orders` и из фонового поиска `DebouncedSearch`.
+        Args:
+            found (list | None): Найденные строки; None — показать все заказы.
+        """
+        if self.table.active:
+            self.table.filter(found)
         else:
-            filtered = [
-                o for o in self.all_orders
-                if any(term in str(field).lower() for field in o)
-            ]
-        self.display_orders(filtered)
+            self.display_orders(self.all_orders if found is None else found)
+
+    def on_destroy(self, event):
+        """
+        Останавливает фоновый поиск и отписывает выпадающие списки от кэша имён
+        при закрытии окна.
+        Args:
+            event (tk.Event): Событие уничтожения виджета.
+        """
+        if event.widget is self.window:
+            self.search.close()
+            self.client_picker.close()
+            self.product_picker.close()
 
     def sort_by(self, col):
         """
         Сортирует строки таблицы по выбранному столбцу.
         При повторном клике меняет направление сортировки (по возрастанию/убыванию).
+        Сортировка выполняется в базе (ORDER BY) с учётом типа столбца — числа
+        и даты сравниваются как числа и даты — и с учётом текущего запроса поиска.
         Args:
             col (str): Название столбца для сортировки.
         """
-        items = [(self.tree.set(child, col), child) for child in self.tree.get_children()]
         reverse = self.sort_reverse[col]
-        items.sort(reverse=reverse)
-
-        for index, (_, child) in enumerate(items):
-            self.tree.move(child, "", index)
-
+        self.sort_order = (self.order_columns[col], reverse)
         self.sort_reverse[col] = not reverse
 
+        if self.search_var.get().strip():
+            self.filter_orders()
+        else:
+            self.load_orders()
+
     def on_double_click(self, event):
         """
         Обрабатывает двойной клик — заполняет форму данными выбранного заказа.
@@ -904,20 +1396,28 @@ class OrdersWindow:
         if not selected:
             return
         item = self.tree.item(selected[0])
-        values = item['values']
-        order_id = values[0]
+        deliver(self.window, self.tasks.get_order(item['values'][0]), self.fill_order_form,
+                lambda e: self.show_error(f"Не удалось загрузить заказ: {e}"))
 
-        self.client_combo.delete(0, tk.END)
-        self.client_combo.insert(0, values[1])
+    def fill_order_form(self, order):
+        """
+        Заполняет форму данными заказа, прочитанными в фоновом потоке.
+        Args:
+            order (tuple | None): Кортеж (id, client_id, product_id, quantity, order_date)
+                или None, если заказ уже удалён.
+        """
+        if order is None:
+            return
+        order_id, client_id, product_id, quantity, order_date = order
 
-        self.product_combo.delete(0, tk.END)
-        self.product_combo.insert(0, values[2])
+        self.client_picker.select(client_id)
+        self.product_picker.select(product_id)
 
         self.quantity_entry.delete(0, tk.END)
-        self.quantity_entry.insert(0, values[3])
+        self.quantity_entry.insert(0, quantity)
 
         self.order_date_entry.delete(0, tk.END)
-        self.order_date_entry.insert(0, values[4] if values[4] else "")
+        self.order_date_entry.insert(0, order_date if order_date else "")
 
         self.current_order_id = order_id
         self.save_btn.config(text="Обновить")
@@ -932,8 +1432,9 @@ class OrdersWindow:
         """
         self.window.attributes("-topmost", False)
 
-        client_str = self.client_combo.get()
-        product_str = self.product_combo.get()
+        # ID берутся из выпадающих списков — запросы к базе для поиска по имени не нужны
+        client_id = self.client_picker.selected_id()
+        product_id = self.product_picker.selected_id()
 
         try:
             quantity = int(self.quantity_entry.get())
@@ -941,37 +1442,58 @@ class OrdersWindow:
             messagebox.showerror("Ошибка", "Количество должно быть целым числом.")
             return
 
-        if not client_str or not product_str or quantity <= 0:
-            messagebox.showerror("Ошибка", "Все поля обязательны, количество > 0.")
+        if client_id is None or product_id is None or quantity <= 0:
+            messagebox.showerror("Ошибка", "Выберите клиента и товар из списка, количество > 0.")
             return
 
         try:
-            client_id = self.db.get_client_id(client_str)[0]
-            product_id = self.db.get_product_id(product_str)[0]
             order_date = self.order_date_entry.get()
 
             if self.current_order_id is None:
                 # Добавление нового заказа
-                self.db.insert_order(client_id, product_id, quantity, order_date)
-                messagebox.showinfo("Успех", "Заказ добавлен!")
-                self.clear_fields()
+                saved = self.tasks.insert_order(client_id, product_id, quantity, order_date)
+                on_saved = lambda new_id: self.on_order_changed(new_id, "Заказ добавлен!")
             else:
-                self.db.update_order(self.current_order_id, client_id, product_id, quantity, order_date)
-                messagebox.showinfo("Успех", "Заказ обновлён!")
-                self.clear_fields()
+                order_id = self.current_order_id
+                saved = self.tasks.update_order(order_id, client_id, product_id, quantity, order_date)
+                on_saved = lambda _: self.on_order_changed(order_id, "Заказ обновлён!")
+            self.clear_fields()
 
-            self.load_orders()
-            self.filter_orders()
+            deliver(self.window, saved, on_saved,
+                    lambda e: self.show_error(f"Не удалось сохранить заказ: {e}"))
         except Exception as e:
             messagebox.showerror("Ошибка", f"Не удалось сохранить заказ: {e}")
         finally:
             self.window.attributes("-topmost", True)
 
+    def on_order_changed(self, order_id, msg):
+        """
+        Завершает добавление, изменение или удаление заказа (в потоке Tk):
+        показывает уведомление и обновляет строку таблицы.
+        Args:
+            order_id (int): ID заказа.
+            msg (str): Текст уведомления.
+        """
+        self.window.attributes("-topmost", False)
+        messagebox.showinfo("Успех", msg)
+        self.window.attributes("-topmost", True)
+        self.apply_order_change(order_id)
+
+    def show_error(self, text):
+        """
+        Показывает сообщение об ошибке фоновой операции.
+        Args:
+            text (str): Текст сообщения.
+        """
+        self.window.attributes("-topmost", False)
+        messagebox.showerror("Ошибка", text)
+        self.window.attributes("-topmost", True)
+
     def delete_order(self):
         """
         Удаляет выбранный заказ после подтверждения.
         Если строка не выбрана — выводит предупреждение. При подтверждении удаляет
-        запись через `self.db.delete_order()` и обновляет таблицу.
+        запись в фоновом потоке (`AsyncDatabase.delete_order`) и обновляет таблицу.
         Raises:
             Показывает сообщение об ошибке при неудаче.
         """
@@ -985,51 +1507,82 @@ class OrdersWindow:
         order_id = item['values'][0]
 
         if messagebox.askyesno("Подтверждение", f"Удалить заказ ID {order_id}?"):
-            try:
-                self.db.delete_order(order_id)
-                messagebox.showinfo("Успех", "Заказ удалён.")
-                self.load_orders()
-                self.filter_orders()
-            except Exception as e:
-                messagebox.showerror("Ошибка", f"Не удалось удалить заказ: {e}")
+            deliver(self.window, self.tasks.delete_order(order_id),
+                    lambda _: self.on_order_changed(order_id, "Заказ удалён."),
+                    lambda e: self.show_error(f"Не удалось удалить заказ: {e}"))
         self.window.attributes("-topmost", True)
 
     def export_to_csv(self):
         """
-        Экспортирует список всех заказов в CSV-файл.
-        Открывает диалог сохранения. Если данных нет — уведомляет об этом.
-        В случае успеха — показывает имя сохранённого файла.
-        Raises:
-            Показывает сообщение об ошибке при проблеме с записью файла.
+        Экспортирует список заказов в CSV-файл (или CSV, сжатый gzip, если имя оканчивается на '.gz')
+        с текущими поиском, периодом и сортировкой — все строки из базы, а не только загруженные.
+        Файл пишется в фоновом потоке пачками; ход показывается в окне с кнопкой «Отмена».
+        В случае успеха — показывает количество строк и имя сохранённого файла.
         """
-        if not self.all_orders:
+        if not self.all_orders and not self.table.active:
             messagebox.showinfo("Экспорт", "Нет данных для экспорта.")
             return
 
         file_path = filedialog.asksaveasfilename(
             defaultextension=".csv",
-            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
+            filetypes=[("CSV files", "*.csv"), ("CSV gzip", "*.csv.gz"), ("All files", "*.*")],
             title="Сохранить как CSV"
         )
         if not file_path:
             return
 
-        try:
-            with open(file_path, mode='w', encoding='utf-8', newline='') as f:
-                writer = csv.writer(f)
-                writer.writerow(["ID", "Клиент", "Товар", "Кол-во", "Дата"])
-                writer.writerows(self.all_orders)
-            messagebox.showinfo("Успех", f"Данные экспортированы в {os.path.basename(file_path)}")
-        except Exception as e:
-            messagebox.showerror("Ошибка", f"Не удалось экспортировать: {e}")
+        def on_done(written):
+            messagebox.showinfo("Успех", f"Экспортировано строк: {written} в {os.path.basename(file_path)}")
+
+        def on_error(error):
+            if isinstance(error, ExportCancelled):
+                messagebox.showinfo("Экспорт", "Экспорт отменён.")
+            else:
+                self.show_error(f"Не удалось экспортировать: {error}")
+
+        order_by, descending = self.sort_order
+        header = ["ID", "Клиент", "Товар", "Кол-во", "Дата"]
+        start_export(self.window, self.tasks, "orders", header, file_path, on_done, on_error,
+                     term=self.search_var.get().strip(), order_by=order_by, descending=descending,
+                     date_range=self.date_range)
+
+    def import_from_file(self):
+        """
+        Импортирует заказы из CSV или JSON (в том числе сжатых gzip) в фоновом потоке.
+        Нужные столбцы: Клиент, Товар (по имени или client_id, product_id), Кол-во, Дата.
+        Некорректные записи не добавляются и попадают в отчёт рядом с файлом
+        (`importer.report_path_for`); по окончании показывает итог и обновляет список.
+        """
+        file_path = filedialog.askopenfilename(
+            filetypes=[("CSV и JSON", "*.csv *.json *.jsonl *.ndjson *.gz"), ("All files", "*.*")],
+            title="Импорт из файла"
+        )
+        if not file_path:
+            return
+
+        def on_done(result):
+            imported, rejected = result
+            text = f"Импортировано записей: {imported}."
+            if rejected:
+                text += f"\nОтклонено: {rejected}, см. {os.path.basename(report_path_for(file_path))}"
+            messagebox.showinfo("Импорт", text)
+            self.load_orders()
+
+        def on_error(error):
+            if isinstance(error, ImportCancelled):
+                messagebox.showinfo("Импорт", "Импорт отменён.")
+            else:
+                self.show_error(f"Не удалось импортировать: {error}")
+
+        start_import(self.window, self.tasks, "orders", file_path, on_done, on_error)
 
     def clear_fields(self):
         """
         Очищает все поля формы и сбрасывает режим редактирования.
         Устанавливает кнопку "Сохранить" и обнуляет `current_order_id`.
         """
-        self.client_combo.delete(0, tk.END)
-        self.product_combo.delete(0, tk.END)
+        self.client_picker.clear()
+        self.product_picker.clear()
         self.quantity_entry.delete(0, tk.END)
         self.order_date_entry.delete(0, tk.END)
         self.current_order_id = None
@@ -1043,18 +1596,24 @@ class StatsWindow:
     Графики отображаются встроенными в Tkinter с помощью Matplotlib.
     """
 
-    def __init__(self, window):
+    def __init__(self, window, db=None):
         """
         Инициализирует окно статистики.
         Создаёт интерфейс с кнопками выбора типа графика и областью для отображения графиков.
         Args:
             window (tk.Toplevel): Окно верхнего уровня для отображения интерфейса.
+            db (AsyncDatabase, optional): Асинхронный доступ к базе данных из общего пула.
+                Если не передан, окно открывает собственный пул соединений.
         """
         self.window = window
         self.window.title("Статистика")
         self.window.geometry("1000x600")
         self.window.attributes("-topmost", True)
-        self.db = Database()
+        self.tasks = db if db is not None else AsyncDatabase(ConnectionPool())
+        self.db = self.tasks.sync
+        self.layout_cache = LayoutCache.beside(self.tasks.pool.db_name)
+        # Раскладка графа считается в отдельном потоке, не занимая соединений пула
+        self.layouts = ThreadPoolExecutor(max_workers=1, thread_name_prefix="layout")
 
         frame = Frame(self.window, padx=10, pady=10)
         frame.pack(fill="both", expand=True)
@@ -1068,8 +1627,15 @@ class StatsWindow:
         btn_graph_clients_products = ttk.Button(button_frame, text="Граф связей", command=self.show_clients_products_graph)
         btn_exit = ttk.Button(button_frame, text="Выйти", command=self.window.destroy)
 
+        # Шаг динамики заказов: переключение перечитывает только сводную таблицу по дням
+        self.trend_steps = {"По дням": "day", "По неделям": "week", "По месяцам": "month", "По кварталам": "quarter"}
+        self.trend_step = ttk.Combobox(button_frame, values=list(self.trend_steps), state="readonly", width=14)
+        self.trend_step.set("По дням")
+        self.trend_step.bind("<<ComboboxSelected>>", lambda e: self.show_orders_trend())
+
         btn_top_clients.pack(side='left', padx=5)
         btn_orders_trend.pack(side='left', padx=5)
+        self.trend_step.pack(side='left', padx=5)
         btn_graph_clients_products.pack(side='left', padx=5)
         btn_exit.pack(side='left', padx=5)
 
@@ -1077,23 +1643,42 @@ class StatsWindow:
         self.chart_frame = ttk.LabelFrame(frame, text="Статистика")
         self.chart_frame.pack(fill='both', expand=True, padx=10, pady=10)
 
-        self.current_canvas = None  # Для хранения текущего холста
+        # По одной фигуре на вид графика, освобождаются при закрытии окна
+        self.charts = ChartManager(self.chart_frame)
+        self.window.bind("<Destroy>", self.on_destroy, add="+")
+
+    def on_destroy(self, event):
+        """
+        Освобождает фигуры графиков и останавливает поток раскладки при закрытии окна.
+        Args:
+            event (tk.Event): Событие уничтожения виджета (приходит и для дочерних виджетов).
+        """
+        if event.widget is self.window:
+            self.charts.close()
+            self.layouts.shutdown(wait=False, cancel_futures=True)
 
     def clear_chart(self):
         """
-        Удаляет текущий график из интерфейса, если он существует.
+        Убирает текущий график из интерфейса, если он показан.
         """
-        if self.current_canvas:
-            self.current_canvas.get_tk_widget().destroy()
-            self.current_canvas = None
+        self.charts.hide()
 
     def show_top_5_clients(self):
         """
         Отображает горизонтальную столбчатую диаграмму топ-5 клиентов по количеству заказов.
-        Получает данные из `self.db.top_5_client()` и строит график с помощью Matplotlib.
+        Данные запрашиваются в фоновом потоке (`AsyncDatabase.top_5_client`),
+        график строится с помощью Matplotlib в `draw_top_5_clients`.
+        """
+        deliver(self.window, self.tasks.top_5_client(), self.draw_top_5_clients,
+                lambda e: messagebox.showerror("Ошибка", f"Не удалось получить статистику: {e}"))
+
+    def draw_top_5_clients(self, results):
+        """
+        Строит диаграмму топ-5 клиентов (в потоке Tk).
+        Args:
+            results (list[tuple]): Строки (id, c_name, количество заказов).
         """
         self.clear_chart()
-        results = self.db.top_5_client()
 
         if not results:
             messagebox.showinfo("Статистика", "Нет данных для отображения.")
@@ -1102,7 +1687,8 @@ class StatsWindow:
         names = [row[1] for row in results]
         counts = [row[2] for row in results]
 
-        fig, ax = plt.subplots(figsize=(8, 4))
+        fig = self.charts.figure("top_clients", (8, 4))
+        ax = fig.add_subplot()
         bars = ax.barh(names, counts)
         ax.set_xlabel('Количество заказов')
         ax.set_title('Топ-5 клиентов по заказам')
@@ -1119,56 +1705,75 @@ class StatsWindow:
         # Увеличиваем левый отступ, чтобы имена клиентов не обрезались
         fig.subplots_adjust(left=0.2)
 
-        self.current_canvas = FigureCanvasTkAgg(fig, master=self.chart_frame)
-        self.current_canvas.draw()
-        self.current_canvas.get_tk_widget().pack(fill='both', expand=True)
+        self.charts.show("top_clients")
 
     def show_orders_trend(self):
         """
-        Отображает стилизованный линейный график динамики заказов по датам.
+        Отображает стилизованный линейный график динамики заказов с выбранным шагом.
         При наведении мыши на точку отображается количество заказов.
+        Данные группируются в SQL в фоновом потоке (`Database.order_trend`),
+        график строится в `draw_orders_trend`.
+        """
+        step = self.trend_step.get()
+        deliver(self.window, self.tasks.order_trend(self.trend_steps[step]),
+                lambda results: self.draw_orders_trend(results, step),
+                lambda e: messagebox.showerror("Ошибка", f"Не удалось получить статистику: {e}"))
+
+    def draw_orders_trend(self, results, step="По дням"):
+        """
+        Строит график динамики заказов (в потоке Tk).
+        Ряд длиннее ширины графика в пикселях прореживается алгоритмом LTTB (`lttb`),
+        маркеры точек рисуются, только если точек не больше `MARKER_LIMIT`.
+        Args:
+            results (list[tuple]): Строки (начало периода, количество заказов).
+            step (str): Название шага для заголовка.
         """
         self.clear_chart()
-        results = self.db.show_order_trend()
 
         if not results:
             messagebox.showinfo("Статистика", "Нет данных для отображения.")
             return
 
-        dates = [row[0] for row in results]
-        counts = [row[1] for row in results]
-
-        # Стиль
-        plt.style.use('seaborn-v0_8')
-        fig, ax = plt.subplots(figsize=(8, 5))
-
-        # Построение графика
-        line, = ax.plot(dates, counts, marker='o', linewidth=2.5, markersize=6,
-                        color='#1f77b4', markerfacecolor='#ffffff',
-                        markeredgecolor='#1f77b4', markeredgewidth=2)
-
-        # Добавляем сетку
-        ax.grid(True, linestyle='--', alpha=0.6, axis='y')
-        ax.set_xlabel('Дата заказа', fontsize=11, fontweight='bold', color='#333')
-        ax.set_ylabel('Количество заказов', fontsize=11, fontweight='bold', color='#333')
-        ax.set_title('Динамика заказов по датам', fontsize=14, fontweight='bold', pad=20, color='#2c3e50')
-
-        # Поворот меток
-        plt.setp(ax.get_xticklabels(), rotation=45, ha='right', fontsize=10, color='#555')
-
-        # Убираем лишние рамки
-        ax.spines['top'].set_visible(False)
-        ax.spines['right'].set_visible(False)
-        ax.spines['left'].set_color('#ccc')
-        ax.spines['bottom'].set_color('#ccc')
-
-        fig.tight_layout(pad=2.5)
+        periods = [date.fromisoformat(row[0]) for row in results]
+        values = [row[1] for row in results]
+        keep = lttb([period.toordinal() for period in periods], values, max(self.chart_frame.winfo_width(), 100))
+        dates = [periods[i] for i in keep]
+        counts = [values[i] for i in keep]
+        marker = 'o' if len(dates) <= MARKER_LIMIT else None
+
+        # Стиль применяется только к этому графику
+        fig = self.charts.figure("orders_trend", (8, 5))
+        with plt.style.context('seaborn-v0_8'):
+            ax = fig.add_subplot()
+
+            # Построение графика
+            line, = ax.plot(dates, counts, marker=marker, linewidth=2.5, markersize=6,
+                            color='#1f77b4', markerfacecolor='#ffffff',
+                            markeredgecolor='#1f77b4', markeredgewidth=2)
+
+            # Добавляем сетку
+            ax.grid(True, linestyle='--', alpha=0.6, axis='y')
+            ax.set_xlabel('Дата заказа' if step == "По дням" else 'Начало периода',
+                          fontsize=11, fontweight='bold', color='#333')
+            ax.set_ylabel('Количество заказов', fontsize=11, fontweight='bold', color='#333')
+            ax.set_title(f'Динамика заказов {step.lower()}', fontsize=14, fontweight='bold', pad=20, color='#2c3e50')
+
+            # Поворот меток
+            plt.setp(ax.get_xticklabels(), rotation=45, ha='right', fontsize=10, color='#555')
+
+            # Убираем лишние рамки
+            ax.spines['top'].set_visible(False)
+            ax.spines['right'].set_visible(False)
+            ax.spines['left'].set_color('#ccc')
+            ax.spines['bottom'].set_color('#ccc')
+
+            fig.tight_layout(pad=2.5)
 
         # === Логика подсказок при наведении ===
-        annot = ax.annotate("", xy=(0, 0), xytext=(10, 10), textcoords="offset points",
-                            bbox=dict(boxstyle="round", facecolor="wheat", alpha=0.9),
-                            fontsize=10, color="#333", zorder=100)
-        annot.set_visible(False)
+        # Подсказка перерисовывается блиттингом, без полной перерисовки графика
+        tooltip = BlitTooltip(ax, xytext=(10, 10), textcoords="offset points",
+                              bbox=dict(boxstyle="round", facecolor="wheat", alpha=0.9),
+                              fontsize=10, color="#333", zorder=100)
 
         def on_hover(event):
             if event.inaxes == ax:
@@ -1177,72 +1782,71 @@ class StatsWindow:
                     index = ind["ind"][0]  # индекс ближайшей точки
                     x = line.get_xdata()[index]
                     y = line.get_ydata()[index]
-                    annot.xy = (x, y)
-                    annot.set_text(f"Заказов: {int(y)}")
-                    annot.set_visible(True)
-                    fig.canvas.draw_idle()
-                else:
-                    if annot.get_visible():
-                        annot.set_visible(False)
-                        fig.canvas.draw_idle()
-            else:
-                if annot.get_visible():
-                    annot.set_visible(False)
-                    fig.canvas.draw_idle()
+                    tooltip.show((x, y), f"{x:%d.%m.%Y}\nЗаказов: {int(y)}")
+                    return
+            tooltip.hide()
 
-        # Привязка события
-        fig.canvas.mpl_connect("motion_notify_event", on_hover)
+        # Привязка событий
+        self.charts.connect("orders_trend", "draw_event", tooltip.on_draw)
+        self.charts.connect("orders_trend", "motion_notify_event", on_hover)
 
         # === Конец логики подсказок ===
 
-        self.current_canvas = FigureCanvasTkAgg(fig, master=self.chart_frame)
-        self.current_canvas.draw()
-        self.current_canvas.get_tk_widget().pack(fill='both', expand=True)
+        self.charts.show("orders_trend")
 
     def show_clients_products_graph(self):
         """
         Отображает стилизованный граф связей между клиентами и продуктами.
         Использует adjust_text для предотвращения наложения подписей.
+        Связи и отбор узлов с наибольшим числом связей выполняются в SQL на читателе
+        пула, раскладка считается (или берётся из дискового кэша) уже без соединения
+        с базой — в потоке `layouts`, чтобы не задерживать прокрутку списков.
+        Граф рисуется в `draw_clients_products_graph`.
         """
-        self.clear_chart()
-
         # Получаем ограничение
         limit_map = {"Все": None, "Топ-5": 5, "Топ-10": 10, "Топ-20": 20, "Топ-50": 50, "Топ-100": 100}
         selected = "Топ-50"
         limit = limit_map.get(selected)
 
-        edges = self.db.show_client_product_graph()
+        def failed(e):
+            messagebox.showerror("Ошибка", f"Не удалось получить статистику: {e}")
 
-        if not edges:
-            messagebox.showinfo("Граф", "Нет данных для построения графа.")
-            return
-
-        G_full = nx.Graph()
-        clients = set(row[0] for row in edges)
-        products = set(row[1] for row in edges)
+        def lay_out(subgraph):
+            deliver(self.window, self.layouts.submit(self.layout_clients_products_graph, subgraph),
+                    lambda result: self.draw_clients_products_graph(*result, selected), failed)
 
-        G_full.add_nodes_from(clients, type='client')
-        G_full.add_nodes_from(products, type='product')
-        G_full.add_edges_from(edges)
+        deliver(self.window, self.tasks.client_product_subgraph(limit), lay_out, failed)
 
-        if limit is not None:
-            # Считаем степень (количество связей) для каждого узла
-            node_degrees = sorted(G_full.degree(), key=lambda x: x[1], reverse=True)
-            top_nodes = {node for node, deg in node_degrees[:limit]}
+    def layout_clients_products_graph(self, subgraph):
+        """
+        Строит граф связей из отобранных в SQL узлов и вычисляет его раскладку (в потоке `layouts`).
+        Args:
+            subgraph (tuple[list, list]): Результат `Database.client_product_subgraph`.
+        Returns:
+            tuple[nx.Graph, dict]: Граф и координаты его узлов.
+        """
+        G = build_client_product_graph(subgraph)
+        return G, compute_layout(G, self.layout_cache)
 
-            # Оставляем только топовые узлы и рёбра между ними
-            G = G_full.subgraph(top_nodes).copy()
-        else:
-            G = G_full  # Все узлы
+    def draw_clients_products_graph(self, G, pos, selected):
+        """
+        Рисует граф связей клиентов и товаров (в потоке Tk).
+        В граф попадают только узлы, которые будут нарисованы, поэтому его размер
+        не зависит от количества заказов. Подписываются только узлы с наибольшим
+        числом связей (`label_nodes`).
+        Args:
+            G (nx.Graph): Граф из `build_client_product_graph`.
+            pos (dict): Координаты узлов.
+            selected (str): Название выбранного ограничения для заголовка.
+        """
+        self.clear_chart()
 
-        if len(G.nodes) == 0:
-            messagebox.showinfo("Граф", "Нет узлов для отображения после фильтрации.")
+        if len(G) == 0:
+            messagebox.showinfo("Граф", "Нет данных для построения графа.")
             return
 
-        # === Раскладка ===
-        pos = nx.kamada_kawai_layout(G) if len(G.nodes) > 1 else nx.spring_layout(G)
-
-        fig, ax = plt.subplots(figsize=(10, 7))
+        fig = self.charts.figure("clients_products_graph", (10, 7))
+        ax = fig.add_subplot()
         ax.set_facecolor('#f9f9f9')
 
         node_size = 300
@@ -1274,19 +1878,20 @@ class StatsWindow:
                                    alpha=0.9,
                                    ax=ax)
 
-        # Рёбра
+        # Рёбра: толщина зависит от количества заказов по связи
         if len(G.edges) > 0:
+            max_weight = max(weight for _, _, weight in G.edges(data="weight"))
             nx.draw_networkx_edges(G, pos,
-                                   width=1.0,
+                                   width=[0.5 + 2.5 * weight / max_weight for _, _, weight in G.edges(data="weight")],
                                    alpha=0.5,
                                    edge_color='#555555',
                                    ax=ax)
 
         # Подписи — через adjust_text
         texts = []
-        for node in G.nodes():
+        for node in label_nodes(G):
             x, y = pos[node]
-            text = ax.text(x, y, node, fontsize=9, ha='center', va='center', wrap=True)
+            text = ax.text(x, y, G.nodes[node]["label"], fontsize=9, ha='center', va='center', wrap=True)
             texts.append(text)
 
         if texts:
@@ -1314,7 +1919,5 @@ class StatsWindow:
         fig.tight_layout()
 
         # Встраиваем в Tkinter
-        self.current_canvas = FigureCanvasTkAgg(fig, master=self.chart_frame)
-        self.current_canvas.draw()
-        self.current_canvas.get_tk_widget().pack(fill='both', expand=True)
+        self.charts.show("clients_products_graph")
 
@@ -0,0 +1,450 @@
+import csv
+import gzip
+import json
+import os
+import re
+from datetime import datetime
+from itertools import compress, islice
+from operator import itemgetter
+import numpy as np
+from models import VALID, Client, Order, Product
+
+# Сколько записей проверяется и записывается в базу за один шаг.
+IMPORT_BATCH_SIZE = 10_000
+# Сколько символов JSON читается из файла за раз.
+JSON_READ_SIZE = 1 << 16
+# Отчёт об отклонённых записях пишется рядом с файлом: `<файл>.rejected.csv`.
+REPORT_SUFFIX = ".rejected.csv"
+# Форматы даты заказа, которые разбирает `db.ORDER_DAY_SQL`; при импорте дата приводится к первому.
+ORDER_DATE_FORMATS = ("%Y-%m-%d", "%d.%m.%Y")
+
+# Поля импорта: ключ списка -> (таблица, {поле: допустимые имена столбцов CSV или ключей JSON}).
+# Среди имён — заголовки файлов, которые создаёт экспорт окон.
+# Заказ ссылается на клиента и товар по ID (client_id, product_id) или по имени:
+# целое число и строка из цифр считаются ID.
+IMPORT_FIELDS = {
+    "clients": ("Clients", {
+        "c_name": ("c_name", "name", "Имя"),
+        "email": ("email", "Email"),
+        "phone": ("phone", "Телефон"),
+        "address": ("address", "Адрес"),
+    }),
+    "products": ("Products", {
+        "p_name": ("p_name", "name", "Наименование"),
+        "price": ("price", "Цена"),
+        "stock": ("stock", "Количество"),
+    }),
+    "orders": ("Orders", {
+        "client": ("client_id", "client", "c_name", "Клиент"),
+        "product": ("product_id", "product", "p_name", "Товар"),
+        "quantity": ("quantity", "Кол-во"),
+        "order_date": ("order_date", "date", "Дата"),
+    }),
+}
+
+
+_JSON_SEPARATORS = re.compile(r"[\s,]*")
+
+
+class ImportCancelled(Exception):
+    """
+    Импорт отменён пользователем; база и отчёт остались без изменений.
+    """
+
+
+def report_path_for(path: str) -> str:
+    """
+    Returns:
+        str: Путь к отчёту об отклонённых записях для импортируемого файла.
+    """
+    return path + REPORT_SUFFIX
+
+
+def _open_text(path: str):
+    """
+    Открывает текстовый файл в UTF-8 (с BOM или без), '.gz' — через gzip.
+    Returns:
+        TextIO: Открытый файл.
+    """
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8-sig", newline="")
+    return open(path, encoding="utf-8-sig", newline="")
+
+
+def _is_json(path: str) -> bool:
+    """
+    Returns:
+        bool: True для файлов .json, .jsonl и .ndjson (в том числе сжатых gzip).
+    """
+    name = path[:-3] if path.endswith(".gz") else path
+    return name.lower().endswith((".json", ".jsonl", ".ndjson"))
+
+
+def read_csv_records(f, kind: str):
+    """
+    Построчно читает CSV с заголовком и выбирает из строк поля импорта.
+    Args:
+        f (TextIO): Открытый файл.
+        kind (str): Ключ `IMPORT_FIELDS`.
+    Yields:
+        tuple: (номер строки файла, значения полей, исходная строка).
+    Raises:
+        ValueError: Если в заголовке нет обязательных столбцов.
+    """
+    fields = IMPORT_FIELDS[kind][1]
+    reader = csv.reader(f)
+    header = [name.strip() for name in next(reader, [])]
+    positions = {}
+    for field, names in fields.items():
+        positions[field] = next((header.index(name) for name in names if name in header), None)
+    missing = [" или ".join(fields[field]) for field, i in positions.items() if i is None]
+    if missing:
+        raise ValueError(f"В файле нет столбцов: {', '.join(missing)}")
+
+    width = len(header)
+    # Отсутствующее в файле поле берётся из None, добавленного в конец строки
+    pick = itemgetter(*(width if i is None else i for i in positions.values()))
+    complete = None not in positions.values()
+    for row in reader:
+        if len(row) != width:
+            if not row:
+                continue
+            row = (row + [None] * width)[:width]  # Строка короче или длиннее заголовка
+        values = pick(row) if complete else pick((*row, None))
+        yield reader.line_num, values, row
+
+
+def _json_values(f):
+    """
+    Потоково читает JSON: массив записей или записи подряд (JSON Lines),
+    не загружая файл целиком.
+    Args:
+        f (TextIO): Открытый файл.
+    Yields:
+        object: Очередная запись.
+    Raises:
+        ValueError: Если файл не является корректным JSON.
+    """
+    decoder = json.JSONDecoder()
+    buffer, pos = f.read(JSON_READ_SIZE).lstrip(), 0
+    in_array = buffer.startswith("[")
+    if in_array:
+        pos = 1
+    while True:
+        pos = _JSON_SEPARATORS.match(buffer, pos).end()
+        if pos == len(buffer) or (in_array and buffer[pos] == "]"):
+            more = "" if pos < len(buffer) else f.read(JSON_READ_SIZE)
+            if not more:
+                return
+            buffer, pos = buffer[pos:] + more, 0
+            continue
+        try:
+            value, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError as e:
+            # Запись могла оборваться на границе прочитанного блока
+            more = f.read(JSON_READ_SIZE)
+            if not more:
+                raise ValueError(f"Некорректный JSON: {e}") from e
+            buffer, pos = buffer[pos:] + more, 0
+            continue
+        yield value
+        pos = end
+        if pos > JSON_READ_SIZE:
+            buffer, pos = buffer[pos:], 0
+
+
+def read_json_records(f, kind: str):
+    """
+    Потоково читает записи JSON (объекты) и выбирает из них поля импорта.
+    Записи нумеруются с единицы.
+    Args:
+        f (TextIO): Открытый файл.
+        kind (str): Ключ `IMPORT_FIELDS`.
+    Yields:
+        tuple: (номер записи, значения полей или None, если запись не объект, исходная запись).
+    """
+    fields = IMPORT_FIELDS[kind][1]
+    getters = {}  # Набор ключей записи -> функция выбора полей
+    for number, record in enumerate(_json_values(f), start=1):
+        if not isinstance(record, dict):
+            yield number, None, record
+            continue
+        keys = tuple(record)
+        pick = getters.get(keys)
+        if pick is None:
+            names = [next((name for name in names if name in record), None) for names in fields.values()]
+            pick = getters[keys] = lambda record, names=names: tuple(
+                None if name is None else record[name] for name in names)
+        yield number, pick(record), record
+
+
+def read_records(path: str, kind: str):
+    """
+    Потоково читает записи CSV или JSON (по расширению файла, '.gz' — сжатые).
+    Args:
+        path (str): Путь к файлу.
+        kind (str): Ключ `IMPORT_FIELDS`.
+    Yields:
+        tuple: (номер строки или записи, значения полей, исходная запись).
+    """
+    with _open_text(path) as f:
+        yield from (read_json_records if _is_json(path) else read_csv_records)(f, kind)
+
+
+def _number(value, kind: type):
+    """
+    Преобразует строку из CSV в число; значения других типов и нечисловые строки
+    возвращает как есть, чтобы их отклонила проверка модели.
+    Args:
+        value: Значение поля.
+        kind (type): int или float.
+    Returns:
+        Число или исходное значение.
+    """
+    if isinstance(value, str):
+        try:
+            return kind(value.strip())
+        except ValueError:
+            return value
+    return value
+
+
+def _order_day(value) -> str | None:
+    """
+    Приводит дату заказа к виду ГГГГ-ММ-ДД, чтобы заказ попал в динамику и отбор по периоду.
+    Args:
+        value: Значение поля.
+    Returns:
+        str | None: Дата ГГГГ-ММ-ДД или None, если значение не дата в одном из `ORDER_DATE_FORMATS`.
+    """
+    if not isinstance(value, str):
+        return None
+    for date_format in ORDER_DATE_FORMATS:
+        try:
+            return datetime.strptime(value.strip(), date_format).date().isoformat()
+        except ValueError:
+            continue
+    return None
+
+
+class References:
+    """
+    Словари для поиска клиентов и товаров, на которые ссылаются импортируемые заказы.
+    Ключи словаря — ID (числом и строкой) и имена, значения — ID; имя, которое носят
+    несколько записей, неоднозначно (значение None). Читаются из базы один раз на весь импорт.
+    """
+
+    def __init__(self, db):
+        """
+        Args:
+            db (Database): Соединение с базой.
+        """
+        self.clients = self._load(db.get_clients())
+        self.products = self._load(db.get_products())
+
+    @staticmethod
+    def _load(rows) -> dict:
+        """
+        Args:
+            rows (list[tuple]): Пары (id, имя).
+        Returns:
+            dict: ID, строка ID или имя -> ID (None — имя неоднозначно).
+        """
+        lookup = {}
+        for row_id, name in rows:
+            lookup[name] = None if name in lookup else row_id
+        for row_id, _ in rows:
+            lookup[row_id] = lookup[str(row_id)] = row_id
+        return lookup
+
+    @staticmethod
+    def resolve(lookup: dict, value, what: str) -> int:
+        """
+        Находит ID клиента или товара по ID или имени.
+        Args:
+            lookup (dict): `clients` или `products`.
+            value: Значение поля ссылки.
+            what (str): 'клиент' или 'товар' для текста ошибки.
+        Returns:
+            int: ID записи.
+        Raises:
+            ValueError: Если запись не найдена или имя неоднозначно.
+        """
+        row_id = lookup.get(value)
+        if row_id is not None:
+            return row_id
+        if value is None or value == "":
+            raise ValueError(f"Не указан {what}")
+        if value in lookup:
+            raise ValueError(f"Неоднозначное имя: {what} '{value}' встречается несколько раз")
+        raise ValueError(f"Не найден {what} '{value}'")
+
+
+def _split(batch: list, rows: list, codes: np.ndarray, model) -> tuple[list, list]:
+    """
+    Делит пачку по кодам пакетной проверки модели на строки для вставки и отклонённые записи.
+    Args:
+        batch (list): Записи (номер, значения, исходная запись).
+        rows (list): Проверенные значения записей.
+        codes (np.ndarray): Коды ошибок `models.BatchValidation.validate_batch`.
+        model (type): Класс модели для текстов ошибок.
+    Returns:
+        tuple[list, list]: Строки для вставки и отклонённые записи (номер, ошибка, исходная запись).
+    """
+    if not codes.any():
+        return rows, []
+    rejected = []
+    for i in np.flatnonzero(codes):
+        code = int(codes[i])
+        field = model.FIELDS.index(model.ERRORS[code][0])
+        rejected.append((batch[i][0], model.message(code, rows[i][field]), batch[i][2]))
+    return list(compress(rows, codes == VALID)), rejected
+
+
+def validate_clients(batch: list, references=None) -> tuple[list, list]:
+    """
+    Проверяет пачку клиентов правилами `models.Client` (пакетно, по столбцам).
+    Args:
+        batch (list): Записи (номер, значения, исходная запись).
+        references: Не используется.
+    Returns:
+        tuple[list, list]: Строки для вставки и отклонённые записи (номер, ошибка, исходная запись).
+    """
+    rows = [values for _, values, _ in batch]
+    if not rows:
+        return [], []
+    return _split(batch, rows, Client.validate_batch(*zip(*rows)), Client)
+
+
+def validate_products(batch: list, references=None) -> tuple[list, list]:
+    """
+    Проверяет пачку товаров правилами `models.Product`; цена и количество из CSV
+    предварительно преобразуются в числа.
+    Args:
+        batch (list): Записи (номер, значения, исходная запись).
+        references: Не используется.
+    Returns:
+        tuple[list, list]: Строки для вставки и отклонённые записи.
+    """
+    if not batch:
+        return [], []
+    names, prices, stocks = zip(*(values for _, values, _ in batch))
+    prices = [_number(price, float) for price in prices]
+    stocks = [_number(stock, int) for stock in stocks]
+    rows = list(zip(names, prices, stocks))
+    return _split(batch, rows, Product.validate_batch(names, prices, stocks), Product)
+
+
+def validate_orders(batch: list, references: References) -> tuple[list, list]:
+    """
+    Проверяет пачку заказов правилами `models.Order`, предварительно находя
+    клиента и товар в `references`. Дата заказа обязательна и сохраняется
+    в виде ГГГГ-ММ-ДД; дата в другом формате отклоняется.
+    Args:
+        batch (list): Записи (номер, значения, исходная запись).
+        references (References): Словари клиентов и товаров.
+    Returns:
+        tuple[list, list]: Строки для вставки и отклонённые записи.
+    """
+    if not batch:
+        return [], []
+    clients, products, quantities, dates = zip(*(values for _, values, _ in batch))
+    client_ids = [references.clients.get(client) for client in clients]
+    product_ids = [references.products.get(product) for product in products]
+    quantities = [_number(quantity, int) for quantity in quantities]
+    days = [_order_day(date) for date in dates]
+    rows = list(zip(client_ids, product_ids, quantities, days))
+    codes = Order.validate_batch(client_ids, product_ids, quantities, days)
+    # Ненайденная ссылка проверяется раньше модели, пустая или неразборчивая дата — после
+    codes[[client_id is None or product_id is None for client_id, product_id, _, _ in rows]] = -1
+    codes[(codes == VALID) & [day is None for day in days]] = -2
+    if not codes.any():
+        return rows, []
+    accepted, rejected = [], []
+    for i, (row, code) in enumerate(zip(rows, codes)):
+        if code == VALID:
+            accepted.append(row)
+            continue
+        number, _, raw = batch[i]
+        if code == -1:
+            try:
+                References.resolve(references.clients, clients[i], "клиент")
+                References.resolve(references.products, products[i], "товар")
+            except ValueError as e:
+                rejected.append((number, str(e), raw))
+        elif code == -2 and not (isinstance(dates[i], str) and dates[i].strip()):
+            rejected.append((number, "Дата заказа не может быть пустой.", raw))
+        elif code == -2:
+            rejected.append((number, f"Дата заказа должна быть в формате ГГГГ-ММ-ДД или ДД.ММ.ГГГГ: {dates[i]}", raw))
+        else:
+            rejected.append((number, Order.message(int(code), row[Order.FIELDS.index(Order.ERRORS[code][0])]), raw))
+    return accepted, rejected
+
+
+VALIDATORS = {"clients": validate_clients, "products": validate_products, "orders": validate_orders}
+
+
+def import_file(db, kind: str, path: str, report_path: str = None, batch_size: int = IMPORT_BATCH_SIZE,
+                progress=None, cancel=None) -> tuple[int, int]:
+    """
+    Импортирует клиентов, товары или заказы из CSV или JSON.
+    Файл читается потоково; записи пачками проверяются правилами моделей
+    и вставляются через `executemany` в одной транзакции `Database.bulk_load`.
+    Отклонённые записи попадают в отчёт CSV (номер строки, ошибка, запись в JSON),
+    остальные импортируются. Столбец ID файла не используется: записи получают новые ID.
+    Предназначена для `AsyncDatabase.submit`.
+    Args:
+        db (Database): Соединение с базой (в фоне — соединение писателя).
+        kind (str): 'clients', 'products' или 'orders'.
+        path (str): Путь к файлу: .csv, .json, .jsonl или .ndjson, можно со сжатием '.gz'.
+        report_path (str, optional): Путь к отчёту; по умолчанию — `report_path_for(path)`.
+        batch_size (int): Количество записей в пачке.
+        progress (callable, optional): Функция (processed, total) -> None; total неизвестен (None).
+        cancel (threading.Event, optional): Событие отмены, проверяется между пачками.
+    Returns:
+        tuple[int, int]: Количество импортированных и отклонённых записей.
+    Raises:
+        ValueError: Если в CSV нет обязательных столбцов или JSON повреждён.
+        ImportCancelled: Если импорт отменён; база и отчёт не изменяются.
+    """
+    table = IMPORT_FIELDS[kind][0]
+    validate = VALIDATORS[kind]
+    references = References(db) if kind == "orders" else None
+    report_path = report_path or report_path_for(path)
+    part = f"{report_path}.part"
+    imported = rejected = processed = 0
+    records = read_records(path, kind)
+    try:
+        with open(part, "w", encoding="utf-8", newline="") as report_file:
+            report = csv.writer(report_file)
+            report.writerow(["Строка", "Ошибка", "Данные"])
+            with db.bulk_load(table) as write:
+                while True:
+                    if cancel is not None and cancel.is_set():
+                        raise ImportCancelled()
+                    batch = list(islice(records, batch_size))
+                    if not batch:
+                        break
+                    # Записи, которые не являются объектом JSON, отклоняются до проверки полей
+                    invalid = [(number, "Запись должна быть объектом", raw)
+                               for number, values, raw in batch if values is None]
+                    if invalid:
+                        batch = [record for record in batch if record[1] is not None]
+                    rows, rejects = validate(batch, references)
+                    rejects = invalid + rejects
+                    write(rows)
+                    report.writerows((number, error, json.dumps(raw, ensure_ascii=False))
+                                     for number, error, raw in sorted(rejects, key=itemgetter(0)))
+                    imported += len(rows)
+                    rejected += len(rejects)
+                    processed += len(rows) + len(rejects)
+                    if progress is not None:
+                        progress(processed, None)
+        os.replace(part, report_path)
+    except BaseException:
+        if os.path.exists(part):
+            os.remove(part)
+        raise
+    finally:
+        records.close()
+    return imported, rejected
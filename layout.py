@@ -0,0 +1,294 @@
+import hashlib
+import heapq
+import logging
+import os
+import tempfile
+
+import networkx as nx
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Каталог дискового кэша раскладок графа связей (рядом с файлом базы).
+LAYOUT_CACHE_DIR = "layout_cache"
+# Сколько последних раскладок хранится на диске; более старые удаляются при записи.
+LAYOUT_CACHE_LIMIT = 50
+# До этого количества узлов граф раскладывается в две колонки: клиенты и товары.
+BIPARTITE_LIMIT = 30
+# До этого количества узлов используется spring-раскладка networkx, дальше — векторная на NumPy.
+SPRING_LIMIT = 300
+# Число итераций силовых раскладок.
+LAYOUT_ITERATIONS = 50
+# Сколько узлов с наибольшей степенью получают подписи.
+LABEL_LIMIT = 30
+# Со сколькими случайными узлами считается отталкивание на каждой итерации NumPy-раскладки.
+REPULSION_SAMPLE = 256
+# Сколько узлов обрабатывается за один шаг NumPy-раскладки (ограничивает память).
+FORCE_CHUNK = 4096
+
+
+def build_client_product_graph(subgraph: tuple[list, list]) -> nx.Graph:
+    """
+    Строит граф связей клиентов и товаров из результата `Database.client_product_subgraph`.
+    Узлы — пары (тип, ID), чтобы одноимённые клиенты и товары не сливались.
+    Args:
+        subgraph (tuple[list, list]): Узлы (kind, id, name, degree) и связи (client_id, product_id, weight).
+    Returns:
+        nx.Graph: Граф с атрибутами узлов type, label, degree и атрибутом связей weight.
+    """
+    nodes, edges = subgraph
+    graph = nx.Graph()
+    for kind, node_id, name, degree in nodes:
+        graph.add_node((kind, node_id), type=kind, label=name, degree=degree)
+    graph.add_edges_from((("client", client_id), ("product", product_id), {"weight": weight})
+                         for client_id, product_id, weight in edges)
+    return graph
+
+
+def choose_algorithm(size: int) -> str:
+    """
+    Выбирает алгоритм раскладки по количеству узлов.
+    Args:
+        size (int): Количество узлов графа.
+    Returns:
+        str: 'bipartite', 'spring' или 'force'.
+    """
+    if size <= BIPARTITE_LIMIT:
+        return "bipartite"
+    if size <= SPRING_LIMIT:
+        return "spring"
+    return "force"
+
+
+def graph_hash(graph: nx.Graph, algorithm: str) -> str:
+    """
+    Вычисляет ключ раскладки: не зависит от порядка добавления узлов и связей,
+    но меняется при изменении их состава или алгоритма.
+    Args:
+        graph (nx.Graph): Граф.
+        algorithm (str): Алгоритм раскладки.
+    Returns:
+        str: Шестнадцатеричный SHA-1.
+    """
+    digest = hashlib.sha1(f"{algorithm}:{LAYOUT_ITERATIONS}".encode())
+    for node in sorted(graph, key=repr):
+        digest.update(b"n" + repr(node).encode())
+    for edge in sorted((sorted(map(repr, edge)) for edge in graph.edges()), key=tuple):
+        digest.update(b"e" + "\x00".join(edge).encode())
+    return digest.hexdigest()
+
+
+def bipartite_layout(graph: nx.Graph) -> dict:
+    """
+    Раскладывает граф в две колонки: клиенты слева, товары справа.
+    Args:
+        graph (nx.Graph): Граф с атрибутом узлов type.
+    Returns:
+        dict: Координаты узлов.
+    """
+    clients = [node for node, kind in graph.nodes(data="type") if kind == "client"]
+    if not clients or len(clients) == len(graph):
+        return spring_layout(graph)
+    return nx.bipartite_layout(graph, clients)
+
+
+def spring_layout(graph: nx.Graph) -> dict:
+    """
+    Раскладка networkx с фиксированным числом итераций и начальным значением
+    генератора, чтобы один и тот же граф всегда выглядел одинаково.
+    Args:
+        graph (nx.Graph): Граф.
+    Returns:
+        dict: Координаты узлов.
+    """
+    return nx.spring_layout(graph, iterations=LAYOUT_ITERATIONS, seed=0)
+
+
+def force_layout(graph: nx.Graph, iterations: int = LAYOUT_ITERATIONS, seed: int = 0) -> dict:
+    """
+    Силовая раскладка Фрюхтермана — Рейнгольда на массивах NumPy для больших графов.
+    Отталкивание на каждой итерации считается не со всеми узлами, а со случайной
+    выборкой из `REPULSION_SAMPLE` узлов, поэтому итерация стоит O(n) по времени,
+    а память ограничена блоками по `FORCE_CHUNK` узлов.
+    Args:
+        graph (nx.Graph): Граф.
+        iterations (int): Количество итераций.
+        seed (int): Начальное значение генератора случайных чисел.
+    Returns:
+        dict: Координаты узлов в квадрате [-1, 1].
+    """
+    nodes = list(graph)
+    size = len(nodes)
+    rng = np.random.default_rng(seed)
+    pos = rng.random((size, 2))
+    if size < 2:
+        return dict(zip(nodes, pos))
+
+    index = {node: i for i, node in enumerate(nodes)}
+    edges = np.array([(index[u], index[v]) for u, v in graph.edges()], dtype=np.intp).reshape(-1, 2)
+    distance = 1 / np.sqrt(size)
+    temperature = 0.1
+    cooling = temperature / (iterations + 1)
+    sample = min(size, REPULSION_SAMPLE)
+
+    for _ in range(iterations):
+        others = pos[rng.choice(size, sample, replace=False)] if sample < size else pos.copy()
+        others_norm = (others ** 2).sum(axis=1)
+        shift = np.empty_like(pos)
+        for start in range(0, size, FORCE_CHUNK):
+            chunk = pos[start:start + FORCE_CHUNK]
+            # |a - b|² = |a|² + |b|² - 2ab, суммы сил — матричным умножением вместо массива n×m×2
+            squared = (chunk ** 2).sum(axis=1)[:, None] + others_norm[None, :] - 2 * chunk @ others.T
+            force = distance ** 2 / np.maximum(squared, 1e-6)
+            shift[start:start + FORCE_CHUNK] = chunk * force.sum(axis=1)[:, None] - force @ others
+        shift *= size / sample
+
+        if len(edges):
+            delta = pos[edges[:, 0]] - pos[edges[:, 1]]
+            attraction = delta * (np.linalg.norm(delta, axis=1) / distance)[:, None]
+            np.add.at(shift, edges[:, 0], -attraction)
+            np.add.at(shift, edges[:, 1], attraction)
+
+        length = np.maximum(np.linalg.norm(shift, axis=1), 1e-9)
+        pos += shift * (np.minimum(length, temperature) / length)[:, None]
+        temperature -= cooling
+
+    return dict(zip(nodes, nx.rescale_layout(pos)))
+
+
+LAYOUTS = {"bipartite": bipartite_layout, "spring": spring_layout, "force": force_layout}
+
+
+class LayoutCache:
+    """
+    Дисковый кэш раскладок графа: координаты сохраняются в файл `<ключ>.npy`,
+    где ключ — `graph_hash`. Порядок строк соответствует узлам, отсортированным по `repr`.
+    Хранится не больше `limit` раскладок: при записи удаляются давно не использованные
+    (время изменения файла обновляется и при чтении).
+    """
+
+    def __init__(self, directory: str, limit: int = LAYOUT_CACHE_LIMIT):
+        """
+        Args:
+            directory (str): Каталог кэша; создаётся при первой записи.
+            limit (int): Наибольшее количество раскладок на диске.
+        """
+        self.directory = directory
+        self.limit = limit
+
+    @classmethod
+    def beside(cls, db_name: str, limit: int = LAYOUT_CACHE_LIMIT) -> "LayoutCache":
+        """
+        Создаёт кэш в каталоге `LAYOUT_CACHE_DIR` рядом с файлом базы, а не
+        в текущем рабочем каталоге.
+        Args:
+            db_name (str): Путь к файлу базы данных.
+            limit (int): Наибольшее количество раскладок на диске.
+        Returns:
+            LayoutCache: Кэш раскладок этой базы.
+        """
+        return cls(os.path.join(os.path.dirname(os.path.abspath(db_name)), LAYOUT_CACHE_DIR), limit)
+
+    def _path(self, key: str) -> str:
+        """
+        Returns:
+            str: Путь к файлу раскладки.
+        """
+        return os.path.join(self.directory, f"{key}.npy")
+
+    def get(self, key: str, nodes: list):
+        """
+        Читает раскладку из кэша.
+        Args:
+            key (str): Ключ раскладки.
+            nodes (list): Узлы графа, отсортированные по `repr`.
+        Returns:
+            dict | None: Координаты узлов или None, если раскладки нет или файл повреждён.
+        """
+        try:
+            coords = np.load(self._path(key))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("Не удалось прочитать раскладку %s: %s", key, e)
+            return None
+        if coords.shape != (len(nodes), 2):
+            return None
+        try:
+            os.utime(self._path(key))
+        except OSError:
+            pass
+        return dict(zip(nodes, coords))
+
+    def put(self, key: str, nodes: list, pos: dict) -> None:
+        """
+        Сохраняет раскладку и удаляет лишние старые. Запись атомарна: файл сначала
+        пишется во временный, затем переименовывается.
+        Args:
+            key (str): Ключ раскладки.
+            nodes (list): Узлы графа, отсортированные по `repr`.
+            pos (dict): Координаты узлов.
+        """
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, np.array([pos[node] for node in nodes], dtype=float).reshape(-1, 2))
+            os.replace(tmp, self._path(key))
+        except OSError as e:
+            logger.warning("Не удалось сохранить раскладку %s: %s", key, e)
+            return
+        self.prune()
+
+    def prune(self) -> None:
+        """
+        Оставляет в каталоге `limit` последних по времени изменения раскладок.
+        """
+        try:
+            entries = [entry for entry in os.scandir(self.directory)
+                       if entry.is_file() and entry.name.endswith(".npy")]
+        except OSError:
+            return
+        entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+        for entry in entries[self.limit:]:
+            try:
+                os.remove(entry.path)
+            except OSError as e:
+                logger.warning("Не удалось удалить раскладку %s: %s", entry.name, e)
+
+
+def compute_layout(graph: nx.Graph, cache: LayoutCache = None) -> dict:
+    """
+    Вычисляет раскладку графа алгоритмом, подходящим по размеру, или берёт её из кэша.
+    Args:
+        graph (nx.Graph): Граф.
+        cache (LayoutCache, optional): Дисковый кэш раскладок.
+    Returns:
+        dict: Координаты узлов.
+    """
+    if len(graph) == 0:
+        return {}
+    algorithm = choose_algorithm(len(graph))
+    nodes = sorted(graph, key=repr)
+    key = graph_hash(graph, algorithm)
+    if cache is not None:
+        pos = cache.get(key, nodes)
+        if pos is not None:
+            return pos
+    pos = LAYOUTS[algorithm](graph)
+    if cache is not None:
+        cache.put(key, nodes, pos)
+    return pos
+
+
+def label_nodes(graph: nx.Graph, limit: int = LABEL_LIMIT) -> list:
+    """
+    Отбирает узлы для подписей: остальные подписи на большом графе всё равно
+    накладываются друг на друга и только замедляют `adjust_text`.
+    Args:
+        graph (nx.Graph): Граф.
+        limit (int): Наибольшее количество подписей.
+    Returns:
+        list: Узлы с наибольшей степенью, по убыванию степени.
+    """
+    return [node for node, _ in heapq.nlargest(limit, graph.degree(), key=lambda item: item[1])]
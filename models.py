@@ -1,12 +1,213 @@
 import re
+from itertools import islice
+from numbers import Integral, Real
+from typing import Iterable
+import numpy as np
 
-class Client:
+# Регулярные выражения проверки клиента компилируются один раз при импорте модуля.
+EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+PHONE_RE = re.compile(r'^(\+7|8)\d{10}$')
+
+# Код пакетной проверки для корректной записи; остальные коды — ключи `ERRORS` моделей.
+VALID = 0
+
+# Сколько строк преобразуется в столбцы за один шаг при сборке и обходе `RowBatch`.
+BATCH_CHUNK_SIZE = 10_000
+# Типы Python, которые числовой столбец `RowBatch` принимает без потерь (по `dtype.kind`).
+EXACT_TYPES = {"i": {int}, "f": {int, float}}
+
+# `bool(value)` для каждого элемента массива объектов.
+_BOOL = np.frompyfunc(bool, 1, 1)
+
+
+def _column(values) -> np.ndarray:
+    """
+    Приводит столбец (список, кортеж, массив NumPy или pandas.Series) к массиву NumPy.
+    Числовые массивы сохраняют тип, остальное становится массивом объектов без
+    преобразования значений (например, строки '5' не превращаются в числа).
+    Args:
+        values: Значения столбца.
+    Returns:
+        np.ndarray: Одномерный массив.
+    """
+    if hasattr(values, "to_numpy"):
+        values = values.to_numpy()
+    if isinstance(values, np.ndarray):
+        return values
+    column = np.empty(len(values), dtype=object)
+    column[:] = list(values)
+    return column
+
+
+def _truthy(column: np.ndarray) -> np.ndarray:
+    """
+    Returns:
+        np.ndarray: Маска значений, истинных в смысле `bool(value)` (непустая строка, не None).
+    """
+    if column.dtype.kind == "O":
+        return _BOOL(column).astype(bool)
+    if column.dtype.kind in "US":
+        return np.char.str_len(column) > 0
+    return column.astype(bool)
+
+
+def _instances(column: np.ndarray, types: tuple, kinds: str) -> np.ndarray:
+    """
+    Проверяет тип значений столбца так же, как конструкторы моделей. Для числовых
+    массивов решает тип массива (`kinds` — допустимые `dtype.kind`; их элементы —
+    числа NumPy, которые конструкторы принимают как `Integral`/`Real`, а `np.bool_` —
+    нет), для массивов объектов — `isinstance`, который вычисляется один раз
+    для каждого встретившегося типа.
+    Args:
+        column (np.ndarray): Столбец.
+        types (tuple): Допустимые типы Python.
+        kinds (str): Допустимые виды dtype NumPy, например 'iu' для целых.
+    Returns:
+        np.ndarray: Маска значений допустимого типа.
+    """
+    if column.dtype.kind != "O":
+        return np.full(len(column), column.dtype.kind in kinds)
+    values = column.tolist()
+    allowed = {kind: issubclass(kind, types) for kind in set(map(type, values))}
+    if all(allowed.values()):
+        return np.ones(len(values), dtype=bool)
+    return np.fromiter(map(allowed.__getitem__, map(type, values)), dtype=bool, count=len(values))
+
+
+def _less(column: np.ndarray, valid: np.ndarray, bound: float, inclusive: bool = False) -> np.ndarray:
+    """
+    Сравнивает с границей только значения, прошедшие проверку типа.
+    Args:
+        column (np.ndarray): Столбец.
+        valid (np.ndarray): Маска значений допустимого типа.
+        bound (float): Граница.
+        inclusive (bool): Сравнивать `<=` вместо `<`.
+    Returns:
+        np.ndarray: Маска значений меньше (или не больше) границы; NaN границу не нарушает.
+    """
+    result = np.zeros(len(column), dtype=bool)
+    values = column[valid].astype(float)
+    result[valid] = values <= bound if inclusive else values < bound
+    return result
+
+
+def _matches(column: np.ndarray, pattern: re.Pattern) -> np.ndarray:
+    """
+    Returns:
+        np.ndarray: Маска строк, для которых `pattern.match` находит совпадение; не строки — False.
+    """
+    values = column.tolist()
+    if set(map(type, values)) <= {str}:
+        return np.fromiter(map(bool, map(pattern.match, values)), dtype=bool, count=len(values))
+    return np.fromiter((isinstance(value, str) and pattern.match(value) is not None for value in values),
+                       dtype=bool, count=len(values))
+
+
+def _first_error(checks: list) -> np.ndarray:
+    """
+    Собирает коды ошибок: каждой записи — номер первой непройденной проверки,
+    как если бы конструктор модели выбросил исключение на первой из них.
+    Args:
+        checks (list[np.ndarray]): Маски нарушений в порядке проверок конструктора.
+    Returns:
+        np.ndarray: Коды ошибок int8; `VALID` (0) — запись корректна.
+    """
+    codes = np.zeros(len(checks[0]), dtype=np.int8)
+    for code in range(len(checks), 0, -1):
+        codes[checks[code - 1]] = code
+    return codes
+
+
+class BatchValidation:
+    """
+    Пакетная проверка записей модели по столбцам без создания объектов.
+    Подклассы задают `FIELDS` — столбцы в порядке аргументов конструктора,
+    `ERRORS` — код -> (поле, шаблон сообщения конструктора) и `_checks`.
+    """
+
+    __slots__ = ()
+
+    FIELDS = ()
+    ERRORS = {}
+
+    @classmethod
+    def _checks(cls, *columns: np.ndarray) -> list:
+        """
+        Returns:
+            list[np.ndarray]: Маски нарушений в порядке кодов `ERRORS`.
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def validate_batch(cls, *columns) -> np.ndarray:
+        """
+        Проверяет записи, заданные столбцами, по тем же правилам и в том же порядке,
+        что и конструктор модели.
+        Args:
+            *columns: Столбцы в порядке `FIELDS` (списки, массивы NumPy или pandas.Series).
+        Returns:
+            np.ndarray: Коды ошибок int8 по записям; `VALID` (0) — запись корректна.
+        Raises:
+            ValueError: Если количество или длины столбцов не совпадают.
+        """
+        if len(columns) != len(cls.FIELDS):
+            raise ValueError(f"Ожидаются столбцы: {', '.join(cls.FIELDS)}")
+        columns = [_column(column) for column in columns]
+        if len({len(column) for column in columns}) > 1:
+            raise ValueError("Столбцы разной длины.")
+        if not len(columns[0]):
+            return np.zeros(0, dtype=np.int8)
+        return _first_error(cls._checks(*columns))
+
+    @classmethod
+    def validate_frame(cls, frame) -> np.ndarray:
+        """
+        Проверяет строки DataFrame со столбцами `FIELDS`.
+        Args:
+            frame (pandas.DataFrame): Записи.
+        Returns:
+            np.ndarray: Коды ошибок по строкам.
+        """
+        return cls.validate_batch(*(frame[field] for field in cls.FIELDS))
+
+    @classmethod
+    def valid_mask(cls, *columns) -> np.ndarray:
+        """
+        Returns:
+            np.ndarray: Маска корректных записей (см. `validate_batch`).
+        """
+        return cls.validate_batch(*columns) == VALID
+
+    @classmethod
+    def message(cls, code: int, value=None) -> str:
+        """
+        Текст ошибки, который выбросил бы конструктор модели.
+        Args:
+            code (int): Код ошибки.
+            value: Значение поля, не прошедшего проверку.
+        Returns:
+            str: Сообщение.
+        """
+        return cls.ERRORS[code][1].format(value)
+
+
+class Client(BatchValidation):
     """
     Класс, представляющий клиента интернет-магазина.
     Содержит данные о клиенте: имя, email, телефон и адрес.
     При создании объекта автоматически выполняется валидация полей.
     """
 
+    __slots__ = ("id", "name", "email", "phone", "address")
+
+    FIELDS = ("name", "email", "phone", "address")
+    ERRORS = {
+        1: ("name", "Имя не может быть пустым: {}"),
+        2: ("email", "Некорректный email: {}"),
+        3: ("phone", "Некорректный номер телефона: {}"),
+        4: ("address", "Адрес не может быть пустым: {}"),
+    }
+
     def __init__(self, name: str, email: str, phone: str, address: str):
         """
         Инициализирует объект клиента с валидацией данных.
@@ -16,9 +217,10 @@ class Client:
             phone (str): Номер телефона. Должен начинаться с +7 или 8 и содержать 11 цифр.
             address (str): Адрес клиента. Не может быть пустым.
         Raises:
-            ValueError: Если имя, email, телефон или адрес не проходят валидацию.
-            TypeError: Не возникает напрямую, но подразумевается при передаче нестроковых значений.
+            ValueError: Если имя, email, телефон или адрес не проходят валидацию
+                (в том числе если email или телефон — не строка).
         """
+        self.id = None
         self.name = name
         self.email = email
         self.phone = phone
@@ -26,13 +228,13 @@ class Client:
 
         # Валидация при создании
         if not self.name:
-            raise ValueError(f"Имя не может быть пустым: {self.name}")
+            raise ValueError(self.message(1, self.name))
         if not self.is_valid_email():
-            raise ValueError(f"Некорректный email: {self.email}")
+            raise ValueError(self.message(2, self.email))
         if not self.is_valid_phone():
-            raise ValueError(f"Некорректный номер телефона: {self.phone}")
+            raise ValueError(self.message(3, self.phone))
         if not self.address:
-            raise ValueError(f"Адрес не может быть пустым: {self.address}")
+            raise ValueError(self.message(4, self.address))
 
     def __str__(self) -> str:
         """
@@ -55,8 +257,7 @@ class Client:
         Returns:
             bool: True, если email валиден, иначе False.
         """
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return re.match(pattern, self.email) is not None
+        return isinstance(self.email, str) and EMAIL_RE.match(self.email) is not None
 
     def is_valid_phone(self) -> bool:
         """
@@ -65,16 +266,55 @@ class Client:
         Returns:
             bool: True, если номер валиден, иначе False.
         """
-        pattern = r'^(\+7|8)\d{10}$'
-        return re.match(pattern, self.phone) is not None
+        return isinstance(self.phone, str) and PHONE_RE.match(self.phone) is not None
+
+    @classmethod
+    def from_row(cls, row: tuple) -> "Client":
+        """
+        Создаёт клиента из строки таблицы без повторной проверки:
+        данные в базе уже прошли её при добавлении.
+        Args:
+            row (tuple): (id, c_name, email, phone, address), как отдают `Database.iter_clients` и `ClientBatch`.
+        Returns:
+            Client: Клиент с заполненным `id`.
+        """
+        client = cls.__new__(cls)
+        client.id, client.name, client.email, client.phone, client.address = row
+        return client
 
+    def to_row(self) -> tuple:
+        """
+        Returns:
+            tuple: (c_name, email, phone, address) для `Database.insert_clients_bulk`.
+        """
+        return self.name, self.email, self.phone, self.address
+
+    @classmethod
+    def _checks(cls, name, email, phone, address) -> list:
+        """
+        Returns:
+            list[np.ndarray]: Маски нарушений: пустое имя, email, телефон, пустой адрес.
+        """
+        return [~_truthy(name), ~_matches(email, EMAIL_RE), ~_matches(phone, PHONE_RE), ~_truthy(address)]
 
-class Product:
+
+class Product(BatchValidation):
     """
     Класс, представляющий товар в интернет-магазине.
     Содержит название, цену и количество на складе. Валидация данных выполняется через property-сеттеры.
     """
 
+    __slots__ = ("id", "name", "_price", "_stock")
+
+    FIELDS = ("name", "price", "stock")
+    ERRORS = {
+        1: ("price", "Цена должна быть числом."),
+        2: ("price", "Цена не может быть отрицательной."),
+        3: ("stock", "Количество на складе должно быть целым числом."),
+        4: ("stock", "Количество на складе не может быть отрицательным."),
+        5: ("name", "Наименование товара не может быть пустым: {}"),
+    }
+
     def __init__(self, name: str, price: float, stock: int):
         """
         Инициализирует объект товара.
@@ -87,6 +327,7 @@ class Product:
             TypeError: Если price не число или stock не целое число.
             ValueError: Если price < 0 или stock < 0.
         """
+        self.id = None
         self.name = name
         self._price = None
         self._stock = None
@@ -95,7 +336,7 @@ class Product:
 
         # Валидация при создании
         if not self.name:
-            raise ValueError(f"Наименование товара не может быть пустым: {self.name}")
+            raise ValueError(self.message(5, self.name))
 
     @property
     def price(self) -> float:
@@ -113,13 +354,14 @@ class Product:
         Args:
             value (float): Новая цена.
         Raises:
-            TypeError: Если значение не является числом (int или float).
+            TypeError: Если значение не является действительным числом (int, float,
+                числа NumPy — как в `validate_batch` по столбцам DataFrame).
             ValueError: Если цена отрицательная.
         """
-        if not isinstance(value, (int, float)):
-            raise TypeError("Цена должна быть числом.")
+        if not isinstance(value, Real):
+            raise TypeError(self.message(1))
         if value < 0:
-            raise ValueError("Цена не может быть отрицательной.")
+            raise ValueError(self.message(2))
         self._price = float(value)
 
     @property
@@ -138,14 +380,14 @@ class Product:
         Args:
             value (int): Новое количество.
         Raises:
-            TypeError: Если значение не является целым числом.
+            TypeError: Если значение не является целым числом (int или целое NumPy).
             ValueError: Если количество отрицательное.
         """
-        if not isinstance(value, int):
-            raise TypeError("Количество на складе должно быть целым числом.")
+        if not isinstance(value, Integral):
+            raise TypeError(self.message(3))
         if value < 0:
-            raise ValueError("Количество на складе не может быть отрицательным.")
-        self._stock = value
+            raise ValueError(self.message(4))
+        self._stock = int(value)
 
     def __str__(self) -> str:
         """
@@ -159,14 +401,56 @@ class Product:
                 f"stock={self.stock})"
                 )
 
+    @classmethod
+    def from_row(cls, row: tuple) -> "Product":
+        """
+        Создаёт товар из строки таблицы без повторной проверки.
+        Args:
+            row (tuple): (id, p_name, price, stock), как отдают `Database.iter_products` и `ProductBatch`.
+        Returns:
+            Product: Товар с заполненным `id`.
+        """
+        product = cls.__new__(cls)
+        product.id, product.name, price, product._stock = row
+        product._price = None if price is None else float(price)  # SQLite может вернуть int
+        return product
+
+    def to_row(self) -> tuple:
+        """
+        Returns:
+            tuple: (p_name, price, stock) для `Database.insert_products_bulk`.
+        """
+        return self.name, self._price, self._stock
+
+    @classmethod
+    def _checks(cls, name, price, stock) -> list:
+        """
+        Returns:
+            list[np.ndarray]: Маски нарушений в порядке сеттеров: тип и знак цены,
+                тип и знак количества, пустое наименование.
+        """
+        price_type = _instances(price, (Real,), "iuf")
+        stock_type = _instances(stock, (Integral,), "iu")
+        return [~price_type, _less(price, price_type, 0), ~stock_type, _less(stock, stock_type, 0), ~_truthy(name)]
+
 
-class Order:
+class Order(BatchValidation):
     """
     Класс, представляющий заказ в интернет-магазине.
     Связывает клиента и товар по их ID, содержит количество и дату заказа.
     Все входные данные проверяются на корректность при создании.
     """
 
+    __slots__ = ("id", "client_id", "product_id", "quantity", "order_date")
+
+    FIELDS = ("client_id", "product_id", "quantity", "order_date")
+    ERRORS = {
+        1: ("client_id", "client_id должен быть целым числом."),
+        2: ("product_id", "product_id должен быть целым числом."),
+        3: ("quantity", "quantity должен быть целым числом."),
+        4: ("quantity", "quantity должен быть положительным числом."),
+    }
+
     def __init__(self, client_id: int, product_id: int, quantity: int, order_date: str):
         """
         Инициализирует объект заказа с валидацией данных.
@@ -176,21 +460,23 @@ class Order:
             quantity (int): Количество товара в заказе. Должно быть положительным.
             order_date (str): Дата заказа в формате строки (например, '2025-04-05').
         Raises:
-            TypeError: Если client_id, product_id или quantity не являются целыми числами.
+            TypeError: Если client_id, product_id или quantity не являются целыми числами
+                (int или целые NumPy).
             ValueError: Если quantity не положительное число.
         """
-        if not isinstance(client_id, int):
-            raise TypeError("client_id должен быть целым числом.")
-        if not isinstance(product_id, int):
-            raise TypeError("product_id должен быть целым числом.")
-        if not isinstance(quantity, int):
-            raise TypeError("quantity должен быть целым числом.")
+        if not isinstance(client_id, Integral):
+            raise TypeError(self.message(1))
+        if not isinstance(product_id, Integral):
+            raise TypeError(self.message(2))
+        if not isinstance(quantity, Integral):
+            raise TypeError(self.message(3))
         if quantity <= 0:
-            raise ValueError("quantity должен быть положительным числом.")
+            raise ValueError(self.message(4))
 
-        self.client_id = client_id
-        self.product_id = product_id
-        self.quantity = quantity
+        self.id = None
+        self.client_id = int(client_id)
+        self.product_id = int(product_id)
+        self.quantity = int(quantity)
         self.order_date = order_date
 
     def __str__(self) -> str:
@@ -204,4 +490,397 @@ class Order:
                 f"Product={self.product_id}, "
                 f"Quantity={self.quantity}, "
                 f"Order_date='{self.order_date}')"
-                )
\ No newline at end of file
+                )
+
+    @classmethod
+    def from_row(cls, row: tuple) -> "Order":
+        """
+        Создаёт заказ из строки таблицы Orders без повторной проверки.
+        ID клиента или товара может быть None, если запись удалена.
+        Args:
+            row (tuple): (id, client_id, product_id, quantity, order_date), как отдаёт `OrderBatch`.
+        Returns:
+            Order: Заказ с заполненным `id`.
+        """
+        order = cls.__new__(cls)
+        order.id, order.client_id, order.product_id, order.quantity, order.order_date = row
+        return order
+
+    def to_row(self) -> tuple:
+        """
+        Returns:
+            tuple: (client_id, product_id, quantity, order_date) для `Database.insert_orders_bulk`.
+        """
+        return self.client_id, self.product_id, self.quantity, self.order_date
+
+    @classmethod
+    def _checks(cls, client_id, product_id, quantity, order_date) -> list:
+        """
+        Returns:
+            list[np.ndarray]: Маски нарушений: типы ID клиента и товара, тип и знак количества.
+                Дата, как и в конструкторе, не проверяется.
+        """
+        quantity_type = _instances(quantity, (Integral,), "iu")
+        return [~_instances(client_id, (Integral,), "iu"), ~_instances(product_id, (Integral,), "iu"),
+                ~quantity_type, _less(quantity, quantity_type, 0, inclusive=True)]
+
+
+def _numeric(values, dtype: str) -> tuple[np.ndarray, np.ndarray | None]:
+    """
+    Переводит значения в числовой столбец, только если каждое из них — точное число
+    типа столбца (int для целых, int или float для дробных) и помещается в dtype.
+    Иначе значения сохраняются как есть в столбце object: пачка не обрезает дроби,
+    не разбирает текст и не превращает неподходящие значения в NULL.
+    Args:
+        values (Sequence): Значения столбца.
+        dtype (str): dtype NumPy.
+    Returns:
+        tuple[np.ndarray, np.ndarray | None]: Столбец (NULL хранятся нулями) и маска NULL
+            или столбец object (NULL — None) и None.
+    """
+    kind = np.dtype(dtype).kind
+    types = set(map(type, values))
+    types.discard(type(None))
+    if types <= EXACT_TYPES[kind]:
+        mask = _nones(values)
+        if mask is not None:
+            values = [0 if value is None else value for value in values]
+        try:
+            wide = np.array(values, dtype="int64" if kind == "i" else dtype)
+        except OverflowError:
+            wide = None
+        if wide is not None and wide.dtype == dtype:
+            return wide, mask
+        if wide is not None:
+            info = np.iinfo(dtype)
+            if not len(wide) or info.min <= wide.min() and wide.max() <= info.max:
+                return wide.astype(dtype), mask
+        if mask is not None:
+            values = [None if null else value for value, null in zip(values, mask.tolist())]
+    column = np.empty(len(values), dtype=object)
+    column[:] = values
+    return column, None
+
+
+def _with_nones(column: np.ndarray, mask: np.ndarray | None) -> np.ndarray:
+    """
+    Returns:
+        np.ndarray: Часть столбца как object, где NULL по маске заменены на None.
+    """
+    column = column.astype(object)
+    if mask is not None:
+        column[mask] = None
+    return column
+
+
+def _nones(values) -> np.ndarray | None:
+    """
+    Returns:
+        np.ndarray | None: Маска значений None или None, если их нет.
+    """
+    if None not in values:
+        return None
+    return np.fromiter((value is None for value in values), dtype=bool, count=len(values))
+
+
+class TextColumn:
+    """
+    Компактный строковый столбец: все строки лежат в одном буфере UTF-8,
+    границы строк — в массиве смещений, NULL — в маске (None, если их нет).
+    Строка декодируется только при обращении к ней.
+    """
+
+    __slots__ = ("data", "offsets", "nulls")
+
+    def __init__(self, data: bytes, offsets: np.ndarray, nulls: np.ndarray = None):
+        """
+        Args:
+            data (bytes): Строки в UTF-8 подряд.
+            offsets (np.ndarray): Смещения int64 начала каждой строки и конца последней (длина n + 1).
+            nulls (np.ndarray, optional): Маска NULL.
+        """
+        self.data = data
+        self.offsets = offsets
+        self.nulls = nulls
+
+    @classmethod
+    def from_values(cls, values) -> "TextColumn":
+        """
+        Args:
+            values (Sequence): Строки или None.
+        Returns:
+            TextColumn: Столбец.
+        """
+        nulls = None
+        try:
+            encoded = list(map(str.encode, values))
+        except TypeError:
+            # Есть NULL или значения не-строки (SQLite допускает любой тип в столбце)
+            encoded = [b"" if value is None else str(value).encode() for value in values]
+            nulls = _nones(values)
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum(np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded)), out=offsets[1:])
+        return cls(b"".join(encoded), offsets, nulls)
+
+    @classmethod
+    def concat(cls, parts: list) -> "TextColumn":
+        """
+        Склеивает столбцы, собранные по частям.
+        Args:
+            parts (list[TextColumn]): Части по порядку.
+        Returns:
+            TextColumn: Столбец целиком.
+        """
+        if not parts:
+            return cls(b"", np.zeros(1, dtype=np.int64))
+        if len(parts) == 1:
+            return parts[0]
+        offsets, base = [np.zeros(1, dtype=np.int64)], 0
+        for part in parts:
+            offsets.append(part.offsets[1:] + base)
+            base += len(part.data)
+        nulls = None
+        if any(part.nulls is not None for part in parts):
+            nulls = np.concatenate([np.zeros(len(part), dtype=bool) if part.nulls is None else part.nulls
+                                    for part in parts])
+        return cls(b"".join(part.data for part in parts), np.concatenate(offsets), nulls)
+
+    def __len__(self) -> int:
+        """
+        Returns:
+            int: Количество строк.
+        """
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> str | None:
+        """
+        Args:
+            index (int): Номер строки (допускается отрицательный).
+        Returns:
+            str | None: Строка.
+        Raises:
+            IndexError: Если номер вне столбца.
+        """
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Номер строки вне столбца.")
+        if self.nulls is not None and self.nulls[index]:
+            return None
+        return self.data[self.offsets[index]:self.offsets[index + 1]].decode()
+
+    def values(self, start: int = 0, stop: int = None) -> list:
+        """
+        Декодирует строки с `start` по `stop` (не включая).
+        Returns:
+            list: Строки и None.
+        """
+        stop = len(self) if stop is None else min(stop, len(self))
+        data, offsets = self.data, self.offsets[start:stop + 1].tolist()
+        values = [data[begin:end].decode() for begin, end in zip(offsets, offsets[1:])]
+        if self.nulls is not None:
+            values = [None if null else value for value, null in zip(values, self.nulls[start:stop].tolist())]
+        return values
+
+    def __iter__(self):
+        """
+        Yields:
+            str | None: Строки по порядку; декодируются частями по `BATCH_CHUNK_SIZE`.
+        """
+        for start in range(0, len(self), BATCH_CHUNK_SIZE):
+            yield from self.values(start, start + BATCH_CHUNK_SIZE)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Returns:
+            int: Объём буфера, смещений и маски в байтах.
+        """
+        return len(self.data) + self.offsets.nbytes + (0 if self.nulls is None else self.nulls.nbytes)
+
+
+class RowBatch:
+    """
+    Строки таблицы в столбцовом виде: числа — в массивах NumPy, строки — в `TextColumn`.
+    Занимает в несколько раз меньше памяти, чем список кортежей, а по номеру
+    и при обходе отдаёт те же кортежи, что и читатели `Database`.
+    Подклассы задают `MODEL` и `COLUMNS` — столбец -> dtype NumPy (None — текст)
+    в порядке строки таблицы.
+    """
+
+    __slots__ = ("columns", "nulls")
+
+    MODEL = None
+    COLUMNS = {}
+
+    def __init__(self, columns: dict, nulls: dict = None):
+        """
+        Args:
+            columns (dict): Столбец -> массив NumPy или `TextColumn`.
+            nulls (dict, optional): Числовой столбец -> маска NULL (только для столбцов, где они есть).
+        """
+        self.columns = columns
+        self.nulls = nulls or {}
+
+    @classmethod
+    def from_rows(cls, rows: Iterable, chunk_size: int = BATCH_CHUNK_SIZE) -> "RowBatch":
+        """
+        Собирает пачку из строк, раскладывая их по столбцам частями по `chunk_size`,
+        поэтому источник (например, генератор) не превращается в список кортежей.
+        Args:
+            rows (Iterable): Кортежи в порядке `COLUMNS`.
+            chunk_size (int): Количество строк в одной части.
+        Returns:
+            RowBatch: Пачка.
+        """
+        iterator = iter(rows)
+        return cls.from_chunks(iter(lambda: list(islice(iterator, chunk_size)), []))
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable) -> "RowBatch":
+        """
+        Собирает пачку из готовых частей строк, например из результатов `fetchmany`.
+        Числовой столбец, в котором есть не точные числа его типа (текст, дроби
+        в целом столбце, числа вне диапазона), хранится как object без изменений.
+        Args:
+            chunks (Iterable[list]): Списки кортежей в порядке `COLUMNS`.
+        Returns:
+            RowBatch: Пачка.
+        """
+        parts = {name: [] for name in cls.COLUMNS}
+        masks = {name: [] for name in cls.COLUMNS}
+        for chunk in chunks:
+            for (name, dtype), values in zip(cls.COLUMNS.items(), zip(*chunk)):
+                if dtype is None:
+                    parts[name].append(TextColumn.from_values(values))
+                    continue
+                column, mask = _numeric(values, dtype)
+                parts[name].append(column)
+                masks[name].append(mask)
+
+        columns, nulls = {}, {}
+        for name, dtype in cls.COLUMNS.items():
+            if dtype is None:
+                columns[name] = TextColumn.concat(parts[name])
+                continue
+            if any(part.dtype == object for part in parts[name]):
+                # Хотя бы одна часть не числовая: весь столбец — object, NULL — None
+                columns[name] = np.concatenate([_with_nones(part, mask)
+                                                for part, mask in zip(parts[name], masks[name])])
+                continue
+            columns[name] = np.concatenate(parts[name]) if parts[name] else np.empty(0, dtype=dtype)
+            if any(mask is not None for mask in masks[name]):
+                nulls[name] = np.concatenate([np.zeros(len(part), dtype=bool) if mask is None else mask
+                                              for part, mask in zip(parts[name], masks[name])])
+        return cls(columns, nulls)
+
+    def __len__(self) -> int:
+        """
+        Returns:
+            int: Количество строк.
+        """
+        return len(self.columns[next(iter(self.COLUMNS))])
+
+    def column(self, name: str):
+        """
+        Args:
+            name (str): Столбец из `COLUMNS`.
+        Returns:
+            np.ndarray | TextColumn: Столбец (NULL в числовых столбцах хранятся нулями, см. `nulls`;
+                в столбце object — None).
+        """
+        return self.columns[name]
+
+    def _values(self, name: str, start: int, stop: int) -> list:
+        """
+        Returns:
+            list: Значения столбца с `start` по `stop` как объекты Python (NULL — None).
+        """
+        column = self.columns[name]
+        if isinstance(column, TextColumn):
+            return column.values(start, stop)
+        values = column[start:stop].tolist()
+        if name in self.nulls:
+            values = [None if null else value for value, null in zip(values, self.nulls[name][start:stop].tolist())]
+        return values
+
+    def __getitem__(self, index: int) -> tuple:
+        """
+        Args:
+            index (int): Номер строки (допускается отрицательный).
+        Returns:
+            tuple: Строка в порядке `COLUMNS`.
+        Raises:
+            IndexError: Если номер вне пачки.
+        """
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Номер строки вне пачки.")
+        return tuple(self._values(name, index, index + 1)[0] for name in self.COLUMNS)
+
+    def __iter__(self):
+        """
+        Yields:
+            tuple: Строки в порядке `COLUMNS`, как у читателей `Database`.
+        """
+        for start in range(0, len(self), BATCH_CHUNK_SIZE):
+            stop = start + BATCH_CHUNK_SIZE
+            yield from zip(*(self._values(name, start, stop) for name in self.COLUMNS))
+
+    def model(self, index: int):
+        """
+        Returns:
+            BatchValidation: Объект `MODEL` для строки с номером `index`.
+        """
+        return self.MODEL.from_row(self[index])
+
+    def models(self):
+        """
+        Yields:
+            BatchValidation: Объекты `MODEL` по всем строкам.
+        """
+        return map(self.MODEL.from_row, self)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Returns:
+            int: Объём столбцов и масок NULL в байтах.
+        """
+        return (sum(column.nbytes for column in self.columns.values())
+                + sum(mask.nbytes for mask in self.nulls.values()))
+
+
+class ClientBatch(RowBatch):
+    """
+    Клиенты в столбцовом виде: (id, name, email, phone, address).
+    """
+
+    __slots__ = ()
+
+    MODEL = Client
+    COLUMNS = {"id": "int64", "name": None, "email": None, "phone": None, "address": None}
+
+
+class ProductBatch(RowBatch):
+    """
+    Товары в столбцовом виде: (id, name, price, stock).
+    """
+
+    __slots__ = ()
+
+    MODEL = Product
+    COLUMNS = {"id": "int64", "name": None, "price": "float64", "stock": "int32"}
+
+
+class OrderBatch(RowBatch):
+    """
+    Заказы в столбцовом виде: (id, client_id, product_id, quantity, order_date).
+    """
+
+    __slots__ = ()
+
+    MODEL = Order
+    COLUMNS = {"id": "int64", "client_id": "int64", "product_id": "int64", "quantity": "int32",
+               "order_date": None}
@@ -0,0 +1,1007 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+import numpy as np
+from db import Database, AsyncDatabase, ConnectionPool, QueryCache, MIGRATIONS, PERFORMANCE_PROFILES, fts_query
+from widgets import QuerySource
+
+
+class TestBulkInsert(unittest.TestCase):
+    """
+    Набор тестов для пакетной вставки в класс Database.
+    Проверяет вставку из генераторов, разбиение на пачки и возвращаемые ID.
+    """
+
+    def setUp(self):
+        """
+        Создаёт базу данных в памяти для каждого теста.
+        """
+        self.db = Database(":memory:")
+
+    def tearDown(self):
+        """
+        Закрывает соединение с базой данных.
+        """
+        self.db.conn.close()
+
+    def test_insert_clients_bulk_from_generator(self):
+        """
+        Проверяет, что клиенты вставляются из генератора и возвращаются их ID.
+        """
+        clients = ((f"Клиент {i}", f"c{i}@mail.ru", "81234567890", "Москва") for i in range(5))
+        ids = self.db.insert_clients_bulk(clients, batch_size=2)
+        self.assertEqual(ids, [1, 2, 3, 4, 5])
+        self.assertEqual(len(self.db.load_client()), 5)
+
+    def test_insert_products_bulk_ids_match_rows(self):
+        """
+        Проверяет, что возвращённые ID соответствуют вставленным товарам.
+        """
+        self.db.insert_product("Первый", 10.0, 1)
+        ids = self.db.insert_products_bulk([("Второй", 20.0, 2), ("Третий", 30.0, 3)], batch_size=1)
+        rows = dict((row[0], row[1]) for row in self.db.load_product())
+        self.assertEqual([rows[i] for i in ids], ["Второй", "Третий"])
+
+    def test_insert_orders_bulk_empty(self):
+        """
+        Проверяет, что пустой источник не приводит к вставке и возвращает пустой список.
+        """
+        self.assertEqual(self.db.insert_orders_bulk(iter([])), [])
+
+    def test_insert_bulk_rolls_back_on_error(self):
+        """
+        Проверяет, что ошибка в одной из пачек откатывает всю транзакцию.
+        """
+        products = [("Годный", 10.0, 1), ("Отрицательный", -1.0, 1)]
+        with self.assertRaises(Exception):
+            self.db.insert_products_bulk(products, batch_size=1)
+        self.assertEqual(self.db.load_product(), [])
+
+    def test_insert_bulk_invalid_batch_size(self):
+        """
+        Проверяет, что неположительный размер пачки вызывает ValueError.
+        """
+        with self.assertRaises(ValueError):
+            self.db.insert_clients_bulk([], batch_size=0)
+
+
+class TestMigrations(unittest.TestCase):
+    """
+    Набор тестов для миграций схемы базы данных.
+    Проверяет версию схемы, создание индексов и обновление существующих баз.
+    """
+
+    def test_new_database_is_fully_migrated(self):
+        """
+        Проверяет, что новая база сразу получает последнюю версию схемы.
+        """
+        db = Database(":memory:")
+        self.assertEqual(db.schema_version(), len(MIGRATIONS))
+        db.conn.close()
+
+    def test_indexes_created(self):
+        """
+        Проверяет наличие индексов на горячих полях соединений и фильтров.
+        """
+        db = Database(":memory:")
+        indexes = {row[0] for row in db.conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        for name in ("idx_orders_client_product", "idx_orders_product_id", "idx_orders_order_day_sort",
+                     "idx_clients_c_name", "idx_products_p_name"):
+            self.assertIn(name, indexes)
+        db.conn.close()
+
+    def test_existing_database_upgraded_in_place(self):
+        """
+        Проверяет, что база без версии схемы обновляется с сохранением данных.
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "old.db")
+            conn = sqlite3.connect(path)
+            conn.execute("CREATE TABLE Clients (id INTEGER PRIMARY KEY AUTOINCREMENT, c_name TEXT NOT NULL, "
+                         "email TEXT NOT NULL, phone TEXT NOT NULL, address TEXT)")
+            conn.execute("INSERT INTO Clients (c_name, email, phone, address) VALUES ('Иван', 'i@i.ru', '8', 'М')")
+            conn.commit()
+            conn.close()
+
+            db = Database(path)
+            self.assertEqual(db.schema_version(), len(MIGRATIONS))
+            self.assertEqual(db.get_client_id("Иван"), (1,))
+            plan = db.conn.execute("EXPLAIN QUERY PLAN SELECT id FROM Clients WHERE c_name = ?",
+                                   ("Иван",)).fetchall()
+            self.assertIn("idx_clients_c_name", str(plan))
+            db.conn.close()
+
+    def test_newer_schema_rejected(self):
+        """
+        Проверяет, что база с версией схемы новее приложения не открывается.
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "future.db")
+            conn = sqlite3.connect(path)
+            conn.execute(f"PRAGMA user_version = {len(MIGRATIONS) + 1}")
+            conn.close()
+            with self.assertRaises(RuntimeError):
+                Database(path).conn.close()
+
+
+class TestPerformanceProfiles(unittest.TestCase):
+    """
+    Набор тестов для профилей производительности SQLite.
+    Проверяет применение PRAGMA, выбор профиля и временное переключение.
+    """
+
+    def setUp(self):
+        """
+        Создаёт файловую базу во временном каталоге (WAL недоступен для базы в памяти).
+        """
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = Database(os.path.join(self.tmp.name, "store.db"))
+
+    def tearDown(self):
+        """
+        Закрывает соединение и удаляет временный каталог.
+        """
+        self.db.conn.close()
+        self.tmp.cleanup()
+
+    def test_default_profile_applied(self):
+        """
+        Проверяет, что по умолчанию включены профиль 'desktop' и режим WAL.
+        """
+        self.assertEqual(self.db.profile, "desktop")
+        settings = self.db.profile_settings()
+        self.assertEqual(settings["journal_mode"].lower(), "wal")
+        self.assertEqual(settings["busy_timeout"], PERFORMANCE_PROFILES["desktop"]["busy_timeout"])
+
+    def test_using_profile_restores_previous(self):
+        """
+        Проверяет, что временный профиль действует внутри блока и снимается после него.
+        """
+        with self.db.using_profile("bulk-load"):
+            self.assertEqual(self.db.profile, "bulk-load")
+            self.assertEqual(self.db.profile_settings()["synchronous"], 0)
+        self.assertEqual(self.db.profile, "desktop")
+        self.assertEqual(self.db.profile_settings()["synchronous"], 1)
+
+    def test_unknown_profile(self):
+        """
+        Проверяет, что неизвестное имя профиля вызывает ValueError.
+        """
+        with self.assertRaises(ValueError):
+            self.db.apply_profile("turbo")
+
+
+class TestConnectionPool(unittest.TestCase):
+    """
+    Набор тестов для общего пула соединений.
+    Проверяет маршрутизацию чтения и записи, работу из потоков и закрытие пула.
+    """
+
+    def setUp(self):
+        """
+        Создаёт пул над файловой базой во временном каталоге.
+        """
+        self.tmp = tempfile.TemporaryDirectory()
+        self.pool = ConnectionPool(os.path.join(self.tmp.name, "store.db"), readers=2)
+
+    def tearDown(self):
+        """
+        Закрывает пул и удаляет временный каталог.
+        """
+        self.pool.close()
+        self.tmp.cleanup()
+
+    def test_handle_writes_and_reads(self):
+        """
+        Проверяет, что запись через дескриптор сразу видна при чтении с читателя.
+        """
+        db = self.pool.handle()
+        db.insert_client("Иван", "ivan@ivanov.com", "81234567890", "Москва")
+        self.assertEqual(db.get_client_id("Иван"), (1,))
+
+    def test_handles_share_connections(self):
+        """
+        Проверяет, что дескрипторы окон не открывают новых соединений.
+        """
+        first, second = self.pool.handle(), self.pool.handle()
+        self.assertIs(first.pool.writer, second.pool.writer)
+        self.assertEqual(len(self.pool._all_readers), 2)
+
+    def test_readers_are_read_only(self):
+        """
+        Проверяет, что соединение-читатель не позволяет изменять данные.
+        """
+        with self.pool.connection(readonly=True) as reader:
+            with self.assertRaises(sqlite3.OperationalError):
+                reader.conn.execute("DELETE FROM Clients")
+
+    def test_concurrent_reads_from_threads(self):
+        """
+        Проверяет, что дескриптор можно использовать из нескольких потоков одновременно.
+        """
+        db = self.pool.handle()
+        db.insert_products_bulk((f"Товар {i}", 1.0, 1) for i in range(100))
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(len(db.load_product()))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [100] * 8)
+
+    def test_closed_pool_rejects_calls(self):
+        """
+        Проверяет, что после закрытия пула обращения к базе вызывают RuntimeError.
+        """
+        db = self.pool.handle()
+        self.pool.close()
+        with self.assertRaises(RuntimeError):
+            db.load_client()
+
+
+class TestAsyncDatabase(unittest.TestCase):
+    """
+    Набор тестов для асинхронного фасада над пулом соединений.
+    Проверяет порядок записи, параллельное чтение и остановку фоновых потоков.
+    """
+
+    def setUp(self):
+        """
+        Создаёт пул над файловой базой во временном каталоге и фасад над ним.
+        """
+        self.tmp = tempfile.TemporaryDirectory()
+        self.pool = ConnectionPool(os.path.join(self.tmp.name, "store.db"), readers=2)
+        self.tasks = AsyncDatabase(self.pool)
+
+    def tearDown(self):
+        """
+        Останавливает фоновые потоки, закрывает пул и удаляет временный каталог.
+        """
+        self.tasks.close()
+        self.pool.close()
+        self.tmp.cleanup()
+
+    def test_writes_are_applied_in_order(self):
+        """
+        Проверяет, что изменения выполняются одним потоком строго в порядке вызова.
+        """
+        futures = [self.tasks.insert_product(f"Товар {i}", 1.0, i) for i in range(50)]
+        self.assertEqual([future.result(5) for future in futures], list(range(1, 51)))
+        threads = {self.tasks.submit(lambda db: threading.current_thread().name).result(5) for _ in range(5)}
+        self.assertEqual(len(threads), 1)
+        self.tasks.update_product(1, stock=100).result(5)
+        self.assertEqual(self.tasks.load_product_row(1).result(5), (1, "Товар 0", 1.0, 100))
+
+    def test_reads_run_concurrently(self):
+        """
+        Проверяет, что чтения выполняются параллельно на разных читателях.
+        """
+        barrier = threading.Barrier(2, timeout=5)
+
+        def read(db):
+            barrier.wait()
+            return db.count_clients()
+
+        futures = [self.tasks.submit(read, readonly=True) for _ in range(2)]
+        self.assertEqual([future.result(5) for future in futures], [0, 0])
+
+    def test_stream_does_not_hold_pool_readers(self):
+        """
+        Проверяет, что долгое чтение через `stream` идёт на собственном соединении
+        и не занимает читателей пула: обычные запросы выполняются параллельно с ним.
+        """
+        self.tasks.insert_client("Иван", "ivan@mail.ru", "1", None).result(5)
+        started, release = threading.Event(), threading.Event()
+        seen = {}
+
+        def export(db):
+            seen["db"] = db
+            started.set()
+            release.wait(5)
+            return db.count_clients()
+
+        future = self.tasks.stream(export)
+        self.assertTrue(started.wait(5))
+        self.assertNotIn(seen["db"], [self.pool.writer, *self.pool._all_readers])
+        reads = [self.tasks.count_clients() for _ in range(2)]
+        self.assertEqual([read.result(5) for read in reads], [1, 1])
+        release.set()
+        self.assertEqual(future.result(5), 1)
+        with self.assertRaises(sqlite3.ProgrammingError):
+            seen["db"].conn.execute("SELECT 1")
+
+    def test_streaming_methods_are_not_async(self):
+        """
+        Проверяет, что потоковые методы не оборачиваются во Future, а доступны через `sync`.
+        """
+        with self.assertRaises(AttributeError):
+            self.tasks.iter_clients
+        self.assertEqual(list(self.tasks.sync.iter_clients()), [])
+
+    def test_close_waits_for_pending_writes(self):
+        """
+        Проверяет, что при остановке уже поставленные в очередь изменения выполняются.
+        """
+        self.tasks.insert_clients_bulk([("Иван", "ivan@mail.ru", "1", None)] * 500)
+        self.tasks.close()
+        self.assertEqual(self.pool.handle().count_clients(), 500)
+
+
+class TestPagination(unittest.TestCase):
+    """
+    Набор тестов для постраничной загрузки списков.
+    Проверяет keyset-курсор, выборку по смещению и блочный источник строк таблицы.
+    """
+
+    def setUp(self):
+        """
+        Создаёт базу в памяти с клиентами, товарами и заказами.
+        """
+        self.db = Database(":memory:")
+        self.db.insert_clients_bulk((f"Клиент {i % 7}", f"c{i}@mail.ru", "81234567890",
+                                     None if i % 5 == 0 else f"Адрес {i % 3}") for i in range(50))
+        self.db.insert_products_bulk((f"Товар {i}", float(i % 4), i) for i in range(10))
+        self.db.insert_orders_bulk((1 + i % 50, 1 + i % 10, 1 + i % 9, f"2025-01-{1 + i % 28:02d}")
+                                   for i in range(120))
+
+    def tearDown(self):
+        """
+        Закрывает соединение с базой данных.
+        """
+        self.db.conn.close()
+
+    def _walk(self, load_page, order_by, descending=False, key_index=0):
+        """
+        Проходит весь список по keyset-курсору страницами по 7 строк.
+        """
+        rows, page = [], load_page(limit=7, order_by=order_by, descending=descending)
+        while page:
+            rows.extend(page)
+            last = page[-1]
+            page = load_page(last[0], 7, order_by, descending, last[key_index])
+        return rows
+
+    def test_keyset_pages_cover_list_by_id(self):
+        """
+        Проверяет, что страницы по ID покрывают весь список заказов без повторов.
+        """
+        rows = self._walk(self.db.load_orders_page, "id")
+        self.assertEqual(rows, self.db.load_order())
+        self.assertEqual(self.db.count_orders(), 120)
+
+    def test_keyset_pages_with_duplicate_and_null_keys(self):
+        """
+        Проверяет keyset-пагинацию по столбцу с повторами и NULL в обоих направлениях.
+        """
+        for descending in (False, True):
+            rows = self._walk(self.db.load_clients_page, "address", descending, key_index=4)
+            expected = sorted(self.db.load_client(), key=lambda c: (c[4] or "", c[0]), reverse=descending)
+            self.assertEqual(rows, expected)
+
+    def test_slice_matches_keyset(self):
+        """
+        Проверяет, что выборка по смещению совпадает с соответствующей частью списка.
+        """
+        full = self._walk(self.db.load_products_page, "price", key_index=2)
+        self.assertEqual(self.db.load_products_slice(3, 4, "price"), full[3:7])
+
+    def test_invalid_order_by(self):
+        """
+        Проверяет, что неизвестный столбец сортировки вызывает ValueError.
+        """
+        with self.assertRaises(ValueError):
+            self.db.load_orders_page(order_by="id; DROP TABLE Orders")
+
+    def test_query_source_blocks(self):
+        """
+        Проверяет, что блочный источник таблицы отдаёт те же строки, что и полный список.
+        """
+        source = QuerySource(self.db, "orders", "order_date", descending=True, block_size=8, max_blocks=2)
+        expected = sorted(self.db.load_order(), key=lambda o: (o[4], o[0]), reverse=True)
+        self.assertEqual(source.count(), 120)
+        self.assertEqual(source.rows(5, 30), expected[5:35])
+        self.assertEqual(source.rows(100, 50), expected[100:])
+        self.assertEqual(list(source.iter_rows()), expected)
+
+
+    def test_period_paged_and_searched_in_sql(self):
+        """
+        Проверяет подсчёт, блоки и поиск заказов за период: отбор по дате выполняется
+        в запросе, поэтому поиск с малым лимитом находит совпадения именно за период.
+        """
+        period = ("2025-01-05", "2025-01-09")
+        expected = [row for row in self.db.load_order("order_date", True) if period[0] <= row[4] <= period[1]]
+        self.assertEqual(self.db.count_orders(period), len(expected))
+        source = QuerySource(self.db, "orders", "order_date", descending=True, block_size=4, date_range=period)
+        self.assertEqual(source.count(), len(expected))
+        self.assertEqual(source.rows(2, 7), expected[2:9])
+        self.assertEqual(list(source.iter_rows()), expected)
+
+        found = self.db.search_orders("клиент", 3, "id", date_range=period)
+        self.assertEqual(found, sorted(expected)[:3])
+
+class TestStreaming(unittest.TestCase):
+    """
+    Набор тестов для потокового чтения таблиц.
+    Проверяет, что итераторы отдают те же строки, что и полная загрузка,
+    и не мешают другим запросам.
+    """
+
+    def setUp(self):
+        """
+        Создаёт базу в памяти с клиентами, товарами и заказами.
+        """
+        self.db = Database(":memory:")
+        self.db.insert_clients_bulk((f"Клиент {i}", f"c{i}@mail.ru", "81234567890", "Москва") for i in range(25))
+        self.db.insert_products_bulk((f"Товар {i}", float(i), i) for i in range(5))
+        self.db.insert_orders_bulk((1 + i % 25, 1 + i % 5, 1, "2025-01-01") for i in range(60))
+
+    def tearDown(self):
+        """
+        Закрывает соединение с базой данных.
+        """
+        self.db.conn.close()
+
+    def test_iterators_match_full_loads(self):
+        """
+        Проверяет, что итераторы отдают те же строки, что и методы load_*.
+        """
+        self.assertEqual(list(self.db.iter_clients(batch_size=4)), self.db.load_client())
+        self.assertEqual(list(self.db.iter_products(batch_size=4)), self.db.load_product())
+        self.assertEqual(list(self.db.iter_orders(batch_size=7)), self.db.load_order())
+        for weight in ("orders", "quantity"):
+            self.assertEqual(sorted(self.db.iter_client_product_edges(weight, batch_size=7)),
+                             sorted(self.db.client_product_subgraph(weight=weight)[1]))
+
+    def test_batches_match_streams(self):
+        """
+        Проверяет, что столбцовые пачки отдают те же строки, что и итераторы,
+        а пачка заказов читает ID клиентов и товаров и фильтрует по периоду.
+        """
+        self.assertEqual(list(self.db.load_client_batch(batch_size=4)), list(self.db.iter_clients()))
+        self.assertEqual(list(self.db.load_product_batch(batch_size=4)), self.db.load_product())
+        self.db.insert_order(2, 3, 4, "02.02.2025")
+        orders = self.db.load_order_batch(batch_size=7)
+        self.assertEqual(len(orders), 61)
+        self.assertEqual(orders[-1], (61, 2, 3, 4, "02.02.2025"))
+        self.assertEqual(list(self.db.load_order_batch(("2025-02-01", "2025-02-28"))), [orders[-1]])
+
+    def test_iterator_independent_of_shared_cursor(self):
+        """
+        Проверяет, что запросы через общий курсор во время итерации не прерывают её.
+        """
+        count = 0
+        for _ in self.db.iter_orders(batch_size=3):
+            self.db.get_client_id("Клиент 1")
+            count += 1
+        self.assertEqual(count, 60)
+
+    def test_pool_handle_streams_on_reader(self):
+        """
+        Проверяет, что через дескриптор пула итератор работает на читателе,
+        а запись во время итерации не блокируется.
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            pool = ConnectionPool(os.path.join(tmp, "store.db"), readers=1)
+            db = pool.handle()
+            db.insert_products_bulk((f"Товар {i}", 1.0, 1) for i in range(10))
+            names = []
+            for row in db.iter_products(batch_size=2):
+                names.append(row[1])
+                db.update_product(row[0], stock=2)
+            self.assertEqual(len(names), 10)
+            self.assertEqual({row[3] for row in db.load_product()}, {2})
+            pool.close()
+
+
+class TestFullTextSearch(unittest.TestCase):
+    """
+    Набор тестов для полнотекстового поиска FTS5.
+    Проверяет поиск по префиксу и синхронизацию индексов с таблицами через триггеры.
+    """
+
+    def setUp(self):
+        """
+        Создаёт базу в памяти с клиентами, товарами и заказами.
+        """
+        self.db = Database(":memory:")
+        self.db.insert_clients_bulk([
+            ("Иван Иванов", "ivan.petrov@example.com", "+79001234567", "Москва"),
+            ("Мария Иванова", "maria@example.com", "89005554433", None),
+            ("Пётр Сидоров", "petr@mail.ru", "89001112233", "Казань"),
+        ])
+        self.db.insert_products_bulk([("Ноутбук Lenovo", 50000.0, 3), ("Мышь Logitech", 1500.0, 10)])
+        self.db.insert_orders_bulk([(1, 1, 1, "2025-08-14"), (2, 2, 2, "2025-09-01"), (3, 1, 1, "2025-08-20")])
+
+    def tearDown(self):
+        """
+        Закрывает соединение с базой данных.
+        """
+        self.db.conn.close()
+
+    def test_fts_query(self):
+        """
+        Проверяет построение запроса FTS5 из пользовательского ввода.
+        """
+        self.assertEqual(fts_query("иван пет"), '"иван"* "пет"*')
+        self.assertEqual(fts_query("ivan.pet"), '"ivan pet"*')
+        self.assertEqual(fts_query('" * -'), "")
+        self.assertEqual(fts_query("OR"), '"OR"*')
+
+    def test_search_clients_prefix_case_insensitive(self):
+        """
+        Проверяет регистронезависимый поиск клиентов по началу слова.
+        """
+        names = {row[1] for row in self.db.search_clients("ИВАН")}
+        self.assertEqual(names, {"Иван Иванов", "Мария Иванова"})
+        self.assertEqual([row[0] for row in self.db.search_clients("ivan.pet")], [1])
+        self.assertEqual(self.db.search_clients("иван", limit=1)[0][1], "Иван Иванов")
+
+    def test_search_follows_updates_and_deletes(self):
+        """
+        Проверяет, что индексы обновляются при изменении и удалении строк.
+        """
+        self.db.update_product(2, p_name="Клавиатура Logitech")
+        self.assertEqual(self.db.search_products("мышь"), [])
+        self.assertEqual([row[0] for row in self.db.search_products("клав")], [2])
+        self.db.delete_client(3)
+        self.assertEqual(self.db.search_clients("Пётр"), [])
+
+    def test_search_orders_by_joined_names(self):
+        """
+        Проверяет поиск заказов по имени клиента, товару и дате, в том числе
+        после переименования клиента.
+        """
+        self.assertEqual(sorted(row[0] for row in self.db.search_orders("ноутбук")), [1, 3])
+        self.assertEqual(sorted(row[0] for row in self.db.search_orders("2025-08")), [1, 3])
+        self.db.update_client(1, c_name="Иннокентий Смирнов")
+        self.assertEqual([row[1] for row in self.db.search_orders("смирн")], ["Иннокентий Смирнов"])
+        self.db.update_order(2, product_id=1)
+        self.assertEqual(sorted(row[0] for row in self.db.search_orders("ноутбук")), [1, 2, 3])
+        self.db.delete_order(1)
+        self.assertEqual(sorted(row[0] for row in self.db.search_orders("ноутбук")), [2, 3])
+
+
+class TestSorting(unittest.TestCase):
+    """
+    Набор тестов для сортировки списков на стороне SQL.
+    Проверяет сравнение по типу столбца, сортировку результатов поиска и использование индексов.
+    """
+
+    def setUp(self):
+        """
+        Создаёт базу в памяти с товарами, цены которых расходятся по строковому и числовому порядку.
+        """
+        self.db = Database(":memory:")
+        self.db.insert_products_bulk([("Кабель", 900.0, 5), ("Ноутбук", 50000.0, 2),
+                                      ("Мышь", 1500.0, 10), ("Коврик", 90.0, 7)])
+        self.db.insert_clients_bulk([("Иван Иванов", "b@mail.ru", "1", None),
+                                     ("Иван Петров", "a@mail.ru", "2", "Москва")])
+
+    def tearDown(self):
+        """
+        Закрывает соединение с базой данных.
+        """
+        self.db.conn.close()
+
+    def test_numeric_columns_sort_as_numbers(self):
+        """
+        Проверяет, что цены и остатки сортируются как числа, а не как строки.
+        """
+        prices = [row[2] for row in self.db.load_product("price")]
+        self.assertEqual(prices, [90.0, 900.0, 1500.0, 50000.0])
+        stock = [row[3] for row in self.db.load_product("stock", descending=True)]
+        self.assertEqual(stock, [10, 7, 5, 2])
+        self.assertEqual([row[0] for row in self.db.load_product()], [1, 2, 3, 4])
+
+    def test_dates_sort_chronologically(self):
+        """
+        Проверяет, что даты в разных форматах сортируются по дню, в том числе
+        при keyset-пагинации по значению даты из показанной строки.
+        """
+        dates = ["2025-02-10", "05.03.2025", "2025-01-15", "01.12.2024", "не дата", "15.01.2025"]
+        self.db.insert_orders_bulk((1, 1, 1, date) for date in dates)
+        expected = ["не дата", "01.12.2024", "2025-01-15", "15.01.2025", "2025-02-10", "05.03.2025"]
+        self.assertEqual([row[4] for row in self.db.load_order("order_date")], expected)
+        for descending in (False, True):
+            rows, page = [], self.db.load_orders_page(limit=2, order_by="order_date", descending=descending)
+            while page:
+                rows.extend(page)
+                page = self.db.load_orders_page(page[-1][0], 2, "order_date", descending, page[-1][4])
+            self.assertEqual([row[4] for row in rows], expected[::-1] if descending else expected)
+
+    def test_search_results_follow_sort_order(self):
+        """
+        Проверяет сортировку результатов поиска по столбцу и отказ для неизвестного столбца.
+        """
+        self.assertEqual([row[2] for row in self.db.search_clients("иван", order_by="email")],
+                         ["a@mail.ru", "b@mail.ru"])
+        self.assertEqual([row[0] for row in self.db.search_clients("иван", order_by="address",
+                                                                   descending=True)], [2, 1])
+        with self.assertRaises(ValueError):
+            self.db.search_clients("иван", order_by="password")
+
+    def test_sort_uses_index(self):
+        """
+        Проверяет, что сортировка по цене читает индекс, а не сортирует во временном B-дереве.
+        """
+        sql = "EXPLAIN QUERY PLAN SELECT id, price FROM Products ORDER BY price, id"
+        plan = " ".join(row[-1] for row in self.db.conn.execute(sql))
+        self.assertIn("idx_products_price", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+
+class TestRowChanges(unittest.TestCase):
+    """
+    Набор тестов для построчного API изменений: ID вставленных строк и чтение одной строки списка.
+    """
+
+    def setUp(self):
+        """
+        Создаёт пустую базу в памяти.
+        """
+        self.db = Database(":memory:")
+
+    def tearDown(self):
+        """
+        Закрывает соединение с базой данных.
+        """
+        self.db.conn.close()
+
+    def test_insert_returns_id_and_row_matches_list(self):
+        """
+        Проверяет, что вставка возвращает ID, а строка по ID совпадает со строкой полного списка.
+        """
+        client_id = self.db.insert_client("Иван Иванов", "ivan@mail.ru", "89001234567", "Москва")
+        product_id = self.db.insert_product("Мышь", 1500.0, 10)
+        order_id = self.db.insert_order(client_id, product_id, 2, "2025-08-14")
+        self.assertEqual((client_id, product_id, order_id), (1, 1, 1))
+        self.assertEqual(self.db.load_client_row(client_id), self.db.load_client()[0])
+        self.assertEqual(self.db.load_product_row(product_id), self.db.load_product()[0])
+        self.assertEqual(self.db.load_order_row(order_id), self.db.load_order()[0])
+
+    def test_row_follows_update_and_delete(self):
+        """
+        Проверяет, что строка по ID отражает изменение и пропадает после удаления.
+        """
+        client_id = self.db.insert_client("Иван Иванов", "ivan@mail.ru", "89001234567", None)
+        product_id = self.db.insert_product("Мышь", 1500.0, 10)
+        order_id = self.db.insert_order(client_id, product_id, 2, "2025-08-14")
+        self.db.update_client(client_id, c_name="Иван Петров")
+        self.assertEqual(self.db.load_order_row(order_id)[1], "Иван Петров")
+        self.db.delete_order(order_id)
+        self.assertIsNone(self.db.load_order_row(order_id))
+
+
+class TestOrderStats(unittest.TestCase):
+    """
+    Набор тестов для сводных таблиц статистики заказов.
+    Проверяет точность счётчиков при изменениях заказов и пересчёт с нуля.
+    """
+
+    def setUp(self):
+        """
+        Создаёт базу в памяти с клиентами, товаром и заказами.
+        """
+        self.db = Database(":memory:")
+        self.db.insert_clients_bulk((f"Клиент {i}", f"c{i}@mail.ru", "81234567890", None) for i in range(8))
+        self.db.insert_product("Товар", 10.0, 5)
+        self.db.insert_orders_bulk((1 + i % 3, 1, 1, f"2025-01-{1 + i % 4:02d}") for i in range(30))
+
+    def tearDown(self):
+        """
+        Закрывает соединение с базой данных.
+        """
+        self.db.conn.close()
+
+    def _expected(self):
+        """
+        Считает статистику группировкой по таблице Orders.
+        """
+        clients = self.db.conn.execute(
+            "SELECT client_id, COUNT(*) FROM Orders WHERE client_id IS NOT NULL GROUP BY client_id").fetchall()
+        days = self.db.conn.execute(
+            "SELECT order_day, COUNT(*) FROM Orders WHERE order_day IS NOT NULL "
+            "GROUP BY order_day ORDER BY order_day").fetchall()
+        return sorted(clients), days
+
+    def _actual(self):
+        """
+        Читает сводные таблицы.
+        """
+        clients = self.db.conn.execute("SELECT client_id, order_count FROM ClientOrderCounts").fetchall()
+        days = self.db.conn.execute("SELECT order_date, order_count FROM DailyOrderCounts ORDER BY order_date")
+        return sorted(clients), days.fetchall()
+
+    def test_triggers_keep_counts_exact(self):
+        """
+        Проверяет счётчики после вставки, изменения клиента и даты и удаления заказов.
+        """
+        self.assertEqual(self._actual(), self._expected())
+        self.db.update_order(1, client_id=5, order_date="2025-02-01")
+        self.db.update_order(2, quantity=7)
+        for order_id in range(10, 20):
+            self.db.delete_order(order_id)
+        self.db.insert_order(None, 1, 1, "2025-01-01")
+        self.assertEqual(self._actual(), self._expected())
+        self.assertEqual(self.db.top_5_client()[0][2], 7)
+
+    def test_top_5_padded_with_clients_without_orders(self):
+        """
+        Проверяет, что топ-5 дополняется клиентами без заказов, как прежний LEFT JOIN.
+        """
+        top = self.db.top_5_client()
+        self.assertEqual([row[2] for row in top], [10, 10, 10, 0, 0])
+        self.assertEqual(len({row[0] for row in top}), 5)
+
+    def test_rebuild_restores_counts(self):
+        """
+        Проверяет, что пересчёт восстанавливает таблицы после изменений в обход триггеров.
+        """
+        self.db.conn.executescript("DROP TRIGGER order_counts_delete; DELETE FROM Orders WHERE id <= 5;")
+        self.assertNotEqual(self._actual(), self._expected())
+        self.db.rebuild_order_stats()
+        self.assertEqual(self._actual(), self._expected())
+
+    def test_top_5_reads_counter_index(self):
+        """
+        Проверяет, что топ-5 читается по индексу счётчиков без сортировки.
+        """
+        sql = "EXPLAIN QUERY PLAN " + """
+            SELECT c.id, c.c_name, s.order_count FROM ClientOrderCounts s
+            CROSS JOIN Clients c ON c.id = s.client_id ORDER BY s.order_count DESC LIMIT 5"""
+        plan = " ".join(row[-1] for row in self.db.conn.execute(sql))
+        self.assertIn("idx_client_order_counts", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_trend_by_period_and_range(self):
+        """
+        Проверяет группировку динамики по неделям, месяцам и кварталам и отбор диапазона дат.
+        """
+        self.db.insert_orders_bulk([(1, 1, 1, "2025-03-31"), (1, 1, 1, "2025-04-06"), (1, 1, 1, "2025-06-30"),
+                                    (1, 1, 1, "2025-12-31"), (1, 1, 1, "не дата")])
+        self.assertEqual(self.db.order_trend("day")[:4], self._actual()[1][:4])
+        self.assertEqual(self.db.order_trend("week"), [("2024-12-30", 30), ("2025-03-31", 2),
+                                                       ("2025-06-30", 1), ("2025-12-29", 1)])
+        self.assertEqual(self.db.order_trend("month", start="2025-02-01"),
+                         [("2025-03-01", 1), ("2025-04-01", 1), ("2025-06-01", 1), ("2025-12-01", 1)])
+        self.assertEqual(self.db.order_trend("quarter", "2025-01-02", "2025-06-30"),
+                         [("2025-01-01", 23), ("2025-04-01", 2)])
+        with self.assertRaises(ValueError):
+            self.db.order_trend("year")
+
+    def test_orders_between_uses_normalised_day(self):
+        """
+        Проверяет выборку за период по нормализованной дате, в том числе введённой как ДД.ММ.ГГГГ,
+        и чтение диапазона по индексу.
+        """
+        dotted = self.db.insert_order(2, 1, 1, "02.01.2025")
+        self.db.insert_order(2, 1, 1, "2 января")
+        self.db.update_order(1, order_date="05.01.2025")
+        rows = self.db.orders_between("2025-01-02", "2025-01-03")
+        self.assertEqual(len(rows), 8 + 7 + 1)
+        self.assertIn(dotted, [row[0] for row in rows])
+        self.assertEqual([row[0] for row in self.db.orders_between("2025-01-05", "2025-01-31")], [1])
+        self.assertEqual(self._actual()[1], [("2025-01-01", 7), ("2025-01-02", 9), ("2025-01-03", 7),
+                                             ("2025-01-04", 7), ("2025-01-05", 1)])
+        self.db.rebuild_order_stats()
+        self.assertEqual(self._actual()[1][1], ("2025-01-02", 9))
+        plan = " ".join(row[-1] for row in self.db.conn.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM Orders WHERE order_day BETWEEN '2025-01-01' AND '2025-01-02'"))
+        self.assertIn("idx_orders_order_day", plan)
+
+
+class TestFrameLoader(unittest.TestCase):
+    """
+    Набор тестов для типизированной выгрузки таблиц в DataFrame и её снимков на диске.
+    """
+
+    def setUp(self):
+        """
+        Создаёт базу во временном каталоге с клиентами, товарами и заказами.
+        """
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "frames.db")
+        self.db = Database(self.path)
+        self.db.insert_clients_bulk((f"Клиент {i % 7}", f"c{i}@mail.ru", "81234567890", None) for i in range(50))
+        self.db.insert_products_bulk((f"Товар {i}", 10.0 + i, i) for i in range(5))
+        self.db.insert_orders_bulk((1 + i % 50, 1 + i % 5, 1 + i % 3, f"2025-01-{1 + i % 28:02d}") for i in range(120))
+        self.db.insert_order(None, 1, 1, "не дата")
+
+    def tearDown(self):
+        """
+        Закрывает соединение и удаляет временный каталог.
+        """
+        self.db.conn.close()
+        self.tmp.cleanup()
+
+    def test_typed_columns_and_projection(self):
+        """
+        Проверяет типы столбцов, выбор столбцов и склейку категорий из разных пачек.
+        """
+        orders = self.db.load_frame("Orders", chunksize=16)
+        self.assertEqual([str(dtype) for dtype in orders.dtypes],
+                         ["int32", "Int32", "Int32", "int32", "datetime64[ns]"])
+        self.assertEqual(len(orders), 121)
+        self.assertEqual(str(orders["order_date"][0].date()), "2025-01-01")
+        self.assertTrue(orders["order_date"].isna().iloc[-1] and orders["client_id"].isna().iloc[-1])
+        names = self.db.load_frame("Clients", ["c_name"], chunksize=8)
+        self.assertEqual(list(names.columns), ["c_name"])
+        self.assertEqual(str(names["c_name"].dtype), "category")
+        self.assertEqual(len(names["c_name"].cat.categories), 7)
+        self.assertEqual(list(names["c_name"][:8]), [f"Клиент {i % 7}" for i in range(8)])
+        with self.assertRaises(ValueError):
+            self.db.load_frame("Orders", ["price"])
+
+    def test_snapshot_reused_until_table_changes(self):
+        """
+        Проверяет, что снимок читается повторно и устаревает после изменения таблицы другим соединением.
+        """
+        first = self.db.load_frame("Products")
+        snapshots = os.listdir(os.path.join(self.tmp.name, "snapshots"))
+        self.assertEqual(len(snapshots), 1)
+        self.assertTrue(self.db.load_frame("Products").equals(first))
+        other = Database(self.path)
+        other.update_product(1, price=99.0)
+        other.conn.close()
+        changed = self.db.load_frame("Products")
+        self.assertEqual(changed["price"][0], 99.0)
+        self.assertNotEqual(os.listdir(os.path.join(self.tmp.name, "snapshots")), snapshots)
+        self.assertEqual(len(os.listdir(os.path.join(self.tmp.name, "snapshots"))), 1)
+
+
+    def test_snapshot_is_plain_arrays(self):
+        """
+        Проверяет, что снимок — архив массивов без объектов Python (читается с
+        `allow_pickle=False`) и восстанавливает категории, NULL, строки и даты.
+        """
+        for table in ("Clients", "Orders"):
+            first = self.db.load_frame(table)
+            again = self.db.load_frame(table)
+            self.assertTrue(again.equals(first))
+            self.assertEqual(list(again.dtypes), list(first.dtypes))
+        self.assertTrue(again["client_id"].isna().iloc[-1] and again["order_date"].isna().iloc[-1])
+        for name in os.listdir(os.path.join(self.tmp.name, "snapshots")):
+            self.assertTrue(name.endswith(".npz"))
+            with np.load(os.path.join(self.tmp.name, "snapshots", name), allow_pickle=False) as data:
+                self.assertTrue(all(data[key].dtype != object for key in data.files))
+
+class TestClientProductGraph(unittest.TestCase):
+    """
+    Набор тестов для подграфа связей клиентов и товаров, отбираемого в SQL.
+    Сравнивает результат с построением полного графа в Python.
+    """
+
+    def setUp(self):
+        """
+        Создаёт базу в памяти с повторяющимися заказами и одноимёнными клиентами.
+        """
+        self.db = Database(":memory:")
+        self.db.insert_clients_bulk(("Иван" if i < 2 else f"Клиент {i}", f"c{i}@mail.ru", "81234567890", None)
+                                    for i in range(12))
+        self.db.insert_products_bulk((f"Товар {i}", 10.0, 5) for i in range(6))
+        self.db.insert_orders_bulk((1 + i % 12, 1 + (i * 7) % 6 // (1 + i % 3), 1 + i % 4, "2025-01-01")
+                                   for i in range(300))
+
+    def tearDown(self):
+        """
+        Закрывает соединение с базой данных.
+        """
+        self.db.conn.close()
+
+    def _reference(self, top_n):
+        """
+        Строит граф по всем заказам и отбирает узлы с наибольшей степенью.
+        """
+        weights = {}
+        for client_id, product_id, quantity in self.db.conn.execute(
+                "SELECT client_id, product_id, quantity FROM Orders"):
+            orders, total = weights.get((client_id, product_id), (0, 0))
+            weights[(client_id, product_id)] = (orders + 1, total + quantity)
+        degrees = {}
+        for client_id, product_id in weights:
+            degrees[("client", client_id)] = degrees.get(("client", client_id), 0) + 1
+            degrees[("product", product_id)] = degrees.get(("product", product_id), 0) + 1
+        ranked = sorted(degrees.items(), key=lambda item: (-item[1], item[0]))
+        top = dict(ranked if top_n is None else ranked[:top_n])
+        edges = {edge: weight for edge, weight in weights.items()
+                 if ("client", edge[0]) in top and ("product", edge[1]) in top}
+        return top, edges
+
+    def test_matches_full_graph(self):
+        """
+        Проверяет узлы, степени и веса связей для разных ограничений и видов веса.
+        """
+        for top_n in (None, 5, 8):
+            top, edges = self._reference(top_n)
+            nodes, orders = self.db.client_product_subgraph(top_n)
+            self.assertEqual({(kind, node_id): degree for kind, node_id, _, degree in nodes}, top)
+            self.assertEqual([degree for *_, degree in nodes], sorted(top.values(), reverse=True))
+            self.assertEqual({(c, p): w for c, p, w in orders}, {edge: w[0] for edge, w in edges.items()})
+            _, quantities = self.db.client_product_subgraph(top_n, weight="quantity")
+            self.assertEqual({(c, p): w for c, p, w in quantities}, {edge: w[1] for edge, w in edges.items()})
+        names = {(kind, node_id): name for kind, node_id, name, _ in self.db.client_product_subgraph()[0]}
+        self.assertEqual((names[("client", 1)], names[("client", 2)]), ("Иван", "Иван"))
+        with self.assertRaises(ValueError):
+            self.db.client_product_subgraph(weight="price")
+
+
+class TestQueryCache(unittest.TestCase):
+    """
+    Набор тестов для кэша результатов запросов статистики.
+    Проверяет попадания без обращения к таблицам, сброс при изменении данных и вытеснение.
+    """
+
+    def setUp(self):
+        """
+        Создаёт файловую базу во временном каталоге с клиентами, товаром и заказами.
+        """
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "store.db")
+        self.db = Database(self.path)
+        self.db.insert_clients_bulk((f"Клиент {i}", f"c{i}@mail.ru", "81234567890", None) for i in range(3))
+        self.db.insert_product("Товар", 10.0, 5)
+        self.db.insert_orders_bulk((1 + i % 3, 1, 1, "2025-01-01") for i in range(6))
+        self.statements = []
+        self.db.conn.set_trace_callback(self.statements.append)
+
+    def tearDown(self):
+        """
+        Закрывает соединение и удаляет временный каталог.
+        """
+        self.db.conn.close()
+        self.tmp.cleanup()
+
+    def test_repeated_call_served_from_cache(self):
+        """
+        Проверяет, что повторный вызов без изменений не выполняет запрос к таблицам.
+        """
+        first = self.db.top_5_client()
+        self.statements.clear()
+        self.assertEqual(self.db.top_5_client(), first)
+        self.assertEqual(self.statements, ["PRAGMA data_version"])
+        stats = self.db.query_cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+
+    def test_callers_get_copies(self):
+        """
+        Проверяет, что изменение полученного результата, в том числе списков внутри
+        кортежа `client_product_subgraph`, не портит запомненное значение.
+        """
+        nodes, edges = self.db.client_product_subgraph()
+        expected = (list(nodes), list(edges))
+        nodes.clear()
+        edges.append((0, 0, 0))
+        self.assertEqual(self.db.client_product_subgraph(), expected)
+        self.db.top_5_client().clear()
+        self.assertEqual(len(self.db.top_5_client()), 3)
+        self.assertEqual(self.db.query_cache.hits, 2)
+
+    def test_invalidated_by_own_and_other_writes(self):
+        """
+        Проверяет сброс кэша после записи через это же и через другое соединение.
+        """
+        self.assertEqual(self.db.order_trend(), [("2025-01-01", 6)])
+        self.db.insert_order(1, 1, 1, "2025-01-02")
+        self.assertEqual(self.db.order_trend(), [("2025-01-01", 6), ("2025-01-02", 1)])
+        other = Database(self.path)
+        other.delete_order(7)
+        other.conn.close()
+        self.assertEqual(self.db.order_trend(), [("2025-01-01", 6)])
+        self.assertEqual(self.db.query_cache.hits, 0)
+
+    def test_lru_eviction(self):
+        """
+        Проверяет, что кэш ограничен и вытесняет самый давно использованный результат.
+        """
+        cache = QueryCache(maxsize=2)
+        for key in ("a", "b"):
+            cache.lookup(1, key)
+            cache.store(key, key)
+        cache.lookup(1, "a")
+        cache.store("c", "c")
+        self.assertEqual(cache.lookup(1, "b"), (False, None))
+        self.assertEqual(cache.lookup(1, "a"), (True, "a"))
+        self.assertEqual(cache.lookup(2, "a"), (False, None))
@@ -0,0 +1,89 @@
+import csv
+import gzip
+import os
+import tempfile
+import threading
+import unittest
+from db import Database
+from export import ExportCancelled, export_view, write_csv
+
+
+class TestExport(unittest.TestCase):
+    """
+    Набор тестов для потоковой выгрузки списков в CSV.
+    Проверяет фильтры выгрузки, сжатие, пачки и отмену.
+    """
+
+    def setUp(self):
+        """
+        Создаёт базу во временном каталоге с клиентами, товарами и заказами.
+        """
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = Database(os.path.join(self.tmp.name, "export.db"))
+        self.db.insert_clients_bulk((f"{'Иван' if i % 2 else 'Пётр'} {i}", f"c{i}@mail.ru", "81234567890", None)
+                                    for i in range(20))
+        self.db.insert_products_bulk((f"Товар {i}", 10.0 + i, i) for i in range(5))
+        self.db.insert_orders_bulk((1 + i % 20, 1 + i % 5, 1 + i % 3, f"2025-01-{1 + i % 28:02d}") for i in range(60))
+
+    def tearDown(self):
+        """
+        Закрывает соединение и удаляет временный каталог.
+        """
+        self.db.conn.close()
+        self.tmp.cleanup()
+
+    def test_view_applies_search_range_and_sort(self):
+        """
+        Проверяет, что выгрузка повторяет поиск, период и сортировку окна без ограничения количества.
+        """
+        clients = list(self.db.iter_view("clients", "Иван", "c_name", True, batch_size=3))
+        self.assertEqual(len(clients), 10)
+        self.assertEqual(self.db.count_view("clients", "Иван"), 10)
+        self.assertEqual([row[1] for row in clients], sorted((row[1] for row in clients), reverse=True))
+        self.assertEqual(list(self.db.iter_view("clients", "!!!")), [])
+
+        period = ("2025-01-05", "2025-01-10")
+        orders = list(self.db.iter_view("orders", date_range=period, order_by="quantity"))
+        self.assertEqual(len(orders), self.db.count_view("orders", date_range=period))
+        self.assertEqual(sorted(orders, key=lambda row: (row[3], row[0])), orders)
+        self.assertTrue(all(period[0] <= row[4] <= period[1] for row in orders))
+        self.assertEqual(self.db.count_view("orders", "Иван", period),
+                         sum(row[1].startswith("Иван") for row in orders))
+        with self.assertRaises(ValueError):
+            self.db.count_view("clients", date_range=period)
+
+    def test_gzip_export_reports_progress(self):
+        """
+        Проверяет сжатую выгрузку по пачкам и сообщения о ходе с общим количеством строк.
+        """
+        path = os.path.join(self.tmp.name, "orders.csv.gz")
+        progress = []
+        written = export_view(self.db, "orders", ["ID", "Клиент", "Товар", "Кол-во", "Дата"], path,
+                              progress=lambda done, total: progress.append((done, total)))
+        self.assertEqual(written, 60)
+        self.assertEqual(progress[0], (0, 60))
+        self.assertEqual(progress[-1], (60, 60))
+        with gzip.open(path, "rt", encoding="utf-8", newline="") as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows[0], ["ID", "Клиент", "Товар", "Кол-во", "Дата"])
+        self.assertEqual([int(row[0]) for row in rows[1:]], list(range(1, 61)))
+
+        chunks = []
+        write_csv(iter([(i,) for i in range(25)]), os.path.join(self.tmp.name, "plain.csv"), ["n"],
+                  progress=chunks.append, chunk_size=10)
+        self.assertEqual(chunks, [10, 20, 25])
+
+    def test_cancel_keeps_previous_file(self):
+        """
+        Проверяет, что отменённая выгрузка не портит существующий файл и удаляет временный.
+        """
+        path = os.path.join(self.tmp.name, "clients.csv")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("старый файл")
+        cancel = threading.Event()
+        with self.assertRaises(ExportCancelled):
+            write_csv(((i,) for i in range(100)), path, ["n"], chunk_size=10,
+                      progress=lambda written: written >= 30 and cancel.set(), cancel=cancel)
+        with open(path, encoding="utf-8") as f:
+            self.assertEqual(f.read(), "старый файл")
+        self.assertFalse(os.path.exists(f"{path}.part"))
@@ -0,0 +1,125 @@
+import csv
+import gzip
+import json
+import os
+import tempfile
+import threading
+import unittest
+from db import Database
+from importer import ImportCancelled, import_file, read_records, report_path_for
+
+
+class TestImport(unittest.TestCase):
+    """
+    Набор тестов для импорта клиентов, товаров и заказов из CSV и JSON.
+    Проверяет проверку записей, поиск ссылок, отчёт об ошибках и согласованность базы.
+    """
+
+    def setUp(self):
+        """
+        Создаёт базу во временном каталоге с двумя однофамильцами и товаром.
+        """
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = Database(os.path.join(self.tmp.name, "import.db"))
+        self.db.insert_clients_bulk([("Иван", "ivan@mail.ru", "89001234567", "Москва"),
+                                     ("Иван", "ivan2@mail.ru", "89001234568", "Тула"),
+                                     ("Пётр", "petr@mail.ru", "+79001234567", "Сочи")])
+        self.db.insert_product("Мышь", 1500.0, 10)
+
+    def tearDown(self):
+        """
+        Закрывает соединение и удаляет временный каталог.
+        """
+        self.db.conn.close()
+        self.tmp.cleanup()
+
+    def _path(self, name: str) -> str:
+        """
+        Returns:
+            str: Путь к файлу во временном каталоге.
+        """
+        return os.path.join(self.tmp.name, name)
+
+    def _report(self, path: str) -> list:
+        """
+        Returns:
+            list: Строки отчёта об отклонённых записях без заголовка.
+        """
+        with open(report_path_for(path), encoding="utf-8", newline="") as f:
+            return list(csv.reader(f))[1:]
+
+    def test_csv_rows_validated_by_models(self):
+        """
+        Проверяет, что CSV в формате экспорта импортируется, а записи,
+        которые отвергает `models.Client`, попадают в отчёт с номером строки.
+        """
+        path = self._path("clients.csv")
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["ID", "Имя", "Email", "Телефон", "Адрес"])
+            writer.writerow([10, "Анна", "anna@mail.ru", "89990000000", "Казань"])
+            writer.writerow([11, "Борис", "не email", "89990000001", "Омск"])
+            writer.writerow([12, "Вера", "vera@mail.ru", "123"])
+            writer.writerow([13, "Глеб", "gleb@mail.ru", "+79990000002", "Уфа"])
+        self.assertEqual(import_file(self.db, "clients", path, batch_size=2), (2, 2))
+        self.assertEqual([row[1] for row in self.db.load_client()[3:]], ["Анна", "Глеб"])
+        report = self._report(path)
+        self.assertEqual([row[0] for row in report], ["3", "4"])
+        self.assertIn("email", report[0][1])
+        self.assertEqual(json.loads(report[0][2])[2], "не email")
+        self.assertEqual(self.db.search_clients("Глеб"), [self.db.load_client()[-1]])
+
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("Имя,Email\nАнна,anna@mail.ru\n")
+        with self.assertRaises(ValueError):
+            import_file(self.db, "clients", path)
+
+    def test_json_orders_resolve_references(self):
+        """
+        Проверяет потоковое чтение JSON, поиск клиентов и товаров по ID и имени,
+        приведение дат к ГГГГ-ММ-ДД с отклонением других форматов и обновление сводных таблиц и поиска по импортированным заказам.
+        """
+        records = [{"client": "Пётр", "product": "Мышь", "quantity": 2, "order_date": "2025-03-01"},
+                   {"client_id": 1, "product_id": "1", "quantity": "3", "order_date": "02.03.2025"},
+                   {"client": "Иван", "product": "Мышь", "quantity": 1, "order_date": "2025-03-01"},
+                   {"client": "Пётр", "product": "Клавиатура", "quantity": 1, "order_date": "2025-03-01"},
+                   {"client": "Пётр", "product": "Мышь", "quantity": 0, "order_date": "2025-03-01"},
+                   {"client": "Пётр", "product": "Мышь", "quantity": 1, "order_date": "2025/03/01"},
+                   "не объект"]
+        path = self._path("orders.json.gz")
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            json.dump(records, f, ensure_ascii=False, indent=1)
+        self.assertEqual([number for number, _, _ in read_records(path, "orders")], list(range(1, 8)))
+        self.assertEqual(import_file(self.db, "orders", path), (2, 5))
+        self.assertEqual([row[1:] for row in self.db.load_order()],
+                         [("Пётр", "Мышь", 2, "2025-03-01"), ("Иван", "Мышь", 3, "2025-03-02")])
+        errors = {int(number): error for number, error, _ in self._report(path)}
+        self.assertIn("Неоднозначное", errors[3])
+        self.assertIn("Клавиатура", errors[4])
+        self.assertIn("ГГГГ-ММ-ДД", errors[6])
+        self.assertEqual(sorted(errors), [3, 4, 5, 6, 7])
+
+        self.assertEqual(len(self.db.search_orders("Пётр")), 1)
+        daily = self.db.conn.execute("SELECT order_date, order_count FROM DailyOrderCounts ORDER BY 1").fetchall()
+        self.assertEqual(daily, [("2025-03-01", 1), ("2025-03-02", 1)])
+        # Триггеры восстановлены: обычная вставка снова ведёт сводные таблицы
+        self.db.insert_order(3, 1, 1, "2025-03-01")
+        self.assertEqual(self.db.conn.execute(
+            "SELECT order_count FROM ClientOrderCounts WHERE client_id = 3").fetchone(), (2,))
+
+    def test_cancel_rolls_back(self):
+        """
+        Проверяет, что отмена импорта не оставляет в базе ни строк, ни отчёта.
+        """
+        path = self._path("products.jsonl")
+        with open(path, "w", encoding="utf-8") as f:
+            for i in range(50):
+                f.write(json.dumps({"p_name": f"Товар {i}", "price": i, "stock": i}, ensure_ascii=False) + "\n")
+        cancel = threading.Event()
+        with self.assertRaises(ImportCancelled):
+            import_file(self.db, "products", path, batch_size=10,
+                        progress=lambda done, total: done >= 20 and cancel.set(), cancel=cancel)
+        self.assertEqual(len(self.db.load_product()), 1)
+        self.assertFalse(os.path.exists(report_path_for(path)))
+        self.assertEqual(import_file(self.db, "products", path), (50, 0))
+        self.assertEqual(len(self.db.search_products("Товар")), 50)
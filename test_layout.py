@@ -0,0 +1,99 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from layout import (LayoutCache, build_client_product_graph, choose_algorithm, compute_layout,
+                    force_layout, graph_hash, label_nodes)
+
+
+def _subgraph(clients, products):
+    """
+    Создаёт узлы и связи: каждый клиент связан с двумя товарами.
+    """
+    nodes = [("client", i, f"Клиент {i}", 2) for i in range(clients)]
+    nodes += [("product", i, f"Товар {i}", 1) for i in range(products)]
+    edges = [(i, (i + k) % products, 1) for i in range(clients) for k in (0, 1)]
+    return nodes, edges
+
+
+class TestGraphLayout(unittest.TestCase):
+    """
+    Набор тестов для раскладки графа связей клиентов и товаров.
+    Проверяет выбор алгоритма, ключ кэша и отбор подписей.
+    """
+
+    def test_algorithm_by_size(self):
+        """
+        Проверяет, что каждый алгоритм даёт координаты всех узлов в пределах [-1, 1].
+        """
+        for clients, algorithm in ((10, "bipartite"), (100, "spring"), (400, "force")):
+            graph = build_client_product_graph(_subgraph(clients, clients))
+            self.assertEqual(choose_algorithm(len(graph)), algorithm)
+            pos = compute_layout(graph)
+            coords = np.array([pos[node] for node in graph])
+            self.assertEqual(coords.shape, (len(graph), 2))
+            self.assertTrue(np.all(np.isfinite(coords)))
+            self.assertLessEqual(np.abs(coords).max(), 1.0 + 1e-9)
+
+    def test_force_layout_is_deterministic(self):
+        """
+        Проверяет, что NumPy-раскладка с одним начальным значением повторяется.
+        """
+        graph = build_client_product_graph(_subgraph(50, 30))
+        first, second = force_layout(graph, iterations=10), force_layout(graph, iterations=10)
+        self.assertTrue(all(np.allclose(first[node], second[node]) for node in graph))
+
+    def test_hash_ignores_insertion_order(self):
+        """
+        Проверяет, что ключ не зависит от порядка узлов, но меняется при новой связи.
+        """
+        nodes, edges = _subgraph(5, 4)
+        graph = build_client_product_graph((nodes, edges))
+        reversed_graph = build_client_product_graph((nodes[::-1], edges[::-1]))
+        self.assertEqual(graph_hash(graph, "spring"), graph_hash(reversed_graph, "spring"))
+        self.assertNotEqual(graph_hash(graph, "spring"), graph_hash(graph, "force"))
+        reversed_graph.add_edge(("client", 0), ("product", 3))
+        self.assertNotEqual(graph_hash(graph, "spring"), graph_hash(reversed_graph, "spring"))
+
+    def test_cached_layout_is_reused(self):
+        """
+        Проверяет, что повторная раскладка читается с диска, а не вычисляется заново.
+        """
+        graph = build_client_product_graph(_subgraph(10, 10))
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = LayoutCache(os.path.join(tmp, "layouts"))
+            pos = compute_layout(graph, cache)
+            key = graph_hash(graph, choose_algorithm(len(graph)))
+            nodes = sorted(graph, key=repr)
+            cache.put(key, nodes, {node: (0.5, 0.5) for node in nodes})
+            cached = compute_layout(graph, cache)
+            self.assertEqual(set(cached), set(pos))
+            self.assertTrue(all(np.allclose(xy, (0.5, 0.5)) for xy in cached.values()))
+            with open(os.path.join(tmp, "layouts", f"{key}.npy"), "wb") as f:
+                f.write(b"not a layout")
+            self.assertIsNone(cache.get(key, nodes))
+
+    def test_cache_beside_database_is_pruned(self):
+        """
+        Проверяет, что кэш лежит рядом с файлом базы и хранит только последние раскладки,
+        причём прочитанная раскладка считается недавно использованной.
+        """
+        nodes = [("client", 0)]
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = LayoutCache.beside(os.path.join(tmp, "store.db"), limit=2)
+            self.assertEqual(cache.directory, os.path.join(tmp, "layout_cache"))
+            for age, key in enumerate(["c", "b", "a"]):
+                cache.put(key, nodes, {nodes[0]: (0.0, 0.0)})
+                os.utime(os.path.join(cache.directory, f"{key}.npy"), (1000 + age, 1000 + age))
+            self.assertEqual(sorted(os.listdir(cache.directory)), ["a.npy", "b.npy"])
+            self.assertIsNotNone(cache.get("b", nodes))
+            cache.put("d", nodes, {nodes[0]: (0.0, 0.0)})
+            self.assertEqual(sorted(os.listdir(cache.directory)), ["b.npy", "d.npy"])
+
+    def test_labels_culled_by_degree(self):
+        """
+        Проверяет, что подписи получают только узлы с наибольшей степенью.
+        """
+        graph = build_client_product_graph(_subgraph(20, 4))
+        labels = label_nodes(graph, 4)
+        self.assertEqual(sorted(labels), [("product", i) for i in range(4)])
@@ -1,5 +1,8 @@
 import unittest
-from models import Client, Product, Order
+import numpy as np
+import pandas as pd
+import sys
+from models import Client, Product, Order, VALID, ClientBatch, OrderBatch, ProductBatch, TextColumn
 
 
 class TestClient(unittest.TestCase):
@@ -212,4 +215,202 @@ class TestOrder(unittest.TestCase):
         """
         order = Order(1, 101, 3, '2025-08-22')
         expected = "Order(Client=1, Product=101, Quantity=3, Order_date='2025-08-22')"
-        self.assertEqual(str(order), expected)
\ No newline at end of file
+        self.assertEqual(str(order), expected)
+
+
+def _object_codes(model, rows):
+    """
+    Проверяет записи по одной через конструктор модели и переводит исключения в коды `ERRORS`.
+    Returns:
+        tuple[list, list]: Коды записей и тексты исключений (None для корректных).
+    """
+    codes, messages = [], []
+    for row in rows:
+        try:
+            model(*row)
+        except (TypeError, ValueError) as e:
+            values = dict(zip(model.FIELDS, row))
+            codes.append(next(code for code, (field, _) in model.ERRORS.items()
+                              if str(e) == model.message(code, values[field])))
+            messages.append(str(e))
+        else:
+            codes.append(VALID)
+            messages.append(None)
+    return codes, messages
+
+
+class TestBatchValidation(unittest.TestCase):
+    """
+    Набор тестов для пакетной проверки моделей по столбцам.
+    Проверяет, что коды ошибок совпадают с исключениями конструкторов на тех же данных.
+    """
+
+    def assert_parity(self, model, rows):
+        """
+        Сравнивает пакетную проверку списков с проверкой по одной записи.
+        """
+        expected, messages = _object_codes(model, rows)
+        codes = model.validate_batch(*map(list, zip(*rows)))
+        self.assertEqual(codes.tolist(), expected)
+        for code, row, message in zip(codes, rows, messages):
+            if code != VALID:
+                field = model.ERRORS[code][0]
+                self.assertEqual(model.message(code, row[model.FIELDS.index(field)]), message)
+
+    def test_client_parity(self):
+        """
+        Проверяет совпадение для пустых значений, нестроковых полей и перевода строки
+        в конце (`$` регулярного выражения допускает его так же, как в `re.match`).
+        """
+        self.assert_parity(Client, [
+            ("Иван", "ivan@ivanov.com", "81234567890", "Москва"),
+            ("", "bad", "1", ""),
+            (None, "ivan@ivanov.com", "81234567890", "Москва"),
+            ("Иван", "ivan@ivanov", "81234567890", "Москва"),
+            ("Иван", None, "81234567890", "Москва"),
+            ("Иван", "ivan@ivanov.com\n", "+71234567890", "Москва"),
+            ("Иван", "ivan@ivanov.com", 81234567890, "Москва"),
+            ("Иван", "ivan@ivanov.com", "+7123456789", "Москва"),
+            ("Иван", "ivan@ivanov.com", "81234567890", ""),
+            (0, "ivan@ivanov.com", "81234567890", "Москва"),
+        ])
+
+    def test_product_parity(self):
+        """
+        Проверяет совпадение для строк вместо чисел, bool, NaN, отрицательных значений
+        и порядка проверок (цена раньше количества, наименование последним).
+        """
+        self.assert_parity(Product, [
+            ("Ноутбук", 50000.0, 10),
+            ("Ноутбук", "100", 10),
+            ("Ноутбук", -1, 10),
+            ("Ноутбук", 1, 2.0),
+            ("Ноутбук", 1, -5),
+            ("", 1, 1),
+            ("", -1, -1),
+            ("Ноутбук", True, False),
+            ("Ноутбук", float("nan"), 0),
+            ("Ноутбук", None, None),
+        ])
+
+    def test_order_parity(self):
+        """
+        Проверяет совпадение для строковых ID, дробного и неположительного количества.
+        """
+        self.assert_parity(Order, [
+            (1, 101, 3, "2025-08-22"),
+            ("1", 101, 3, "2025-08-22"),
+            (1, "101", 3, "2025-08-22"),
+            (1, 101, 2.5, "2025-08-22"),
+            (1, 101, 0, "2025-08-22"),
+            (1, 101, -2, None),
+            (None, None, None, None),
+        ])
+
+    def assert_frame_parity(self, model, frame):
+        """
+        Сравнивает проверку DataFrame с конструктором на значениях из того же DataFrame
+        (числа NumPy, как у `frame[field][i]`).
+        """
+        rows = list(zip(*(frame[field].to_numpy() for field in model.FIELDS)))
+        self.assertEqual(model.validate_frame(frame).tolist(), _object_codes(model, rows)[0])
+
+    def test_frame_parity(self):
+        """
+        Проверяет, что числа NumPy из DataFrame одинаково принимаются пакетной проверкой
+        и конструкторами, а столбцы bool и дробное количество одинаково отклоняются.
+        """
+        self.assert_frame_parity(Product, pd.DataFrame({"name": ["a", "b", ""], "price": [1.0, -2.0, 3.0],
+                                                        "stock": [3, 0, 1]}))
+        self.assert_frame_parity(Product, pd.DataFrame({"name": ["a"], "price": [1], "stock": [True]}))
+        self.assert_frame_parity(Order, pd.DataFrame({"client_id": [1, 2], "product_id": [3, 4],
+                                                      "quantity": [2, 0], "order_date": ["2025-01-01", None]}))
+        self.assert_frame_parity(Order, pd.DataFrame({"client_id": [1], "product_id": [3], "quantity": [2.0],
+                                                      "order_date": ["2025-01-01"]}))
+        frame = pd.DataFrame({"name": ["a"], "price": [1.0], "stock": [3]})
+        self.assertEqual(Product.validate_frame(frame).tolist(), [VALID])
+        product = Product("a", frame.price[0], frame.stock[0])
+        self.assertEqual((type(product.price), type(product.stock)), (float, int))
+
+    def test_frame_and_typed_columns(self):
+        """
+        Проверяет DataFrame и числовые столбцы NumPy: тип решается по dtype массива.
+        """
+        frame = pd.DataFrame({"name": ["Мышь", "", "Клавиатура"], "price": [10.0, 5.0, -1.0],
+                              "stock": np.array([1, 2, 3], dtype=np.int64)})
+        self.assertEqual(Product.validate_frame(frame).tolist(), [VALID, 5, 2])
+        self.assertEqual(Product.validate_batch(frame["name"], frame["price"], frame["price"]).tolist(), [3, 3, 2])
+        self.assertEqual(Client.valid_mask(np.array(["Иван"]), np.array(["ivan@ivanov.com"]),
+                                           np.array(["81234567890"]), np.array([""])).tolist(), [False])
+        self.assertEqual(Order.validate_batch([], [], [], []).tolist(), [])
+        with self.assertRaises(ValueError):
+            Order.validate_batch([1], [1, 2], [1], ["2025-01-01"])
+
+
+class TestRowBatch(unittest.TestCase):
+    """
+    Набор тестов для моделей со `__slots__` и столбцовых пачек строк.
+    """
+
+    def test_slots_and_row_round_trip(self):
+        """
+        Проверяет, что у моделей нет `__dict__`, а `from_row`/`to_row`
+        переводят строку таблицы в объект и обратно.
+        """
+        client = Client("Иван", "ivan@ivanov.com", "81234567890", "Москва")
+        self.assertFalse(hasattr(client, "__dict__"))
+        self.assertIsNone(client.id)
+        with self.assertRaises(AttributeError):
+            client.nickname = "ваня"
+
+        product = Product.from_row((7, "Мышь", 1500.0, 3))
+        self.assertEqual((product.id, product.price, product.stock), (7, 1500.0, 3))
+        self.assertEqual(product.to_row(), ("Мышь", 1500.0, 3))
+        order = Order.from_row((5, None, 2, 1, "2025-01-01"))
+        self.assertEqual((order.id, order.to_row()), (5, (None, 2, 1, "2025-01-01")))
+        self.assertEqual(Client.from_row((1, *client.to_row())).to_row(), client.to_row())
+
+    def test_batch_returns_same_rows(self):
+        """
+        Проверяет, что пачка, собранная по частям, отдаёт те же кортежи с NULL
+        и не-ASCII строками, хранит числа в массивах и занимает меньше списка кортежей.
+        """
+        rows = [(i, None if i % 4 == 0 else i % 7, 1 + i % 3, i, f"2025-01-{1 + i % 28:02d}") for i in range(1, 11)]
+        batch = OrderBatch.from_rows(iter(rows), chunk_size=3)
+        self.assertEqual(list(batch), rows)
+        self.assertEqual((len(batch), batch[0], batch[-1]), (10, rows[0], rows[-1]))
+        self.assertEqual(batch.column("quantity").dtype, np.int32)
+        self.assertEqual(batch.nulls["client_id"].tolist(), [row[1] is None for row in rows])
+        self.assertEqual(batch.model(3).client_id, None)
+        self.assertEqual([order.to_row() for order in batch.models()], [row[1:] for row in rows])
+        with self.assertRaises(IndexError):
+            batch[10]
+
+        clients = [(1, "Пётр", "p@mail.ru", "81234567890", None), (2, "Анна", "a@mail.ru", "+71234567890", "Сочи")]
+        batch = ClientBatch.from_rows(clients)
+        self.assertEqual(list(batch), clients)
+        self.assertEqual(batch.column("name")[0], "Пётр")
+        self.assertIsInstance(batch.column("address"), TextColumn)
+        self.assertLess(batch.nbytes, sum(sys.getsizeof(row) + sum(map(sys.getsizeof, row)) for row in clients))
+        self.assertEqual(list(ProductBatch.from_rows([])), [])
+
+    def test_inexact_numbers_kept_as_is(self):
+        """
+        Проверяет, что пачка отдаёт те же значения, что читатели базы: 64-битные ID
+        хранятся числами, а дроби и текст в целом столбце не обрезаются и не становятся NULL.
+        """
+        rows = [(2 ** 40, 2 ** 40 + 1, None, 2, "2025-01-01"), (2, 3, 4, 5, None)]
+        batch = OrderBatch.from_rows(rows)
+        self.assertEqual(list(batch), rows)
+        self.assertEqual(batch.column("id").dtype, np.int64)
+        self.assertEqual(batch.nulls["product_id"].tolist(), [True, False])
+
+        rows = [(1, 3, 4, 2.5, "2025-01-01"), (2, 3, None, "7", "x"), (3, 3, 4, 2 ** 40, "x")]
+        batch = OrderBatch.from_rows(rows, chunk_size=2)
+        self.assertEqual(list(batch), rows)
+        self.assertEqual(batch.column("quantity").dtype, object)
+        self.assertEqual(batch.column("product_id").dtype, np.int64)
+        prices = ProductBatch.from_rows([(1, "Мышь", "дёшево", 3), (2, "Коврик", 150, 1)])
+        self.assertEqual(list(prices), [(1, "Мышь", "дёшево", 3), (2, "Коврик", 150.0, 1)])
+        product = Product.from_row((2, "Коврик", 150, 1))
+        self.assertIsInstance(product.price, float)
@@ -0,0 +1,589 @@
+import threading
+import unittest
+from concurrent.futures import Future
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from widgets import (BlitTooltip, ChartManager, DebouncedSearch, IdPicker, KeyedTreeview, NameCache,
+                     PrefixIndex, deliver, lttb, replace_row)
+
+
+class FakeWidget:
+    """
+    Заменитель виджета Tk для тестов: вызовы `after` копятся в очереди
+    и выполняются явно методом `pump`, как это делал бы цикл событий Tk.
+    """
+
+    def __init__(self):
+        """
+        Создаёт пустую очередь отложенных вызовов.
+        """
+        self.pending = {}
+        self.lock = threading.Lock()
+        self.next_id = 0
+        self.alive = True
+
+    def after(self, ms, func, *args):
+        """
+        Ставит вызов в очередь (задержка игнорируется).
+        """
+        with self.lock:
+            self.next_id += 1
+            self.pending[self.next_id] = (func, args)
+            return self.next_id
+
+    def after_cancel(self, after_id):
+        """
+        Убирает вызов из очереди.
+        """
+        with self.lock:
+            self.pending.pop(after_id, None)
+
+    def winfo_exists(self):
+        """
+        Возвращает, существует ли ещё окно.
+        """
+        return self.alive
+
+    def pump(self):
+        """
+        Выполняет все накопленные вызовы.
+        """
+        with self.lock:
+            calls, self.pending = list(self.pending.values()), {}
+        for func, args in calls:
+            func(*args)
+
+
+class TestDeliver(unittest.TestCase):
+    """
+    Набор тестов для передачи результатов фоновых задач в поток Tk.
+    """
+
+    def setUp(self):
+        """
+        Создаёт заменитель виджета и списки полученных результатов и ошибок.
+        """
+        self.widget = FakeWidget()
+        self.results = []
+        self.errors = []
+
+    def _deliver(self):
+        """
+        Создаёт незавершённую задачу, результат которой передаётся через `deliver`.
+        """
+        future = Future()
+        deliver(self.widget, future, self.results.append, self.errors.append)
+        return future
+
+    def test_result_and_error_arrive_through_after(self):
+        """
+        Проверяет, что результат и ошибка передаются только при обработке очереди Tk.
+        """
+        self._deliver().set_result(42)
+        self._deliver().set_exception(ValueError("нет"))
+        self.assertEqual((self.results, self.errors), ([], []))
+        self.widget.pump()
+        self.assertEqual(self.results, [42])
+        self.assertIsInstance(self.errors[0], ValueError)
+
+    def test_closed_window_drops_result(self):
+        """
+        Проверяет, что результат для закрытого окна отбрасывается.
+        """
+        self._deliver().set_result(42)
+        self.widget.alive = False
+        self.widget.pump()
+        self.assertEqual(self.results, [])
+
+
+class FakeCombo(FakeWidget):
+    """
+    Заменитель `ttk.Combobox` для тестов: хранит текст, варианты и состояние.
+    """
+
+    def __init__(self):
+        """
+        Создаёт пустой список во включённом состоянии.
+        """
+        super().__init__()
+        self.options = {"state": "normal", "values": []}
+        self.text = ""
+
+    def configure(self, **options):
+        """
+        Запоминает параметры виджета.
+        """
+        self.options.update(options)
+
+    def bind(self, sequence, func, add=None):
+        """
+        Привязки событий в тестах не нужны.
+        """
+
+    def get(self):
+        """
+        Возвращает введённый текст.
+        """
+        return self.text
+
+    def set(self, text):
+        """
+        Заменяет введённый текст.
+        """
+        self.text = text
+
+
+class FakeTree:
+    """
+    Заменитель `ttk.Treeview` для тестов: хранит элементы по iid и считает
+    операции, изменяющие таблицу.
+    """
+
+    def __init__(self):
+        """
+        Создаёт пустую таблицу.
+        """
+        self.items = {}
+        self.order = []
+        self.operations = 0
+
+    def get_children(self):
+        """
+        Возвращает iid элементов по порядку.
+        """
+        return tuple(self.order)
+
+    def insert(self, parent, index, iid, values):
+        """
+        Добавляет элемент в конец таблицы.
+        """
+        self.operations += 1
+        self.items[iid] = values
+        self.order.append(iid)
+
+    def item(self, iid, values):
+        """
+        Изменяет значения элемента.
+        """
+        self.operations += 1
+        self.items[iid] = values
+
+    def delete(self, *iids):
+        """
+        Удаляет элементы.
+        """
+        self.operations += len(iids)
+        for iid in iids:
+            del self.items[iid]
+            self.order.remove(iid)
+
+    def move(self, iid, parent, index):
+        """
+        Переставляет элемент на позицию `index`.
+        """
+        self.operations += 1
+        self.order.remove(iid)
+        self.order.insert(index, iid)
+
+
+class TestKeyedTreeview(unittest.TestCase):
+    """
+    Набор тестов для таблицы с элементами по первичному ключу.
+    Проверяет, что изменяются только отличающиеся строки.
+    """
+
+    def setUp(self):
+        """
+        Создаёт таблицу с тремя строками.
+        """
+        self.tree = FakeTree()
+        self.table = KeyedTreeview(self.tree)
+        self.rows = [(1, "Иван"), (2, "Мария"), (3, "Пётр")]
+        self.table.show(self.rows)
+        self.tree.operations = 0
+
+    def test_show_changes_only_differences(self):
+        """
+        Проверяет, что повторный показ изменяет только отличающиеся строки и порядок.
+        """
+        self.table.show(self.rows)
+        self.assertEqual(self.tree.operations, 0)
+        self.table.show([(3, "Пётр"), (1, "Иван Иванов")])
+        self.assertEqual(self.tree.get_children(), ("3", "1"))
+        self.assertEqual(self.tree.items["1"], (1, "Иван Иванов"))
+
+    def test_apply_touches_one_item(self):
+        """
+        Проверяет, что изменение, добавление и удаление строки — по одной операции с таблицей.
+        """
+        self.table.apply(2, (2, "Мария Иванова"))
+        self.table.apply(4, (4, "Анна"))
+        self.table.apply(1, None)
+        self.assertEqual(self.tree.operations, 3)
+        self.assertEqual(self.tree.get_children(), ("2", "3", "4"))
+        replace_row(self.rows, 2, (2, "Мария Иванова"))
+        replace_row(self.rows, 4, (4, "Анна"))
+        replace_row(self.rows, 1, None)
+        self.assertEqual(self.rows, [(2, "Мария Иванова"), (3, "Пётр"), (4, "Анна")])
+
+
+class TestNameCache(unittest.TestCase):
+    """
+    Набор тестов для общего кэша имён выпадающих списков.
+    Проверяет фоновую загрузку, различение одинаковых имён и точечные изменения.
+    """
+
+    def setUp(self):
+        """
+        Создаёт кэш поверх заменителя виджета и загрузчика, возвращающего Future,
+        который завершается только по `finish`.
+        """
+        self.widget = FakeWidget()
+        self.futures = []
+
+        def loader():
+            self.futures.append(Future())
+            return self.futures[-1]
+
+        self.cache = NameCache(loader)
+
+    def finish(self, rows=((1, "Иван Иванов"), (2, "Мария"), (3, "Иван Иванов"))):
+        """
+        Завершает последнюю загрузку и доставляет результат в «поток Tk».
+        """
+        self.futures[-1].set_result(list(rows))
+        self.widget.pump()
+
+    def test_duplicate_names_resolve_to_own_ids(self):
+        """
+        Проверяет, что до окончания фоновой загрузки кэш пуст и не обращается к базе
+        синхронно, а затем одинаковые имена получают разные подписи.
+        """
+        self.assertEqual(self.cache.matches(""), [])
+        self.assertIsNone(self.cache.label(1))
+        self.cache.load(self.widget)
+        self.cache.load(self.widget)
+        self.assertEqual(len(self.futures), 1)
+        self.assertFalse(self.cache.loaded)
+        self.finish()
+        self.assertEqual(self.cache.matches(""), ["Иван Иванов [1]", "Иван Иванов [3]", "Мария"])
+        self.assertEqual(self.cache.id_for("Иван Иванов [3]"), 3)
+        self.assertEqual(self.cache.id_for("Мария"), 2)
+        self.assertIsNone(self.cache.id_for("Иван Иванов"))
+        self.assertEqual(self.cache.label(1), "Иван Иванов [1]")
+
+    def test_name_that_looks_like_label_gets_own_id(self):
+        """
+        Проверяет, что имя вида «Иван [5]» не совпадает с подписью дубля «Иван» с ID 5.
+        """
+        self.cache.load(self.widget)
+        self.finish([(5, "Иван"), (6, "Иван"), (7, "Иван [5]")])
+        self.assertEqual(self.cache.matches(""), ["Иван [5]", "Иван [5] [7]", "Иван [6]"])
+        self.assertEqual(self.cache.id_for("Иван [5]"), 5)
+        self.cache.apply(6, "Пётр")
+        self.assertEqual(self.cache.label(5), "Иван")
+        self.assertEqual(self.cache.label(7), "Иван [5] [7]")
+        self.assertEqual(self.cache.id_for("Иван [5] [7]"), 7)
+
+    def test_apply_updates_without_reload_and_notifies(self):
+        """
+        Проверяет, что изменения применяются без повторной загрузки и оповещают подписчиков.
+        """
+        notified = []
+        self.cache.load(self.widget)
+        self.finish()
+        self.cache.subscribe(lambda: notified.append(True))
+        self.cache.apply(3, "Иван Петров")
+        self.cache.apply(4, "Анна")
+        self.cache.apply(2, None)
+        self.assertEqual(self.cache.matches(""), ["Анна", "Иван Иванов", "Иван Петров"])
+        self.assertEqual(self.cache.matches("петр"), ["Иван Петров"])
+        self.assertEqual(self.cache.id_for("Иван Иванов"), 1)
+        self.assertEqual((len(self.futures), len(notified)), (1, 3))
+        self.cache.invalidate()
+        self.assertEqual(self.cache.matches(""), [])
+
+        # Изменение во время загрузки делает её результат устаревшим: загрузка повторяется
+        self.cache.load(self.widget)
+        self.cache.apply(5, "Олег")
+        self.finish()
+        self.assertFalse(self.cache.loaded)
+        self.finish([(1, "Иван Иванов"), (5, "Олег")])
+        self.assertEqual(self.cache.matches(""), ["Иван Иванов", "Олег"])
+
+
+    def test_failed_load_reenables_picker_and_retries(self):
+        """
+        Проверяет, что при ошибке загрузки список снова включается, ошибка сообщается
+        один раз, а раскрытие списка повторяет загрузку и применяет отложенный выбор.
+        """
+        combo, errors = FakeCombo(), []
+        picker = IdPicker(combo, self.cache, errors.append)
+        picker.select(2)
+        self.assertEqual(combo.options["state"], "disabled")
+        self.futures[-1].set_exception(RuntimeError("база недоступна"))
+        combo.pump()
+        self.assertEqual(combo.options["state"], "normal")
+        self.assertEqual([str(e) for e in errors], ["база недоступна"])
+        self.cache.apply(7, "Олег")
+        self.assertEqual(len(errors), 1)
+
+        picker.refresh()
+        self.assertEqual(len(self.futures), 2)
+        self.futures[-1].set_result([(1, "Иван"), (2, "Мария")])
+        combo.pump()
+        self.assertIsNone(self.cache.error)
+        self.assertEqual((combo.get(), picker.selected_id()), ("Мария", 2))
+
+
+class TestPrefixIndex(unittest.TestCase):
+    """
+    Набор тестов для индекса подсказок при вводе.
+    """
+
+    def test_matches_full_then_word_prefixes(self):
+        """
+        Проверяет порядок совпадений, ограничение количества и точечные изменения индекса.
+        """
+        index = PrefixIndex(["Мышь Logitech", "Ноутбук Lenovo", "Монитор LG", "Логотип"])
+        self.assertEqual(index.matches("л", 10), ["Логотип"])
+        self.assertEqual(index.matches("L", 10), ["Ноутбук Lenovo", "Монитор LG", "Мышь Logitech"])
+        self.assertEqual(index.matches("м", 1), ["Монитор LG"])
+        index.add("Мышь Lenovo")
+        index.remove("Ноутбук Lenovo")
+        self.assertEqual(index.matches("leno", 10), ["Мышь Lenovo"])
+        self.assertEqual(index.matches("", 2), ["Логотип", "Монитор LG"])
+
+    def test_large_catalogue(self):
+        """
+        Проверяет подсказки на 100 000 подписях.
+        """
+        index = PrefixIndex(f"Товар {i:06d}" for i in range(100_000))
+        self.assertEqual(index.matches("товар 0999", 3), ["Товар 099900", "Товар 099901", "Товар 099902"])
+        self.assertEqual(index.matches("05000", 50)[:2], ["Товар 050000", "Товар 050001"])
+        self.assertEqual(len(index.matches("товар", 50)), 50)
+
+
+class TestDebouncedSearch(unittest.TestCase):
+    """
+    Набор тестов для фонового поиска с задержкой.
+    Проверяет объединение нажатий клавиш, отбрасывание устаревших результатов и замеры задержки.
+    """
+
+    def setUp(self):
+        """
+        Создаёт поиск поверх заменителя виджета и счётчика запросов.
+        """
+        self.widget = FakeWidget()
+        self.queries = []
+        self.results = []
+        self.release = threading.Event()
+        self.release.set()
+
+        def search(term):
+            self.queries.append(term)
+            self.release.wait(5)
+            return [term]
+
+        self.search = DebouncedSearch(self.widget, search, self.results.append, delay_ms=0)
+
+    def tearDown(self):
+        """
+        Останавливает фоновый поток поиска.
+        """
+        self.release.set()
+        self.search.close()
+
+    def _wait_for_worker(self):
+        """
+        Дожидается завершения задач фонового потока.
+        """
+        self.search._executor.submit(lambda: None).result(5)
+
+    def test_keystrokes_are_debounced(self):
+        """
+        Проверяет, что серия нажатий приводит к одному запросу с последним текстом.
+        """
+        for term in ("и", "ив", "ива"):
+            self.search.submit(term)
+        self.widget.pump()
+        self._wait_for_worker()
+        self.widget.pump()
+        self.assertEqual(self.queries, ["ива"])
+        self.assertEqual(self.results, [["ива"]])
+        self.assertEqual(self.search.summary()["count"], 1)
+
+    def test_superseded_result_is_dropped(self):
+        """
+        Проверяет, что результат запроса, устаревшего во время выполнения, не показывается.
+        """
+        self.release.clear()
+        self.search.submit("ив")
+        self.widget.pump()
+        self.search.submit("иван")
+        self.release.set()
+        self._wait_for_worker()
+        self.widget.pump()
+        self._wait_for_worker()
+        self.widget.pump()
+        self.assertEqual(self.results, [["иван"]])
+
+    def test_empty_term_shows_everything_immediately(self):
+        """
+        Проверяет, что очистка строки поиска сразу возвращает полный список без запроса.
+        """
+        self.search.submit("ив")
+        self.search.submit("")
+        self.widget.pump()
+        self._wait_for_worker()
+        self.assertEqual(self.results, [None])
+        self.assertEqual(self.queries, [])
+
+
+class FakeCanvasWidget:
+    """
+    Заменитель Tk-виджета холста: запоминает, показан ли он и уничтожен ли.
+    """
+
+    def __init__(self):
+        """
+        Создаёт скрытый виджет.
+        """
+        self.packed = False
+        self.destroyed = False
+
+    def pack(self, **kwargs):
+        """
+        Показывает виджет.
+        """
+        self.packed = True
+
+    def pack_forget(self):
+        """
+        Скрывает виджет.
+        """
+        self.packed = False
+
+    def destroy(self):
+        """
+        Уничтожает виджет.
+        """
+        self.destroyed = True
+
+
+class FakeCanvas(FigureCanvasAgg):
+    """
+    Холст Agg с интерфейсом `FigureCanvasTkAgg`, считающий полные отрисовки и блиттинг.
+    """
+
+    def __init__(self, figure, master=None):
+        """
+        Создаёт холст и счётчики.
+        """
+        super().__init__(figure)
+        self.widget = FakeCanvasWidget()
+        self.draws = 0
+        self.blits = 0
+
+    def get_tk_widget(self):
+        """
+        Возвращает заменитель Tk-виджета.
+        """
+        return self.widget
+
+    def draw(self):
+        """
+        Полностью перерисовывает фигуру.
+        """
+        self.draws += 1
+        super().draw()
+
+    def blit(self, bbox=None):
+        """
+        Учитывает частичную перерисовку.
+        """
+        self.blits += 1
+
+
+class TestChartManager(unittest.TestCase):
+    """
+    Набор тестов для холстов графиков и подсказок с блиттингом.
+    """
+
+    def setUp(self):
+        """
+        Создаёт менеджер поверх холстов Agg.
+        """
+        self.charts = ChartManager(None, canvas_class=FakeCanvas)
+
+    def tearDown(self):
+        """
+        Освобождает фигуры.
+        """
+        self.charts.close()
+
+    def test_figure_reused_per_kind(self):
+        """
+        Проверяет, что фигура одна на вид графика, не попадает в pyplot и освобождается при закрытии.
+        """
+        figures = plt.get_fignums()
+        fig = self.charts.figure("trend", (4, 3))
+        fig.add_subplot().plot([1, 2])
+        self.charts.connect("trend", "motion_notify_event", lambda event: None)
+        self.charts.show("trend")
+        self.assertIs(self.charts.figure("trend", (4, 3)), fig)
+        self.assertEqual((fig.axes, self.charts.callbacks), ([], {}))
+        self.charts.figure("top", (4, 3))
+        self.charts.show("top")
+        trend, top = self.charts.canvases["trend"], self.charts.canvases["top"]
+        self.assertEqual((trend.widget.packed, top.widget.packed), (False, True))
+        self.assertEqual(plt.get_fignums(), figures)
+        self.charts.close()
+        self.assertTrue(trend.widget.destroyed and top.widget.destroyed)
+        self.assertEqual(self.charts.canvases, {})
+
+    def test_tooltip_hover_blits_without_full_redraw(self):
+        """
+        Проверяет, что показ и скрытие подсказки не перерисовывают фигуру целиком.
+        """
+        fig = self.charts.figure("trend", (4, 3))
+        ax = fig.add_subplot()
+        ax.plot([0, 1, 2], [3, 1, 2])
+        tooltip = BlitTooltip(ax)
+        self.charts.connect("trend", "draw_event", tooltip.on_draw)
+        self.charts.show("trend")
+        canvas = self.charts.canvases["trend"]
+        self.assertEqual((canvas.draws, canvas.blits), (1, 1))
+        for _ in range(3):
+            tooltip.show((1, 1), "Заказов: 1")
+        tooltip.show((2, 2), "Заказов: 2")
+        tooltip.hide()
+        tooltip.hide()
+        self.assertEqual((canvas.draws, canvas.blits), (1, 4))
+
+
+class TestLttb(unittest.TestCase):
+    """
+    Набор тестов для прореживания ряда алгоритмом LTTB.
+    """
+
+    def test_keeps_ends_and_peaks(self):
+        """
+        Проверяет количество точек, сохранение крайних точек и одиночного выброса.
+        """
+        x = np.arange(10_000)
+        y = np.sin(x / 500)
+        y[4321] = 50
+        keep = lttb(x, y, 300)
+        self.assertEqual(len(keep), 300)
+        self.assertEqual((keep[0], keep[-1]), (0, 9_999))
+        self.assertIn(4321, keep)
+        self.assertTrue(np.all(np.diff(keep) > 0))
+
+    def test_short_series_unchanged(self):
+        """
+        Проверяет, что ряд не длиннее порога возвращается целиком.
+        """
+        self.assertEqual(list(lttb([1, 2, 3], [5, 6, 7], 800)), [0, 1, 2])
+        self.assertEqual(list(lttb([0, 1, 2, 3, 4], [0, 5, 0, 1, 0], 3)), [0, 1, 4])
@@ -0,0 +1,1373 @@
+import logging
+import re
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from tkinter import ttk, Toplevel, TclError
+import numpy as np
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.figure import Figure
+from db import PAGE_QUERIES, PAGE_SIZE
+from export import export_view
+from importer import import_file
+
+logger = logging.getLogger(__name__)
+
+# Начиная с этого количества строк окна списков переходят в режим виртуальной прокрутки.
+VIRTUAL_THRESHOLD = 10_000
+# Пауза после последнего нажатия клавиши, после которой запускается поиск (мс).
+SEARCH_DELAY_MS = 200
+# Сколько подсказок показывает выпадающий список клиентов и товаров.
+TYPEAHEAD_LIMIT = 50
+# Подпись, к которой уже добавлен ID: такие имена тоже получают ID, чтобы подпись
+# «Иван [5]» однозначно указывала на запись, а не совпадала с именем-дублем.
+ID_SUFFIX = re.compile(r".* \[\d+\]")
+# Линейный график рисуется с маркерами точек, только если точек не больше этого числа.
+MARKER_LIMIT = 60
+# Как часто окно выгрузки обновляет полосу хода (мс).
+PROGRESS_POLL_MS = 100
+
+
+class ListSource:
+    """
+    Источник строк для `VirtualTreeview` поверх готового списка в памяти.
+    Используется для результатов поиска.
+    """
+
+    def __init__(self, rows: list):
+        """
+        Args:
+            rows (list): Список кортежей для отображения.
+        """
+        self.data = rows
+
+    def count(self) -> int:
+        """
+        Returns:
+            int: Количество строк.
+        """
+        return len(self.data)
+
+    def rows(self, offset: int, limit: int) -> list:
+        """
+        Возвращает строки видимого окна таблицы.
+        Args:
+            offset (int): Индекс первой строки.
+            limit (int): Количество строк.
+        Returns:
+            list: Срез списка.
+        """
+        return self.data[offset:offset + limit]
+
+    def iter_rows(self):
+        """
+        Yields:
+            tuple: Все строки источника по порядку.
+        """
+        return iter(self.data)
+
+
+class QuerySource:
+    """
+    Источник строк для `VirtualTreeview`, читающий список из базы страницами.
+    Хранит в памяти лишь несколько последних блоков. Следующий блок после уже
+    загруженного читается по keyset-курсору, произвольный — по смещению.
+    """
+
+    def __init__(self, db, kind: str, order_by: str = "id", descending: bool = False,
+                 block_size: int = PAGE_SIZE, max_blocks: int = 8, date_range: tuple = None):
+        """
+        Args:
+            db (Database | DatabaseHandle): Доступ к базе данных.
+            kind (str): Ключ `PAGE_QUERIES`: 'clients', 'products' или 'orders'.
+            order_by (str): Столбец сортировки. По умолчанию — 'id'.
+            descending (bool): Сортировать по убыванию.
+            block_size (int): Количество строк в одном блоке кэша.
+            max_blocks (int): Максимальное количество блоков в кэше.
+            date_range (tuple, optional): Период дат, только для заказов.
+        """
+        self.db = db
+        self.kind = kind
+        self.order_by = order_by
+        self.descending = descending
+        # Период передаётся только методам заказов: у клиентов и товаров такого аргумента нет
+        self.filters = {} if date_range is None else {"date_range": date_range}
+        self.block_size = block_size
+        self.max_blocks = max_blocks
+        self.key_index = list(PAGE_QUERIES[kind][2]).index(order_by)
+        self._blocks = OrderedDict()
+        self._count = None
+
+    def _load_page(self, last_row=None, offset: int = 0) -> list:
+        """
+        Загружает один блок строк после `last_row` или начиная со смещения `offset`.
+        Args:
+            last_row (tuple, optional): Последняя строка предыдущего блока.
+            offset (int): Смещение, если предыдущий блок неизвестен.
+        Returns:
+            list: Строки блока.
+        """
+        if last_row is not None:
+            load_page = getattr(self.db, f"load_{self.kind}_page")
+            return load_page(last_row[0], self.block_size, self.order_by, self.descending,
+                             last_row[self.key_index], **self.filters)
+        load_slice = getattr(self.db, f"load_{self.kind}_slice")
+        return load_slice(offset, self.block_size, self.order_by, self.descending, **self.filters)
+
+    def _block(self, index: int) -> list:
+        """
+        Возвращает блок строк из кэша или загружает его из базы.
+        Args:
+            index (int): Номер блока.
+        Returns:
+            list: Строки блока.
+        """
+        if index in self._blocks:
+            self._blocks.move_to_end(index)
+            return self._blocks[index]
+
+        previous = self._blocks.get(index - 1)
+        if previous and len(previous) == self.block_size:
+            rows = self._load_page(previous[-1])
+        else:
+            rows = self._load_page(offset=index * self.block_size)
+
+        self._blocks[index] = rows
+        if len(self._blocks) > self.max_blocks:
+            self._blocks.popitem(last=False)
+        return rows
+
+    def count(self) -> int:
+        """
+        Returns:
+            int: Количество строк в списке (кэшируется до `invalidate`).
+        """
+        if self._count is None:
+            self._count = getattr(self.db, f"count_{self.kind}")(**self.filters)
+        return self._count
+
+    def rows(self, offset: int, limit: int) -> list:
+        """
+        Возвращает строки видимого окна таблицы, подгружая недостающие блоки.
+        Args:
+            offset (int): Индекс первой строки.
+            limit (int): Количество строк.
+        Returns:
+            list: Строки окна.
+        """
+        if limit <= 0:
+            return []
+        first = offset // self.block_size
+        last = (offset + limit - 1) // self.block_size
+        result = []
+        for index in range(first, last + 1):
+            result.extend(self._block(index))
+        start = offset - first * self.block_size
+        return result[start:start + limit]
+
+    def iter_rows(self):
+        """
+        Последовательно читает весь список по keyset-курсору, не заполняя кэш.
+        Yields:
+            tuple: Строки списка по порядку.
+        """
+        rows = self._load_page()
+        while rows:
+            yield from rows
+            if len(rows) < self.block_size:
+                return
+            rows = self._load_page(rows[-1])
+
+    def invalidate(self) -> None:
+        """
+        Сбрасывает кэш блоков и количество строк после изменения данных.
+        """
+        self._blocks.clear()
+        self._count = None
+
+
+def replace_row(rows: list, row_id: int, row) -> None:
+    """
+    Заменяет, удаляет или добавляет строку списка в памяти по её ID (первый элемент).
+    Args:
+        rows (list): Список кортежей, изменяется на месте.
+        row_id (int): ID изменённой строки.
+        row (tuple | None): Новая строка; None — строка удалена.
+    """
+    for index, current in enumerate(rows):
+        if current[0] == row_id:
+            if row is None:
+                del rows[index]
+            else:
+                rows[index] = row
+            return
+    if row is not None:
+        rows.append(row)
+
+
+class KeyedTreeview:
+    """
+    Обычный (не виртуальный) режим `ttk.Treeview`, в котором элементы таблицы
+    адресуются первичным ключом строки: iid элемента — это ID строки.
+    Новый список показывается сравнением с уже отображённым — добавляются,
+    изменяются, удаляются и переставляются только отличающиеся элементы,
+    а изменение одной строки затрагивает ровно один элемент таблицы.
+    """
+
+    def __init__(self, tree: ttk.Treeview):
+        """
+        Args:
+            tree (ttk.Treeview): Таблица окна.
+        """
+        self.tree = tree
+        self.rows = {}  # iid -> отображаемая строка
+
+    def show(self, rows: list) -> None:
+        """
+        Приводит таблицу к списку строк, изменяя только отличающиеся элементы.
+        Args:
+            rows (list): Кортежи для отображения, первый элемент — ID.
+        """
+        wanted = {}
+        for row in rows:
+            wanted[str(row[0])] = row
+
+        removed = [iid for iid in self.rows if iid not in wanted]
+        if removed:
+            self.tree.delete(*removed)
+            for iid in removed:
+                del self.rows[iid]
+
+        for iid, row in wanted.items():
+            current = self.rows.get(iid)
+            if current is None:
+                self.tree.insert("", "end", iid=iid, values=row)
+            elif current != row:
+                self.tree.item(iid, values=row)
+            self.rows[iid] = row
+
+        order = list(wanted)
+        if list(self.tree.get_children()) != order:
+            for index, iid in enumerate(order):
+                self.tree.move(iid, "", index)
+
+    def apply(self, row_id: int, row) -> None:
+        """
+        Отражает в таблице изменение одной строки: добавление, изменение или удаление.
+        Новая строка добавляется в конец таблицы.
+        Args:
+            row_id (int): ID изменённой строки.
+            row (tuple | None): Новая строка; None — строка удалена.
+        """
+        iid = str(row_id)
+        if row is None:
+            if self.rows.pop(iid, None) is not None:
+                self.tree.delete(iid)
+        elif iid not in self.rows:
+            self.tree.insert("", "end", iid=iid, values=row)
+            self.rows[iid] = row
+        elif self.rows[iid] != row:
+            self.tree.item(iid, values=row)
+            self.rows[iid] = row
+
+    def clear(self) -> None:
+        """
+        Удаляет все элементы таблицы (перед переходом в режим виртуальной прокрутки).
+        """
+        self.tree.delete(*self.tree.get_children())
+        self.rows.clear()
+
+
+class VirtualTreeview:
+    """
+    Режим виртуальной прокрутки для `ttk.Treeview`.
+    В таблице всегда находится столько элементов, сколько строк видно на экране;
+    при прокрутке меняются только их значения, а строки запрашиваются у источника
+    (`QuerySource` или `ListSource`). Полоса прокрутки управляется самим объектом.
+    """
+
+    def __init__(self, tree: ttk.Treeview, scrollbar, db, kind: str):
+        """
+        Args:
+            tree (ttk.Treeview): Таблица окна.
+            scrollbar (Scrollbar): Вертикальная полоса прокрутки таблицы.
+            db (Database | DatabaseHandle): Доступ к базе данных.
+            kind (str): Ключ `PAGE_QUERIES` для отображаемого списка.
+        """
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.db = db
+        self.kind = kind
+        self.columns = list(PAGE_QUERIES[kind][2])
+        self.base = None  # Полный список из базы с текущей сортировкой
+        self.source = None  # Отображаемый источник: base или результат поиска
+        self.offset = 0
+        self.visible = int(tree.cget("height"))
+        self.selected_id = None
+        self._bindings = []
+
+    @property
+    def active(self) -> bool:
+        """
+        Returns:
+            bool: Включён ли режим виртуальной прокрутки.
+        """
+        return self.base is not None
+
+    def attach(self, order_by: str = "id", descending: bool = False, date_range: tuple = None) -> None:
+        """
+        Включает виртуальную прокрутку и показывает начало списка из базы.
+        Args:
+            order_by (str): Столбец сортировки.
+            descending (bool): Сортировать по убыванию.
+            date_range (tuple, optional): Период дат, только для заказов.
+        """
+        if not self.active:
+            self.tree.delete(*self.tree.get_children())
+            self.scrollbar.configure(command=self.yview)
+            self.tree.configure(yscrollcommand="")
+            for sequence, handler in (("<MouseWheel>", self._on_wheel),
+                                      ("<Button-4>", self._on_wheel),
+                                      ("<Button-5>", self._on_wheel),
+                                      ("<Configure>", self._on_configure),
+                                      ("<<TreeviewSelect>>", self._on_select)):
+                self._bindings.append((sequence, self.tree.bind(sequence, handler, add="+")))
+        self.base = QuerySource(self.db, self.kind, order_by, descending, date_range=date_range)
+        self.show(self.base)
+
+    def detach(self) -> None:
+        """
+        Выключает виртуальную прокрутку и возвращает таблице обычное поведение.
+        """
+        if not self.active:
+            return
+        for sequence, funcid in self._bindings:
+            self.tree.unbind(sequence, funcid)
+        self._bindings.clear()
+        self.scrollbar.configure(command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self.scrollbar.set)
+        self.tree.delete(*self.tree.get_children())
+        self.base = self.source = None
+
+    def show(self, source) -> None:
+        """
+        Отображает новый источник строк с начала списка.
+        Args:
+            source (QuerySource | ListSource): Источник строк.
+        """
+        self.source = source
+        self.offset = 0
+        self.render()
+
+    def filter(self, rows: list = None) -> None:
+        """
+        Показывает результаты поиска или, если их нет, весь список из базы.
+        Args:
+            rows (list, optional): Найденные строки; None — показать весь список.
+        """
+        self.show(self.base if rows is None else ListSource(rows))
+
+    def iter_rows(self):
+        """
+        Yields:
+            tuple: Все отображаемые строки (не только видимые на экране).
+        """
+        return self.source.iter_rows()
+
+    def refresh(self) -> None:
+        """
+        Перечитывает список из базы после изменения данных, сохраняя позицию прокрутки.
+        """
+        self.base.invalidate()
+        self.render()
+
+    def yview(self, *args) -> None:
+        """
+        Обработчик команд полосы прокрутки ('moveto' и 'scroll').
+        Args:
+            *args: Аргументы команды Tk.
+        """
+        if args[0] == "moveto":
+            self.scroll_to(int(float(args[1]) * self.source.count()))
+        elif args[0] == "scroll":
+            step = self.visible if args[2] == "pages" else 1
+            self.scroll_to(self.offset + int(args[1]) * step)
+
+    def scroll_to(self, offset: int) -> None:
+        """
+        Прокручивает таблицу так, чтобы первой видимой была строка `offset`.
+        Args:
+            offset (int): Индекс строки.
+        """
+        offset = max(0, min(offset, self.source.count() - self.visible))
+        if offset != self.offset:
+            self.offset = offset
+            self.render()
+
+    def render(self) -> None:
+        """
+        Заполняет элементы таблицы строками видимого окна и обновляет полосу прокрутки.
+        """
+        rows = self.source.rows(self.offset, self.visible)
+        items = self.tree.get_children()
+        for index, row in enumerate(rows):
+            if index < len(items):
+                self.tree.item(items[index], values=row)
+            else:
+                self.tree.insert("", "end", values=row)
+        if len(items) > len(rows):
+            self.tree.delete(*items[len(rows):])
+
+        selected = [item for item, row in zip(self.tree.get_children(), rows) if row[0] == self.selected_id]
+        self.tree.selection_set(selected)
+
+        total = self.source.count()
+        if total:
+            self.scrollbar.set(self.offset / total, min(1.0, (self.offset + len(rows)) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _on_wheel(self, event):
+        """
+        Прокручивает таблицу колесом мыши (Windows/macOS — MouseWheel, Linux — Button-4/5).
+        """
+        if event.num == 4 or getattr(event, "delta", 0) > 0:
+            self.scroll_to(self.offset - 3)
+        else:
+            self.scroll_to(self.offset + 3)
+        return "break"
+
+    def _on_configure(self, event) -> None:
+        """
+        Пересчитывает количество видимых строк при изменении размера таблицы.
+        """
+        row_height = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+        visible = max(1, (event.height - row_height) // row_height)
+        if visible != self.visible:
+            self.visible = visible
+            self.render()
+
+    def _on_select(self, event) -> None:
+        """
+        Запоминает ID выбранной строки, чтобы выделение следовало за ней при прокрутке.
+        """
+        selection = self.tree.selection()
+        if selection:
+            self.selected_id = self.tree.item(selection[0])["values"][0]
+
+
+class PrefixIndex:
+    """
+    Индекс подписей для подсказок при вводе: отсортированные списки ключей без
+    учёта регистра — подписей целиком и хвостов, начинающихся с каждого следующего
+    слова, — по которым совпадения по префиксу ищутся двоичным поиском (`bisect`).
+    Подписи добавляются и удаляются по одной, без перестроения индекса.
+    """
+
+    def __init__(self, labels=()):
+        """
+        Args:
+            labels (Iterable[str]): Начальные подписи.
+        """
+        self._full = []  # (подпись в нижнем регистре, подпись)
+        self._words = []  # (хвост подписи со второго и следующих слов, подпись)
+        for label in labels:
+            full, words = self._keys_for(label)
+            self._full.append(full)
+            self._words.extend(words)
+        self._full.sort()
+        self._words.sort()
+
+    @staticmethod
+    def _keys_for(label: str) -> tuple[tuple[str, str], list[tuple[str, str]]]:
+        """
+        Возвращает ключи индекса для подписи.
+        Args:
+            label (str): Подпись.
+        Returns:
+            tuple: Ключ всей подписи и список ключей хвостов с начала каждого следующего слова.
+        """
+        folded = label.casefold()
+        words = [(folded[match.start():], label) for match in re.finditer(r"\w+", folded)
+                 if match.start() > 0]
+        return (folded, label), words
+
+    def add(self, label: str) -> None:
+        """
+        Args:
+            label (str): Добавляемая подпись.
+        """
+        full, words = self._keys_for(label)
+        insort(self._full, full)
+        for key in words:
+            insort(self._words, key)
+
+    def remove(self, label: str) -> None:
+        """
+        Args:
+            label (str): Удаляемая подпись.
+        """
+        full, words = self._keys_for(label)
+        for keys, key in [(self._full, full)] + [(self._words, key) for key in words]:
+            index = bisect_left(keys, key)
+            if index < len(keys) and keys[index] == key:
+                del keys[index]
+
+    def matches(self, prefix: str, limit: int) -> list[str]:
+        """
+        Находит подписи, у которых с `prefix` начинается вся подпись или одно из слов.
+        Сначала идут совпадения с началом подписи, затем — с началом других слов,
+        каждая группа по алфавиту.
+        Args:
+            prefix (str): Введённый текст.
+            limit (int): Максимальное количество подписей.
+        Returns:
+            list[str]: Не больше `limit` подписей.
+        """
+        prefix = prefix.strip().casefold()
+        found = {}
+        for keys in (self._full, self._words):
+            for index in range(bisect_left(keys, (prefix,)), len(keys)):
+                key, label = keys[index]
+                if len(found) >= limit or not key.startswith(prefix):
+                    break
+                found[label] = None
+        return list(found)
+
+
+class NameCache:
+    """
+    Общий для всех окон кэш пар (ID, имя) клиентов или товаров.
+    Загружается из базы в фоне по первому запросу (`load`), дальше обновляется
+    точечно через `apply` — окна, изменившие клиента или товар, сообщают об этом
+    кэшу, а он оповещает подписчиков (выпадающие списки открытых окон).
+    Одинаковые имена различаются по подписи: к ним добавляется ID. ID добавляется
+    и к именам, которые сами выглядят как подпись с ID, поэтому подписи не совпадают.
+    Подписи хранятся в `PrefixIndex` для подсказок при вводе.
+    Пока кэш не загружен, подписей в нём нет: поток Tk никогда не ждёт базу.
+    """
+
+    def __init__(self, loader):
+        """
+        Args:
+            loader (callable): Функция без аргументов, возвращающая Future со списком
+                (id, имя), например `AsyncDatabase.get_clients`.
+        """
+        self.loader = loader
+        self._names = None  # id -> имя; None — ещё не загружено или сброшено
+        self._by_name = {}  # имя -> множество id
+        self._labels = {}  # id -> подпись
+        self._ids = {}  # подпись -> id
+        self._index = PrefixIndex()
+        self._listeners = []
+        self._loading = None  # Виджет, которому будет передан результат идущей загрузки
+        self._generation = 0  # Растёт при каждом изменении; устаревшая загрузка отбрасывается
+        self.error = None  # Ошибка последней загрузки; сбрасывается при следующей попытке
+
+    @property
+    def loaded(self) -> bool:
+        """
+        Returns:
+            bool: Загружены ли пары из базы.
+        """
+        return self._names is not None
+
+    def load(self, widget) -> None:
+        """
+        Запускает фоновую загрузку, если кэш пуст и ещё не загружается.
+        Пары читаются запросом `loader`, индекс подписей строится в том же
+        фоновом потоке, а в поток Tk (через `deliver`) попадает готовый результат;
+        после этого подписчики оповещаются. При ошибке она сохраняется в `error`,
+        и подписчики тоже оповещаются.
+        Args:
+            widget (tk.Misc): Виджет, через который результат передаётся в поток Tk.
+        """
+        if self._names is not None or self._loading_alive():
+            return
+        self._loading = widget
+        self.error = None
+        generation = self._generation
+        built = Future()
+
+        def build(future):
+            try:
+                built.set_result(self._build(future.result()))
+            except BaseException as e:
+                built.set_exception(e)
+
+        def install(state):
+            self._loading = None
+            if generation != self._generation:
+                # Пока шла загрузка, кэш изменился или был сброшен: читаем заново
+                self.load(widget)
+                return
+            self._names, self._by_name, self._labels, self._ids, self._index = state
+            self._notify()
+
+        def failed(error):
+            self._loading = None
+            self.error = error
+            logger.warning("Не удалось загрузить имена для выпадающего списка: %s", error)
+            self._notify()
+
+        self.loader().add_done_callback(build)
+        deliver(widget, built, install, failed)
+
+    def _loading_alive(self) -> bool:
+        """
+        Returns:
+            bool: Идёт ли загрузка, результат которой ещё будет доставлен: если окно,
+                запросившее её, закрыто, результат отбрасывается и загрузку можно начать заново.
+        """
+        if self._loading is None:
+            return False
+        try:
+            return bool(self._loading.winfo_exists())
+        except TclError:
+            return False
+
+    @classmethod
+    def _build(cls, rows) -> tuple:
+        """
+        Строит состояние кэша по парам из базы (выполняется в фоновом потоке).
+        Args:
+            rows (list[tuple]): Пары (id, имя).
+        Returns:
+            tuple: Словари id -> имя, имя -> множество id, id -> подпись, подпись -> id и индекс подписей.
+        """
+        names = dict(rows)
+        by_name = {}
+        for row_id, name in names.items():
+            by_name.setdefault(name, set()).add(row_id)
+        labels = {row_id: cls._label_for(row_id, name, by_name) for row_id, name in names.items()}
+        ids = {label: row_id for row_id, label in labels.items()}
+        return names, by_name, labels, ids, PrefixIndex(ids)
+
+    @staticmethod
+    def _label_for(row_id: int, name: str, by_name: dict) -> str:
+        """
+        Args:
+            row_id (int): ID записи.
+            name (str): Имя записи.
+            by_name (dict): Имя -> множество id.
+        Returns:
+            str: Имя или, если оно не уникально или само оканчивается на « [число]», имя с ID.
+        """
+        if len(by_name[name]) == 1 and not ID_SUFFIX.fullmatch(name):
+            return name
+        return f"{name} [{row_id}]"
+
+    def _make_label(self, row_id: int, name: str) -> str:
+        """
+        Args:
+            row_id (int): ID записи.
+            name (str): Имя записи.
+        Returns:
+            str: Подпись записи (см. `_label_for`).
+        """
+        return self._label_for(row_id, name, self._by_name)
+
+    def _relabel(self, name: str) -> None:
+        """
+        Пересчитывает подписи всех записей с этим именем (меняются, когда имя
+        становится уникальным или перестаёт им быть).
+        Args:
+            name (str): Имя.
+        """
+        for row_id in self._by_name.get(name, ()):
+            label = self._make_label(row_id, name)
+            old = self._labels.get(row_id)
+            if old == label:
+                continue
+            if old is not None:
+                del self._ids[old]
+                self._index.remove(old)
+            self._labels[row_id] = label
+            self._ids[label] = row_id
+            self._index.add(label)
+
+    def _notify(self) -> None:
+        """
+        Оповещает подписчиков об изменении кэша.
+        """
+        for listener in list(self._listeners):
+            listener()
+
+    def matches(self, prefix: str, limit: int = TYPEAHEAD_LIMIT) -> list[str]:
+        """
+        Подписи, подходящие к введённому тексту, — для выпадающего списка.
+        Args:
+            prefix (str): Введённый текст; пустой — начало списка по алфавиту.
+            limit (int): Максимальное количество подписей. По умолчанию — 50.
+        Returns:
+            list[str]: Подписи, начало которых или начало одного из слов совпадает с текстом;
+                пустой список, пока кэш не загружен.
+        """
+        return self._index.matches(prefix, limit)
+
+    def label(self, row_id: int) -> str | None:
+        """
+        Args:
+            row_id (int): ID клиента или товара.
+        Returns:
+            str | None: Подпись в выпадающем списке или None, если ID неизвестен.
+        """
+        return self._labels.get(row_id)
+
+    def id_for(self, label: str) -> int | None:
+        """
+        Args:
+            label (str): Подпись из выпадающего списка.
+        Returns:
+            int | None: ID или None, если такой подписи нет.
+        """
+        return self._ids.get(label)
+
+    def apply(self, row_id: int, name: str | None) -> None:
+        """
+        Отражает добавление, переименование или удаление одной записи.
+        Индекс подписей обновляется точечно, без повторной загрузки.
+        Args:
+            row_id (int): ID изменённой записи.
+            name (str | None): Новое имя; None — запись удалена.
+        """
+        self._generation += 1
+        if self._names is not None and self._names.get(row_id) != name:
+            old_name = self._names.pop(row_id, None)
+            if old_name is not None:
+                self._by_name[old_name].discard(row_id)
+                if not self._by_name[old_name]:
+                    del self._by_name[old_name]
+                old_label = self._labels.pop(row_id)
+                del self._ids[old_label]
+                self._index.remove(old_label)
+                self._relabel(old_name)
+            if name is not None:
+                self._names[row_id] = name
+                self._by_name.setdefault(name, set()).add(row_id)
+                self._relabel(name)
+        self._notify()
+
+    def invalidate(self) -> None:
+        """
+        Сбрасывает кэш: подписчики увидят, что он не загружен, и запросят загрузку заново.
+        """
+        self._names, self._by_name, self._labels, self._ids, self._index = None, {}, {}, {}, PrefixIndex()
+        self.error = None
+        self._generation += 1
+        self._notify()
+
+    def subscribe(self, listener) -> None:
+        """
+        Args:
+            listener (callable): Функция без аргументов, вызываемая после изменения кэша.
+        """
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener) -> None:
+        """
+        Args:
+            listener (callable): Ранее подписанная функция.
+        """
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+
+class IdPicker:
+    """
+    Выпадающий список с подсказками при вводе, который вместе с подписью хранит
+    ID выбранной записи. Варианты не загружаются заранее: при каждом нажатии
+    клавиши и при раскрытии списка в него попадают только первые `TYPEAHEAD_LIMIT`
+    подписей из `NameCache`, совпадающих с введённым текстом.
+    Пока кэш загружается в фоне, список выключен, а выбор по ID (`select`)
+    откладывается до окончания загрузки. Если загрузка не удалась, список снова
+    включается, об ошибке сообщается через `on_error`, а раскрытие списка или
+    ввод текста повторяют загрузку.
+    """
+
+    def __init__(self, combo: ttk.Combobox, cache: NameCache, on_error=None):
+        """
+        Args:
+            combo (ttk.Combobox): Выпадающий список формы.
+            cache (NameCache): Кэш пар (ID, имя).
+            on_error (callable, optional): Функция error -> None, вызываемая один раз
+                на каждую неудачную загрузку кэша.
+        """
+        self.combo = combo
+        self.cache = cache
+        self.on_error = on_error
+        self._pending = None  # ID, выбранный до загрузки кэша
+        self._reported = None  # Ошибка загрузки, о которой уже сообщено
+        combo.configure(postcommand=self.refresh)
+        combo.bind("<KeyRelease>", self._on_key, add="+")
+        cache.subscribe(self._on_cache_change)
+        if not cache.loaded:
+            cache.load(combo)  # В том числе повтор, если прошлая загрузка не удалась
+        self._on_cache_change()
+
+    def refresh(self) -> None:
+        """
+        Заполняет выпадающий список подписями, подходящими к введённому тексту.
+        Если кэш не загружен (прошлая загрузка не удалась), запрашивает её снова.
+        """
+        if not self.cache.loaded:
+            self.cache.load(self.combo)
+        self.combo.configure(values=self.cache.matches(self.combo.get()))
+
+    def _on_key(self, event) -> None:
+        """
+        Обновляет подсказки после нажатия клавиши (кроме навигации по списку).
+        """
+        if event.keysym not in ("Up", "Down", "Return", "Escape", "Tab"):
+            self.refresh()
+
+    def _on_cache_change(self) -> None:
+        """
+        Включает список и обновляет подсказки, если кэш загружен; если загрузка
+        не удалась — включает список и сообщает об ошибке; иначе выключает список
+        и запрашивает фоновую загрузку.
+        """
+        if not self.cache.loaded and self.cache.error is not None:
+            self.combo.configure(state="normal")
+            if self.cache.error is not self._reported:
+                self._reported = self.cache.error
+                if self.on_error is not None:
+                    self.on_error(self.cache.error)
+            return
+        if not self.cache.loaded:
+            self.combo.configure(state="disabled")
+            self.cache.load(self.combo)
+            return
+        self.combo.configure(state="normal")
+        if self._pending is not None:
+            row_id, self._pending = self._pending, None
+            self.select(row_id)
+        self.refresh()
+
+    def select(self, row_id: int) -> None:
+        """
+        Выбирает запись по ID (после загрузки кэша, если он ещё загружается).
+        Args:
+            row_id (int): ID клиента или товара.
+        """
+        if not self.cache.loaded:
+            self._pending = row_id
+            return
+        self.combo.set(self.cache.label(row_id) or "")
+
+    def selected_id(self) -> int | None:
+        """
+        Returns:
+            int | None: ID выбранной записи или None, если текст не совпадает ни с одной подписью.
+        """
+        return self.cache.id_for(self.combo.get())
+
+    def clear(self) -> None:
+        """
+        Сбрасывает выбор.
+        """
+        self._pending = None
+        self.combo.set("")
+
+    def close(self) -> None:
+        """
+        Отписывается от кэша (при закрытии окна).
+        """
+        self.cache.unsubscribe(self._on_cache_change)
+
+
+def deliver(widget, future, on_done, on_error=None) -> None:
+    """
+    Передаёт результат фоновой задачи в поток Tk: когда `future` завершится,
+    через `widget.after` будет вызвана `on_done(result)` или `on_error(error)`.
+    Если окно к этому времени закрыто или задача отменена, результат отбрасывается.
+    Args:
+        widget (tk.Misc): Виджет окна, которому предназначен результат.
+        future (Future): Фоновая задача, например вызов `AsyncDatabase`.
+        on_done (callable): Функция result -> None.
+        on_error (callable, optional): Функция error -> None; без неё ошибка пишется в журнал.
+    """
+    def finish():
+        try:
+            if not widget.winfo_exists():
+                return
+        except TclError:
+            return
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is None:
+            on_done(future.result())
+        elif on_error is not None:
+            on_error(error)
+        else:
+            logger.warning("Ошибка фоновой задачи: %s", error)
+
+    def schedule(_):
+        try:
+            widget.after(0, finish)
+        except (RuntimeError, TclError):
+            pass  # Окно или интерпретатор Tk уже закрыты
+
+    future.add_done_callback(schedule)
+
+
+class DebouncedSearch:
+    """
+    Живой поиск без блокировки интерфейса.
+    Нажатия клавиш откладывают запуск поиска на `delay_ms`; запрос выполняется
+    в фоновом потоке, а в интерфейс через `after()` попадает только результат
+    последнего запроса — устаревшие отменяются или отбрасываются.
+    Для каждого показанного результата замеряются время запроса и полный отклик
+    от последнего нажатия клавиши.
+    """
+
+    def __init__(self, widget, search, on_result, status_var=None, delay_ms: int = SEARCH_DELAY_MS):
+        """
+        Args:
+            widget (tk.Misc): Виджет, через который планируются вызовы в потоке Tk.
+            search (callable): Функция term -> list, выполняется в фоновом потоке.
+            on_result (callable): Функция rows -> None, вызывается в потоке Tk;
+                rows = None означает пустой запрос (показать всё).
+            status_var (StringVar, optional): Переменная для строки состояния поиска.
+            delay_ms (int): Задержка перед запуском поиска. По умолчанию — 200 мс.
+        """
+        self.widget = widget
+        self.search = search
+        self.on_result = on_result
+        self.status_var = status_var
+        self.delay_ms = delay_ms
+        self.latencies = deque(maxlen=100)  # Полный отклик на нажатие клавиши, мс
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="search")
+        self._generation = 0
+        self._after_id = None
+        self._future = None
+        self._typed_at = None
+
+    def submit(self, term: str) -> None:
+        """
+        Регистрирует нажатие клавиши. Вызывается из потока Tk (trace переменной поиска).
+        Args:
+            term (str): Текущий текст строки поиска.
+        """
+        self._typed_at = time.perf_counter()
+        self._cancel_pending()
+        if not term:
+            self._deliver(self._generation, None, 0.0)
+            return
+        self._after_id = self.widget.after(self.delay_ms, self._start, term)
+
+    def _cancel_pending(self) -> None:
+        """
+        Отменяет отложенный запуск и делает устаревшими уже запущенные запросы.
+        """
+        self._generation += 1
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+        if self._future is not None:
+            self._future.cancel()  # Сработает, только если запрос ещё в очереди
+            self._future = None
+
+    def _start(self, term: str) -> None:
+        """
+        Отправляет запрос в фоновый поток по истечении задержки.
+        Args:
+            term (str): Текст поиска.
+        """
+        self._after_id = None
+        generation = self._generation
+        self._future = self._executor.submit(self._run, generation, term)
+
+    def _run(self, generation: int, term: str) -> None:
+        """
+        Выполняет поиск в фоновом потоке и передаёт результат в поток Tk.
+        Args:
+            generation (int): Номер запроса на момент запуска.
+            term (str): Текст поиска.
+        """
+        if generation != self._generation:
+            return
+        started = time.perf_counter()
+        try:
+            rows = self.search(term)
+        except Exception as e:
+            logger.warning("Ошибка поиска %r: %s", term, e)
+            rows = []
+        query_ms = (time.perf_counter() - started) * 1000
+        try:
+            self.widget.after(0, self._deliver, generation, rows, query_ms)
+        except (RuntimeError, TclError):
+            pass  # Окно уже закрыто
+
+    def _deliver(self, generation: int, rows, query_ms: float) -> None:
+        """
+        Показывает результат в потоке Tk, если он относится к последнему запросу.
+        Args:
+            generation (int): Номер запроса.
+            rows (list | None): Найденные строки.
+            query_ms (float): Время выполнения запроса, мс.
+        """
+        if generation != self._generation:
+            return
+        self._future = None
+        self.on_result(rows)
+        latency_ms = (time.perf_counter() - self._typed_at) * 1000
+        self.latencies.append(latency_ms)
+        logger.debug("Поиск: запрос %.1f мс, отклик %.1f мс", query_ms, latency_ms)
+        if self.status_var is not None:
+            self.status_var.set("" if rows is None else
+                                f"Найдено: {len(rows)} (запрос {query_ms:.0f} мс, отклик {latency_ms:.0f} мс)")
+
+    def summary(self) -> dict:
+        """
+        Возвращает сводку по задержкам отклика на нажатия клавиш.
+        Returns:
+            dict: Количество замеров, среднее, 95-й перцентиль и последнее значение, мс.
+        """
+        if not self.latencies:
+            return {"count": 0}
+        ordered = sorted(self.latencies)
+        return {
+            "count": len(ordered),
+            "mean_ms": sum(ordered) / len(ordered),
+            "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+            "last_ms": self.latencies[-1],
+        }
+
+    def close(self) -> None:
+        """
+        Отменяет ожидающие запросы и останавливает фоновый поток.
+        """
+        self._cancel_pending()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class ChartManager:
+    """
+    Холсты графиков окна: на каждый вид графика создаётся одна фигура Matplotlib
+    со своим холстом, которая при повторном показе очищается и рисуется заново.
+    Фигуры создаются без pyplot, поэтому не копятся в его реестре, а `close`
+    освобождает их сразу, не дожидаясь сборщика мусора.
+    """
+
+    def __init__(self, master, canvas_class=FigureCanvasTkAgg):
+        """
+        Args:
+            master (tk.Misc): Контейнер, в котором размещаются холсты.
+            canvas_class (type): Класс холста `canvas_class(figure, master=...)`.
+        """
+        self.master = master
+        self.canvas_class = canvas_class
+        self.canvases = {}
+        self.callbacks = {}
+        self.current = None
+
+    def figure(self, kind: str, figsize: tuple) -> Figure:
+        """
+        Возвращает пустую фигуру для вида графика: при первом обращении создаёт её,
+        при повторных — очищает и отключает обработчики событий прошлого показа.
+        Args:
+            kind (str): Вид графика.
+            figsize (tuple): Размер новой фигуры в дюймах.
+        Returns:
+            Figure: Фигура для рисования.
+        """
+        canvas = self.canvases.get(kind)
+        if canvas is None:
+            canvas = self.canvas_class(Figure(figsize=figsize), master=self.master)
+            self.canvases[kind] = canvas
+        else:
+            for cid in self.callbacks.pop(kind, []):
+                canvas.mpl_disconnect(cid)
+            canvas.figure.clear()
+        return canvas.figure
+
+    def connect(self, kind: str, event: str, handler) -> None:
+        """
+        Подключает обработчик события холста до следующей очистки фигуры.
+        Args:
+            kind (str): Вид графика.
+            event (str): Событие Matplotlib, например 'motion_notify_event'.
+            handler (callable): Функция event -> None.
+        """
+        canvas = self.canvases[kind]
+        self.callbacks.setdefault(kind, []).append(canvas.mpl_connect(event, handler))
+
+    def show(self, kind: str) -> None:
+        """
+        Показывает холст вида графика вместо текущего и перерисовывает его.
+        Args:
+            kind (str): Вид графика.
+        """
+        canvas = self.canvases[kind]
+        if self.current is not canvas:
+            self.hide()
+            canvas.get_tk_widget().pack(fill='both', expand=True)
+            self.current = canvas
+        canvas.draw()
+
+    def hide(self) -> None:
+        """
+        Убирает текущий холст из окна, сохраняя его для повторного использования.
+        """
+        if self.current is not None:
+            self.current.get_tk_widget().pack_forget()
+            self.current = None
+
+    def close(self) -> None:
+        """
+        Освобождает все фигуры и холсты.
+        """
+        for kind, canvas in self.canvases.items():
+            for cid in self.callbacks.get(kind, []):
+                canvas.mpl_disconnect(cid)
+            canvas.figure.clear()
+            try:
+                canvas.get_tk_widget().destroy()
+            except TclError:
+                pass
+        self.canvases.clear()
+        self.callbacks.clear()
+        self.current = None
+
+
+class BlitTooltip:
+    """
+    Всплывающая подсказка на графике, которая перерисовывается блиттингом:
+    после полной отрисовки холста запоминается его изображение без подсказки,
+    а при движении мыши восстанавливается это изображение и поверх рисуется
+    только подсказка. Метод `on_draw` нужно подключить к событию 'draw_event'.
+    """
+
+    def __init__(self, ax, **style):
+        """
+        Args:
+            ax (Axes): Оси, на которых показывается подсказка.
+            **style: Параметры `Axes.annotate` (смещение, рамка, шрифт).
+        """
+        self.ax = ax
+        self.canvas = ax.figure.canvas
+        self.annotation = ax.annotate("", xy=(0, 0), animated=True, **style)
+        self.annotation.set_visible(False)
+        self.background = None
+
+    def on_draw(self, event=None) -> None:
+        """
+        Запоминает изображение холста после полной отрисовки.
+        """
+        self.background = self.canvas.copy_from_bbox(self.ax.figure.bbox)
+        self._blit()
+
+    def show(self, xy, text: str) -> None:
+        """
+        Показывает подсказку в точке; повторный показ того же текста в той же точке ничего не делает.
+        Args:
+            xy (tuple): Координаты точки в данных графика.
+            text (str): Текст подсказки.
+        """
+        if self.annotation.get_visible() and self.annotation.xy == xy and self.annotation.get_text() == text:
+            return
+        self.annotation.xy = xy
+        self.annotation.set_text(text)
+        self.annotation.set_visible(True)
+        self._blit()
+
+    def hide(self) -> None:
+        """
+        Скрывает подсказку, если она показана.
+        """
+        if self.annotation.get_visible():
+            self.annotation.set_visible(False)
+            self._blit()
+
+    def _blit(self) -> None:
+        """
+        Восстанавливает запомненное изображение и рисует поверх подсказку.
+        """
+        if self.background is None:
+            return
+        self.canvas.restore_region(self.background)
+        if self.annotation.get_visible():
+            self.ax.draw_artist(self.annotation)
+        self.canvas.blit(self.ax.figure.bbox)
+
+
+def lttb(x, y, threshold: int) -> np.ndarray:
+    """
+    Прореживает ряд алгоритмом Largest-Triangle-Three-Buckets: точки делятся на
+    `threshold - 2` корзины, из каждой берётся точка, образующая наибольший треугольник
+    с выбранной в предыдущей корзине и средней точкой следующей. Первая и последняя
+    точки сохраняются, пики и провалы не сглаживаются.
+    Args:
+        x (Sequence[float]): Координаты X по возрастанию.
+        y (Sequence[float]): Значения ряда.
+        threshold (int): Сколько точек оставить (например, ширина графика в пикселях).
+    Returns:
+        np.ndarray: Индексы оставленных точек по возрастанию; все индексы, если точек не больше `threshold`.
+    """
+    size = len(x)
+    if threshold >= size or threshold < 3:
+        return np.arange(size)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    edges = np.linspace(1, size - 1, threshold - 1).astype(np.intp)
+    indices = np.empty(threshold, dtype=np.intp)
+    indices[0], indices[-1] = 0, size - 1
+    selected = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else size
+        next_x, next_y = x[end:next_end].mean(), y[end:next_end].mean()
+        area = np.abs((x[selected] - next_x) * (y[start:end] - y[selected])
+                      - (x[selected] - x[start:end]) * (next_y - y[selected]))
+        selected = start + int(area.argmax())
+        indices[bucket + 1] = selected
+    return indices
+
+
+class ProgressDialog:
+    """
+    Окно хода фоновой выгрузки или загрузки с полосой прогресса и кнопкой «Отмена».
+    Фоновый поток только сохраняет счётчики через `report`; виджеты обновляются
+    в потоке Tk по таймеру `after`.
+    """
+
+    def __init__(self, parent, title: str = "Экспорт", caption: str = "Записано строк"):
+        """
+        Args:
+            parent (tk.Misc): Окно, из которого запущена операция.
+            title (str): Заголовок окна.
+            caption (str): Подпись к счётчику строк.
+        """
+        self.caption = caption
+        self.cancelled = threading.Event()
+        self.done, self.total = 0, None
+        self.window = Toplevel(parent)
+        self.window.title(title)
+        self.window.resizable(False, False)
+        self.window.transient(parent)
+        self.window.attributes("-topmost", True)  # окна списков держатся поверх остальных
+        self.window.protocol("WM_DELETE_WINDOW", self.cancel)
+        # Закрытие окна списка уничтожает и это окно — операцию тогда незачем продолжать
+        self.window.bind("<Destroy>", lambda e: self.cancelled.set() if e.widget is self.window else None)
+        self.label = ttk.Label(self.window, text="Подготовка…", width=40)
+        self.label.pack(padx=10, pady=(10, 5))
+        self.bar = ttk.Progressbar(self.window, length=300, mode="indeterminate")
+        self.bar.pack(padx=10, pady=5)
+        self.bar.start()
+        self.cancel_btn = ttk.Button(self.window, text="Отмена", command=self.cancel)
+        self.cancel_btn.pack(pady=(5, 10))
+        self.window.after(PROGRESS_POLL_MS, self._poll)
+
+    def report(self, done: int, total: int = None) -> None:
+        """
+        Сохраняет ход операции. Вызывается из фонового потока.
+        Args:
+            done (int): Сколько строк обработано.
+            total (int, optional): Сколько строк всего; None — неизвестно.
+        """
+        self.done, self.total = done, total
+
+    def cancel(self) -> None:
+        """
+        Просит фоновую операцию остановиться; окно закроется, когда она завершится.
+        """
+        self.cancelled.set()
+        self.label.config(text="Отмена…")
+        self.cancel_btn.state(["disabled"])
+
+    def _poll(self) -> None:
+        """
+        Переносит сохранённые счётчики в виджеты и планирует следующее обновление.
+        """
+        try:
+            if not self.window.winfo_exists():
+                return
+        except TclError:
+            return
+        done, total = self.done, self.total
+        if total and str(self.bar["mode"]) != "determinate":
+            self.bar.stop()
+            self.bar.config(mode="determinate", maximum=total)
+        if total:
+            self.bar["value"] = done
+        if not self.cancelled.is_set():
+            self.label.config(text=f"{self.caption}: {done}" + (f" из {total}" if total else ""))
+        self.window.after(PROGRESS_POLL_MS, self._poll)
+
+    def close(self) -> None:
+        """
+        Закрывает окно.
+        """
+        try:
+            self.window.destroy()
+        except TclError:
+            pass
+
+
+def run_with_progress(parent, future_for, on_done, on_error, **dialog) -> ProgressDialog:
+    """
+    Показывает окно хода и запускает фоновую задачу; окно закрывается при её
+    завершении, результат передаётся в поток Tk через `deliver`.
+    Args:
+        parent (tk.Misc): Окно списка.
+        future_for (callable): Функция (progress, cancel) -> Future, запускающая задачу
+            с функцией хода `ProgressDialog.report` и событием отмены.
+        on_done (callable): Функция result -> None.
+        on_error (callable): Функция error -> None; получает и исключение отмены.
+        **dialog: title и caption для `ProgressDialog`.
+    Returns:
+        ProgressDialog: Окно хода.
+    """
+    progress = ProgressDialog(parent, **dialog)
+    future = future_for(progress.report, progress.cancelled)
+
+    def finish(callback, value):
+        progress.close()
+        callback(value)
+
+    deliver(parent, future, lambda result: finish(on_done, result), lambda e: finish(on_error, e))
+    return progress
+
+
+def start_export(parent, tasks, kind: str, header: list, path: str, on_done, on_error, **filters) -> ProgressDialog:
+    """
+    Запускает `export_view` с окном хода на отдельном соединении только для чтения
+    (`AsyncDatabase.stream`), не занимая читателей пула на всё время выгрузки.
+    Args:
+        parent (tk.Misc): Окно списка.
+        tasks (AsyncDatabase): Фоновый доступ к базе.
+        kind (str): Ключ `PAGE_QUERIES`.
+        header (list): Заголовки столбцов.
+        path (str): Путь к файлу; '.gz' в конце включает сжатие.
+        on_done (callable): Функция written -> None.
+        on_error (callable): Функция error -> None; получает и `ExportCancelled`.
+        **filters: term, order_by, descending и date_range для `export_view`.
+    Returns:
+        ProgressDialog: Окно хода выгрузки.
+    """
+    return run_with_progress(
+        parent, lambda progress, cancel: tasks.stream(export_view, kind, header, path, progress=progress,
+                                                      cancel=cancel, **filters),
+        on_done, on_error)
+
+
+def start_import(parent, tasks, kind: str, path: str, on_done, on_error) -> ProgressDialog:
+    """
+    Запускает `import_file` в очереди писателя `AsyncDatabase` с окном хода.
+    Args:
+        parent (tk.Misc): Окно списка.
+        tasks (AsyncDatabase): Фоновый доступ к базе.
+        kind (str): 'clients', 'products' или 'orders'.
+        path (str): Путь к файлу CSV или JSON.
+        on_done (callable): Функция result -> None, где result — (imported, rejected).
+        on_error (callable): Функция error -> None; получает и `ImportCancelled`.
+    Returns:
+        ProgressDialog: Окно хода загрузки.
+    """
+    return run_with_progress(
+        parent, lambda progress, cancel: tasks.submit(import_file, kind, path, progress=progress, cancel=cancel),
+        on_done, on_error, title="Импорт", caption="Обработано записей")